@@ -6,9 +6,8 @@ from pathlib import Path
 import pickle
 import os
 
-import networkx as nx
-
 import polyphemus
+from polyphemus.graph import RecommendationGraph
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
@@ -26,14 +25,14 @@ if __name__ == '__main__':
 
     weighted_edge_list, channels, claim_id_to_video = engine.generate(iterations = ITERATIONS)
 
-    G = nx.DiGraph()
-    G.add_weighted_edges_from(weighted_edge_list)
+    graph = RecommendationGraph.from_engine(engine)
 
     #-------------------------------------------------------------------------#
 
     os.makedirs(OUTPUT_DIR, exist_ok = True)
 
-    nx.write_gexf(G = G, path = Path(OUTPUT_DIR, 'network.gexf'))
+    graph.write_gexf(path = Path(OUTPUT_DIR, 'network.gexf'))
+    graph.write_edge_list(path = Path(OUTPUT_DIR, 'video_edge_list.tsv'), level = 'video')
 
     with open(Path(OUTPUT_DIR, f'weighted_edge_list.pkl'), 'wb') as f:
         pickle.dump(weighted_edge_list, f)
@@ -9,9 +9,8 @@ import csv
 from pathlib import Path 
 import os 
 
-import pandas as pd
-
 from polyphemus.base import OdyseeChannelScraper
+from polyphemus.pipeline import ChannelPipeline, CsvSink
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
@@ -24,28 +23,23 @@ if __name__ == '__main__':
 
     odysee_channel = OdyseeChannelScraper(channel_name = CHANNEL_NAME)
 
-    video_list, comment_list = odysee_channel.get_all_videos_and_comments()
-
-    channel_df = pd.DataFrame([odysee_channel.get_entity().__dict__])
-    video_df = pd.DataFrame([v.__dict__ for v in video_list])
-    comment_df = pd.DataFrame([c.__dict__ for c in comment_list])
-
     output_subdir = Path(OUTPUT_DIR, CHANNEL_NAME)
     os.makedirs(output_subdir, exist_ok = True)
 
-    channel_df.to_csv(
-        path_or_buf = Path(output_subdir, f'{CHANNEL_NAME}_channel.csv'),
-        index = False,
-        quoting = csv.QUOTE_NONNUMERIC )
+    channel = odysee_channel.get_entity().__dict__
+
+    with open(Path(output_subdir, f'{CHANNEL_NAME}_channel.csv'), 'w', newline = '', encoding = 'utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames = list(channel), quoting = csv.QUOTE_NONNUMERIC)
+        writer.writeheader()
+        writer.writerow(channel)
 
-    video_df.to_csv(
-        path_or_buf = Path(output_subdir, f'{CHANNEL_NAME}_videos.csv'),
-        index = False,
-        quoting = csv.QUOTE_NONNUMERIC )
+    # Videos and comments are written as they are scraped, instead of being 
+    # collected in memory first
+    with CsvSink(
+            video_path = Path(output_subdir, f'{CHANNEL_NAME}_videos.csv'),
+            comment_path = Path(output_subdir, f'{CHANNEL_NAME}_comments.csv')) as sink:
+        counts = ChannelPipeline(scraper = odysee_channel, sink = sink).run()
 
-    comment_df.to_csv(
-        path_or_buf = Path(output_subdir, f'{CHANNEL_NAME}_comments.csv'),
-        index = False,
-        quoting = csv.QUOTE_NONNUMERIC )
+    print(counts)
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
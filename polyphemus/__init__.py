@@ -3,6 +3,12 @@
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
 from . import api
+from . import auth
 from . import base 
+from . import cache
+from . import pipeline
+from . import ratelimit
+from . import resolver
+from . import store
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
\ No newline at end of file
@@ -0,0 +1,111 @@
+# -*- coding: UTF-8 -*-
+
+"""Helpers for running blocking API calls concurrently in a thread pool.
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, TypeVar
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def imap(function: Callable[[T], R], iterable: Iterable[T], max_workers: int, ordered: bool = True) -> Iterator[R]:
+
+    """Lazily apply ``function`` to every item of ``iterable`` using a pool of
+    ``max_workers`` threads, yielding the results as a generator.
+
+    Unlike ``ThreadPoolExecutor.map``, the input is consumed lazily and at most
+    ``2 * max_workers`` items are submitted ahead of the consumer, so memory
+    stays bounded for long or streaming inputs. If ``max_workers`` is 1 or less,
+    ``function`` is called serially in the calling thread.
+
+    Parameters
+    ----------
+    function: callable
+        Function applied to each item.
+    iterable: iterable
+        Items to process.
+    max_workers: int
+        Number of worker threads.
+    ordered: bool
+        If ``True``, results are yielded in the order of ``iterable``,
+        otherwise they are yielded as soon as they are completed.
+    """
+
+    if max_workers is None or max_workers <= 1:
+        for item in iterable:
+            yield function(item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers = max_workers)
+    pending = deque()
+    max_pending = 2 * max_workers
+
+    try:
+        for item in iterable:
+            pending.append(executor.submit(function, item))
+            while len(pending) >= max_pending:
+                yield from _pop_results(pending, ordered)
+            yield from _pop_finished_results(pending, ordered)
+        while pending:
+            yield from _pop_results(pending, ordered)
+    finally:
+        executor.shutdown(wait = True, cancel_futures = True)
+
+#-----------------------------------------------------------------------------#
+
+def _pop_results(pending: deque, ordered: bool) -> Iterator:
+
+    """Remove at least one finished future from ``pending`` and yield its
+    result.
+    """
+
+    if ordered:
+        yield pending.popleft().result()
+    else:
+        done, _ = wait(pending, return_when = FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            yield future.result()
+
+#-----------------------------------------------------------------------------#
+
+def _pop_finished_results(pending: deque, ordered: bool) -> Iterator:
+
+    """Remove the futures of ``pending`` that are already finished (only those 
+    at the front of the queue if ``ordered``) and yield their results, without 
+    waiting.
+    """
+
+    if ordered:
+        while pending and pending[0].done():
+            yield pending.popleft().result()
+    else:
+        for future in [future for future in pending if future.done()]:
+            pending.remove(future)
+            yield future.result()
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def batched(iterable: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+
+    """Lazily split ``iterable`` into lists of at most ``batch_size`` items.
+    """
+
+    iterator = iter(iterable)
+
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
@@ -0,0 +1,642 @@
+# -*- coding: UTF-8 -*-
+
+"""Asynchronous counterparts of the functions in ``polyphemus.api``, built on
+``aiohttp``.
+
+All coroutines share a single ``AsyncClient``, which holds one connection pool
+and a semaphore bounding the number of requests in flight, so that many
+videos and channels can be scraped concurrently from a single process::
+
+    async with AsyncClient(max_concurrency = 200) as client:
+        scraper = await AsyncOdyseeChannelScraper.create(client, 'Mak1nBacon')
+        videos, comments = await scraper.get_all_videos_and_comments()
+
+Requires the optional ``aiohttp`` dependency (``pip install polyphemus[async]``).
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import asyncio
+from urllib.parse import quote, unquote
+from datetime import datetime
+from typing import Tuple, Optional, List, Set, AsyncGenerator
+
+import aiohttp
+
+from polyphemus import api
+from polyphemus import base
+from polyphemus.auth import TokenProvider
+from polyphemus.cache import get_endpoint
+from polyphemus.ratelimit import RateLimiter, CircuitOpenError, backoff_delay
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+# Maximum number of requests in flight for a single `AsyncClient`
+MAX_CONCURRENCY = 100
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class AsyncClient:
+
+    """Shared ``aiohttp`` session with bounded concurrency, used by all
+    coroutines in this module.
+
+    Parameters
+    ----------
+    max_concurrency: int
+        Maximum number of requests in flight at the same time.
+    timeout: float
+        Total timeout of a single request, in seconds.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, timeout: float = 15):
+
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        self._session = None
+        self._semaphore = None
+
+    #-------------------------------------------------------------------------#
+
+    async def __aenter__(self) -> 'AsyncClient':
+
+        self._session = aiohttp.ClientSession(
+            connector = aiohttp.TCPConnector(limit = self.max_concurrency),
+            timeout = aiohttp.ClientTimeout(total = self.timeout),
+            headers = {'Accept-Encoding': 'gzip, deflate'})
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self
+
+    #-------------------------------------------------------------------------#
+
+    async def __aexit__(self, *exc_info):
+
+        await self.close()
+
+    #-------------------------------------------------------------------------#
+
+    async def close(self):
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    #-------------------------------------------------------------------------#
+
+    async def make_request(self, method: str, kwargs: dict, token_provider: Optional[TokenProvider] = None, max_retries: int = api.MAX_RETRIES) -> Tuple[bytes, object]:
+
+        """Asynchronous equivalent of ``api.make_request``, retrying the request
+        with jittered exponential backoff and handling errors. Requests go 
+        through the same response cache (``api.set_cache``) and rate limiter 
+        (``api.set_rate_limiter``) as the synchronous API, whose blocking calls 
+        are run in a thread, and are further bounded by the client's own 
+        semaphore.
+
+        Parameters
+        ----------
+        method: str
+            HTTP method, one of {``'GET'``, ``'POST'``}.
+        kwargs: dict
+            Keyword arguments for ``aiohttp.ClientSession.request``. Must
+            include ``url`` key.
+        token_provider: polyphemus.auth.TokenProvider
+            If given, a token from this provider is set as the ``auth_token``
+            field of the request before each attempt, and replaced if it is
+            rejected, as in ``api.make_request``.
+        max_retries: int
+            Maximum number of attempts before an ``api.MaxRetriesError`` is 
+            raised.
+
+        Returns
+        -------
+        content: bytes
+            Body of the response.
+        parsed_response: dict or list
+            Body of the response, decoded from JSON with ``api.loads_json``.
+        """
+
+        if self._session is None:
+            raise RuntimeError('`AsyncClient` must be used as an async context manager')
+
+        if method not in ['GET', 'POST']:
+            msg = f'`method` argument must be either `GET` or `POST`, not {method}'
+            raise ValueError(msg)
+
+        cache = api.get_cache()
+
+        if cache is not None:
+            content = await asyncio.to_thread(cache.get, method, kwargs)
+            if content is not None:
+                return content, api.loads_json(content)
+
+        if token_provider is not None:
+            token_field = 'data' if 'data' in kwargs else 'params'
+            kwargs[token_field] = dict(kwargs.get(token_field) or {})
+
+        n_retries = 0
+        retry_reasons = []
+        status_codes = []
+
+        rate_limiter = api.get_rate_limiter()
+        endpoint = get_endpoint(kwargs)
+        retry_after = None
+
+        while n_retries < max_retries:
+            if n_retries > 0:
+                await asyncio.sleep(backoff_delay(n_retries, retry_after = retry_after))
+            status = None
+            retry_after = None
+            acquired = False
+            try:
+                if token_provider is not None:
+                    auth_token = await asyncio.to_thread(token_provider.get)
+                    kwargs[token_field]['auth_token'] = auth_token
+                if rate_limiter is not None:
+                    await _acquire(rate_limiter, url = kwargs['url'], endpoint = endpoint)
+                    acquired = True
+                async with self._semaphore:
+                    async with self._session.request(method, **kwargs) as response:
+                        status = response.status
+                        headers = response.headers
+                        content = await response.read()
+                retry_after = api.get_retry_after(headers)
+                if token_provider is not None and api.report_token_status(token_provider, auth_token, status, headers):
+                    retry_after = None
+                if status == 200:
+                    parsed_response = api.loads_json(content)
+                    error = api.json_response_error(parsed_response)
+                    if error is None:
+                        if cache is not None:
+                            await asyncio.to_thread(cache.set, method, kwargs, content)
+                        return content, parsed_response
+                    retry_reasons.append(f'JSON response error: {error}')
+                    status_codes.append(status)
+                    n_retries += 1
+                else:
+                    retry_reasons.append(f'HTTP status code: {status}')
+                    status_codes.append(status)
+                    n_retries += 1
+            except CircuitOpenError as exception:
+                retry_reasons.append(f'Python exception: {exception}')
+                status_codes.append(None)
+                retry_after = rate_limiter.reset_timeout
+                n_retries += 1
+            except asyncio.CancelledError:
+                if acquired:
+                    acquired = False
+                    rate_limiter.cancel(url = kwargs['url'])
+                raise
+            except Exception as exception:
+                retry_reasons.append(f'Python exception: {exception}')
+                status_codes.append(None)
+                n_retries += 1
+            finally:
+                if acquired:
+                    rate_limiter.release(url = kwargs['url'], endpoint = endpoint, status_code = status, retry_after = retry_after)
+
+        msg = f'Maximum number of retries reached for request {method} with kwargs {kwargs}. Retry reasons: {retry_reasons}'
+        raise api.MaxRetriesError(msg, status_codes)
+
+#-----------------------------------------------------------------------------#
+
+async def _acquire(rate_limiter: RateLimiter, url: str, endpoint: str):
+
+    """Wait in a thread until ``rate_limiter`` lets a request through. If the 
+    calling task is cancelled meanwhile, the slot that the thread goes on to 
+    acquire is given back.
+    """
+
+    future = asyncio.ensure_future(asyncio.to_thread(rate_limiter.acquire, url = url, endpoint = endpoint))
+
+    try:
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        future.add_done_callback(lambda f: f.cancelled() or f.exception() is not None or rate_limiter.cancel(url = url))
+        raise
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def get_auth_token(client: AsyncClient) -> str:
+
+    """Get a fresh authorization token, to use for API calls that require it.
+
+    Note: calling this function many times in quick succession may result in a
+    503 error.
+    """
+
+    _, result = await client.make_request('POST', {'url' : api.NEW_USER_API_URL})
+
+    return result['data']['auth_token']
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def get_channel_info(client: AsyncClient, channel_name: str) -> dict:
+
+    """Get the channel information and ID from the channel name.
+    """
+
+    channel_url = f'lbry://@{channel_name}'
+
+    json_data = {
+        "jsonrpc":"2.0",
+        "method":"resolve",
+        "params":{
+            "urls":[channel_url]}}
+
+    content, result = await client.make_request(
+        'POST', {
+            'url' : api.BACKEND_API_URL,
+            'json': json_data})
+
+    info = api.parse_channel_info(result['result'][channel_url], raw = content.decode('utf-8'))
+
+    return info
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def get_subscribers(client: AsyncClient, channel_id: str, auth_token: str = None) -> int:
+
+    """Get the number of subscribers for a channel.
+    """
+
+    token_provider = api.get_token_provider() if auth_token is None else None
+
+    json_data = {
+        'auth_token': auth_token,
+        'claim_id': channel_id }
+
+    _, result = await client.make_request(
+        'POST', {
+            'url' : api.SUBSCRIBER_API_URL,
+            'data': json_data},
+        token_provider = token_provider)
+
+    return result['data'][0]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def get_raw_video_info_list(client: AsyncClient, channel_id: str, since: Optional[int] = None, known_claim_ids: Optional[Set[str]] = None) -> List[dict]:
+
+    """Get a list of all videos posted by a specified channel name.
+    """
+
+    return [raw_video_info async for raw_video_info in iter_raw_video_info(client, channel_id = channel_id, since = since, known_claim_ids = known_claim_ids)]
+
+#-----------------------------------------------------------------------------#
+
+async def iter_raw_video_info(client: AsyncClient, channel_id: str, since: Optional[int] = None, known_claim_ids: Optional[Set[str]] = None) -> AsyncGenerator[dict, None]:
+
+    """Asynchronous equivalent of ``api.iter_raw_video_info``, sharing its 
+    paging logic (``api.ClaimSearchPager``). Pages depend on each other, so 
+    they are fetched one after another.
+    """
+
+    pager = api.ClaimSearchPager(channel_id, since = since, known_claim_ids = known_claim_ids)
+
+    while not pager.done:
+
+        _, result = await client.make_request(
+            'POST', {
+                'url' : api.BACKEND_API_URL,
+                'json': pager.next_request()})
+
+        for raw_video_info in pager.add_page(result['result']['items']):
+            yield raw_video_info
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def get_views(client: AsyncClient, video_id: str, auth_token: str = None) -> int:
+
+    """Get the number of views for a given video.
+    """
+
+    token_provider = api.get_token_provider() if auth_token is None else None
+
+    params = {
+        'auth_token': auth_token,
+        'claim_id': video_id }
+
+    _, result = await client.make_request(
+        'GET', {
+            'url' : api.VIEW_API_URL,
+            'params': params},
+        token_provider = token_provider)
+
+    return result['data'][0]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def get_video_reactions(client: AsyncClient, video_id: str, auth_token: str = None) -> Tuple[Optional[int], Optional[int]]:
+
+    """Get all reactions for a given video.
+    """
+
+    token_provider = api.get_token_provider() if auth_token is None else None
+
+    post_data = {
+        'auth_token': auth_token,
+        'claim_ids': video_id }
+
+    _, result = await client.make_request(
+        'POST', {
+            'url' : api.REACTION_API_URL,
+            'data': post_data},
+        token_provider = token_provider)
+
+    if result['success']:
+        reactions = result['data']['others_reactions'][video_id]
+        return reactions['like'], reactions['dislike']
+    else:
+        return None, None
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def get_all_comments(client: AsyncClient, video_id: str, page_size: int = api.COMMENT_PAGE_SIZE) -> List[dict]:
+
+    """Get a list of all comments for a single video, requesting all pages 
+    after the first one, and their reactions, concurrently.
+    """
+
+    async def _get_page_with_reactions(page: int) -> List[dict]:
+        result = await _get_comment_page(client, video_id = video_id, page = page, page_size = page_size)
+        if not result.get('items'):
+            return []
+        return await append_comment_reactions(client, comment_info_list = result['items'])
+
+    first_page = await _get_comment_page(client, video_id = video_id, page = 1, page_size = page_size)
+
+    if 'items' not in first_page:
+        return []
+
+    if 'total_pages' not in first_page:
+        all_comments = await append_comment_reactions(client, comment_info_list = first_page['items'])
+        page = 2
+        while comments := await _get_page_with_reactions(page):
+            all_comments.extend(comments)
+            page += 1
+        return all_comments
+
+    pages = await asyncio.gather(
+        append_comment_reactions(client, comment_info_list = first_page['items']),
+        *[_get_page_with_reactions(page) for page in range(2, first_page['total_pages'] + 1)])
+
+    return [comment for comments in pages for comment in comments]
+
+#-----------------------------------------------------------------------------#
+
+async def _get_comment_page(client: AsyncClient, video_id: str, page: int, page_size: int = api.COMMENT_PAGE_SIZE) -> dict:
+
+    json_data = {
+        "jsonrpc":"2.0",
+        "id":1,
+        "method":"comment.List",
+        "params":{
+            "page":page,
+            "claim_id":video_id,
+            "page_size":page_size,
+            "top_level":False,
+            "sort_by":3}}
+
+    _, result = await client.make_request(
+        'POST', {
+            'url' : api.COMMENT_API_URL,
+            'json': json_data})
+
+    return result['result']
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def append_comment_reactions(client: AsyncClient, comment_info_list: List[dict]) -> List[dict]:
+
+    """Get reaction data for each comment and insert ``'likes'`` and
+    ``'dislikes'`` keys into dict for each comment.
+    """
+
+    comment_ids = ','.join([c['comment_id'] for c in comment_info_list])
+
+    json_data = {
+        "jsonrpc":"2.0",
+        "id":1,
+        "method":"reaction.List",
+        "params":{
+            "comment_ids":comment_ids}}
+
+    _, result = await client.make_request(
+        'POST', {
+            'url' : api.COMMENT_API_URL,
+            'json': json_data})
+
+    reactions = result['result']['others_reactions']
+
+    for comment in comment_info_list:
+        comment['likes'] = reactions[comment['comment_id']]['like']
+        comment['dislikes'] = reactions[comment['comment_id']]['dislike']
+
+    return comment_info_list
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def get_recommended(client: AsyncClient, video_title: str, video_id: str) -> List[dict]:
+
+    """Get list of raw video info dicts for a specified video title and video
+    claim_id.
+    """
+
+    params = {
+        's':quote(video_title),
+        'size':'20',
+        'from':'0',
+        'related_to':video_id}
+
+    _, result = await client.make_request(
+        'GET', {
+            'url' : api.RECOMMENDATION_API_URL,
+            'params': params})
+
+    recommended_video_info = await normalized_names_to_video_info(client, [r['name'] for r in result])
+    recommended_video_info = [vi for vi in recommended_video_info if ((vi.get('value_type') == 'stream') & any(key in vi.get('value', []) for key in ('video', 'audio')))]
+
+    return recommended_video_info
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def normalized_names_to_video_info(client: AsyncClient, normalized_names: List[str]) -> List[dict]:
+
+    """Convert a list of normalized names of videos to a list of raw video dicts
+    for those videos.
+    """
+
+    video_urls = [f"lbry://{normalized_name}" for normalized_name in normalized_names]
+
+    json_data = {
+        "jsonrpc":"2.0",
+        "method":"resolve",
+        "params":{
+            "urls":video_urls}}
+
+    _, result = await client.make_request(
+        'POST', {
+            'url' : api.BACKEND_API_URL,
+            'json': json_data})
+
+    return [result['result'][video_url] for video_url in video_urls]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def get_streaming_url(client: AsyncClient, canonical_url: str) -> str:
+
+    """Retrieve the `streaming_url` for a specified video.
+    """
+
+    json_data = {
+        "jsonrpc":"2.0",
+        "method":"get",
+        "params":{
+            "uri":canonical_url}}
+
+    _, result = await client.make_request(
+        'POST', {
+            'url' : api.BACKEND_API_URL,
+            'json': json_data})
+
+    return result.get('result', {}).get('streaming_url')
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+async def process_raw_video_info(client: AsyncClient, raw_video_info: dict, auth_token: str = None, additional_fields: bool = True) -> base.Video:
+
+    """Asynchronous equivalent of ``base.process_raw_video_info``, fetching the
+    streaming URL, views and reactions of the video concurrently.
+    """
+
+    claim_id, canonical_url = base.get_enrichment_ids(raw_video_info)
+
+    video = base.process_raw_video_info(
+        raw_video_info = raw_video_info,
+        auth_token = auth_token,
+        additional_fields = False)
+
+    if additional_fields:
+
+        async def _get_streaming_url():
+            if canonical_url is None:
+                return None
+            return await get_streaming_url(client, canonical_url)
+
+        video.streaming_url, video.views, (video.likes, video.dislikes) = await asyncio.gather(
+            _get_streaming_url(),
+            get_views(client, video_id = claim_id, auth_token = auth_token),
+            get_video_reactions(client, video_id = claim_id, auth_token = auth_token))
+
+    return video
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class AsyncOdyseeChannelScraper:
+
+    """Asynchronous equivalent of ``base.OdyseeChannelScraper``.
+
+    Instances should be created with the ``create`` coroutine, since fetching
+    the channel information requires awaiting a request.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, client: AsyncClient, channel_name: str, auth_token: str, raw_channel_info: dict):
+
+        self.client = client
+        self.auth_token = auth_token
+
+        self._channel_name = channel_name
+        self._raw_channel_info = raw_channel_info
+        self._channel_id = self._raw_channel_info['channel_id']
+
+    #-------------------------------------------------------------------------#
+
+    @classmethod
+    async def create(cls, client: AsyncClient, channel_name: str, auth_token: str = None) -> 'AsyncOdyseeChannelScraper':
+
+        channel_name = unquote(channel_name)
+
+        raw_channel_info = await get_channel_info(client, channel_name = channel_name)
+
+        return cls(
+            client = client,
+            channel_name = channel_name,
+            auth_token = auth_token,
+            raw_channel_info = raw_channel_info)
+
+    #-------------------------------------------------------------------------#
+
+    async def get_entity(self) -> base.Channel:
+
+        """Return Channel object containing information about the specified channel.
+        """
+
+        subscribers = await get_subscribers(
+            self.client,
+            channel_id = self._channel_id,
+            auth_token = self.auth_token)
+
+        return base.Channel(
+            channel_id=self._raw_channel_info['channel_id'],
+            title=self._raw_channel_info['title'],
+            created=datetime.fromtimestamp(self._raw_channel_info['created']),
+            description=self._raw_channel_info['description'],
+            cover_image=self._raw_channel_info['cover_image'],
+            thumbnail_image=self._raw_channel_info['thumbnail_image'],
+            raw=self._raw_channel_info['raw'],
+            subscribers=subscribers)
+
+    #-------------------------------------------------------------------------#
+
+    async def get_all_videos(self, additional_fields: bool = True) -> AsyncGenerator[base.Video, None]:
+
+        """Yield Video objects for all videos posted by the specified channel.
+
+        All videos are processed concurrently (bounded by the client's
+        ``max_concurrency``), and are yielded in the same order as
+        ``base.OdyseeChannelScraper.get_all_videos``.
+        """
+
+        raw_video_info_list = await get_raw_video_info_list(self.client, channel_id = self._channel_id)
+
+        tasks = [
+            asyncio.ensure_future(process_raw_video_info(
+                self.client,
+                raw_video_info = raw_video_info,
+                auth_token = self.auth_token,
+                additional_fields = additional_fields))
+            for raw_video_info in raw_video_info_list]
+
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    #-------------------------------------------------------------------------#
+
+    async def get_all_videos_and_comments(self) -> Tuple[List[base.Video], List[base.Comment]]:
+
+        """Return list of Video and Comment objects for all videos posted by the
+        channel and all comments posted to those videos, fetching the comments
+        of all videos concurrently.
+        """
+
+        all_videos = [video async for video in self.get_all_videos()]
+
+        comment_lists = await asyncio.gather(*[
+            get_all_comments(self.client, video_id = video.claim_id)
+            for video in all_videos])
+
+        all_comments = [base.process_raw_comment_info(raw_comment_info) for comment_list in comment_lists for raw_comment_info in comment_list]
+
+        return all_videos, all_comments
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
@@ -5,13 +5,27 @@
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
+import itertools
 import json
+from collections import OrderedDict
 from urllib.parse import quote
-from typing import Tuple, Optional, List, Callable
+from typing import Tuple, Optional, List, Dict, Set, Callable, Generator
 
 import time
+import threading
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from polyphemus.auth import TokenProvider
+from polyphemus.cache import ResponseCache, get_endpoint
+from polyphemus.ratelimit import RateLimiter, CircuitOpenError, backoff_delay
+from polyphemus._concurrency import imap
 
 # API endpoints for Odysee data
 #-----------------------------------------------------------------------------#
@@ -27,16 +41,311 @@ NEW_USER_API_URL = 'https://api.odysee.com/user/new'
 # Allow responses to `get_streaming_url` that contain no `streaming_url` field
 ALLOWED_ERROR_CODES = [-32603]
 
+# Default maximum number of retries in `make_request`
+MAX_RETRIES = 10
+
+# Maximum number of claim IDs sent in a single bulk view count or reaction 
+# request, and the number of retries for a batch before it is split in two
+BULK_BATCH_SIZE = 100
+BULK_MAX_RETRIES = 3
+
+# Maximum number of URLs sent in a single `resolve` request
+RESOLVE_BATCH_SIZE = 200
+
+# Maximum number of `get` calls sent in a single JSON-RPC batch request
+STREAMING_URL_BATCH_SIZE = 20
+
+# Maximum number of results `claim_search` returns for a single query, and the 
+# page size used when fetching time ranges in parallel
+CLAIM_SEARCH_LIMIT = 1000
+CLAIM_SEARCH_PAGE_SIZE = 50
+
+# Page size used for `comment.List` requests, the largest the comment API 
+# accepts, and the default number of comment pages fetched concurrently
+COMMENT_PAGE_SIZE = 50
+COMMENT_MAX_WORKERS = 4
+
+# Maximum number of comment IDs sent in a single `reaction.List` request. 
+# Comment IDs are 64 characters long, so this keeps the comma-joined 
+# `comment_ids` parameter of a request around 13 kB
+COMMENT_REACTION_BATCH_SIZE = 200
+
+# Number of results per page of the recommendation API (the number it returns 
+# by default), and the maximum number of `(video_title, video_id, depth)` 
+# queries whose results are kept in memory
+RECOMMENDATION_PAGE_SIZE = 20
+RECOMMENDATION_CACHE_SIZE = 10000
+
+# HTTP status codes of responses that reject the authorization token of a 
+# request, after which the token is replaced
+TOKEN_REJECTED_STATUS_CODES = [401]
+
+# HTTP status codes of responses that throttle the authorization token of a 
+# request, after which the token is taken out of rotation by token pools
+TOKEN_THROTTLED_STATUS_CODES = [429]
+
+# HTTP status codes of responses that reject a bulk request for its size or its 
+# content (payload or URL too long, invalid claim ID), after which the batch of 
+# the request is split in two
+BATCH_REJECTED_STATUS_CODES = [400, 413, 414]
+
+# Number of seconds JSON-RPC batch requests are skipped after the backend has 
+# rejected one
+BATCH_REJECTION_TIMEOUT = 3600
+
+# Connection pool settings for sessions created by `make_session`
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 32
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+_cache = None
+
+_token_provider = None
+_token_provider_lock = threading.Lock()
+
+_rate_limiter = RateLimiter()
+
+_recommendation_cache = OrderedDict()
+_recommendation_cache_lock = threading.Lock()
+
+# Time until which `get_streaming_urls` sends one request per video instead of 
+# JSON-RPC batch requests, set to `BATCH_REJECTION_TIMEOUT` seconds after the 
+# backend last rejected a batch request
+_batch_requests_rejected_until = 0.0
+
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def make_request(request: Callable, kwargs: dict) -> requests.Response:
+class MaxRetriesError(ValueError):
+
+    """Raised by ``make_request`` once all attempts of a request have failed.
+
+    Attributes
+    ----------
+    status_codes: list<int>
+        HTTP status code of each failed attempt, ``200`` for responses with a 
+        JSON error, and ``None`` for attempts that raised before a response 
+        was received.
+    """
+
+    def __init__(self, msg: str, status_codes: List[Optional[int]]):
+
+        super().__init__(msg)
+
+        self.status_codes = status_codes
+
+    #-------------------------------------------------------------------------#
+
+    def is_batch_rejected(self) -> bool:
+
+        """Whether every attempt was rejected for its content rather than 
+        throttled or failed, so that smaller requests may succeed.
+        """
+
+        return all(status_code == 200 or status_code in BATCH_REJECTED_STATUS_CODES for status_code in self.status_codes)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def make_session(pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+
+    """Create a ``requests.Session`` that keeps connections to the Odysee APIs 
+    alive between requests.
+
+    Each host (e.g. ``api.odysee.com``, ``comments.odysee.com``) gets its own 
+    pool of keep-alive connections, so repeated calls reuse the same TCP and 
+    TLS connection instead of performing a new handshake for every request. 
+    Responses are requested with gzip/deflate compression.
+
+    Parameters
+    ----------
+    pool_connections: int
+        Number of per-host connection pools to cache.
+    pool_maxsize: int
+        Maximum number of connections kept alive in each pool. This should be 
+        at least the number of threads sharing the session.
+
+    Returns
+    -------
+    session: requests.Session
+    """
+
+    adapter = HTTPAdapter(
+        pool_connections = pool_connections,
+        pool_maxsize = pool_maxsize)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+
+    return session
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_default_session() -> requests.Session:
+
+    """Return the pooled session shared by all API calls that are not given an 
+    explicit ``session``.
+    """
+
+    global _default_session
+
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = make_session()
+
+    return _default_session
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def set_cache(cache: Optional[ResponseCache]):
+
+    """Enable the persistent response cache for all requests made through 
+    ``make_request``, or disable it by passing ``None``.
+
+    Parameters
+    ----------
+    cache: polyphemus.cache.ResponseCache
+        e.g. ``ResponseCache('polyphemus_cache.sqlite')``
+    """
+
+    global _cache
+
+    _cache = cache
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_cache() -> Optional[ResponseCache]:
+
+    """Return the response cache set with ``set_cache``, if any.
+    """
+
+    return _cache
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def set_token_provider(token_provider: Optional[TokenProvider]):
+
+    """Set the token provider used by all API calls that require an 
+    authorization token but are not given an explicit ``auth_token``. Passing 
+    ``None`` restores the default provider.
+
+    Parameters
+    ----------
+    token_provider: polyphemus.auth.TokenProvider
+        e.g. ``TokenProvider('auth_token.txt')``, or ``TokenProvider(None)`` to 
+        keep the token in memory only.
+    """
+
+    global _token_provider
+
+    with _token_provider_lock:
+        _token_provider = token_provider
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_token_provider() -> TokenProvider:
+
+    """Return the token provider set with ``set_token_provider``, or the 
+    default provider, which keeps its token in ``auth.DEFAULT_TOKEN_PATH`` so 
+    that it is reused across runs.
+    """
+
+    global _token_provider
+
+    with _token_provider_lock:
+        if _token_provider is None:
+            _token_provider = TokenProvider()
+
+    return _token_provider
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def set_rate_limiter(rate_limiter: Optional[RateLimiter]):
+
+    """Replace the rate limiter shared by all requests made through 
+    ``make_request``, or disable rate limiting by passing ``None``.
+
+    Parameters
+    ----------
+    rate_limiter: polyphemus.ratelimit.RateLimiter
+        e.g. ``RateLimiter(host_rates = {'comments.odysee.com': 10})``
+    """
+
+    global _rate_limiter
+
+    _rate_limiter = rate_limiter
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+
+    """Return the rate limiter shared by all requests, if any.
+    """
+
+    return _rate_limiter
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def loads_json(content: bytes):
+
+    """Decode a JSON response body directly from bytes, using ``orjson`` if it 
+    is installed and the standard library ``json`` module otherwise.
+    """
+
+    if orjson is not None:
+        return orjson.loads(content)
+
+    return json.loads(content)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def json_response_error(parsed_response) -> Optional[dict]:
+
+    """Return the ``error`` field of a parsed JSON response if the request 
+    should be retried, or ``None`` if the response can be used. 
+
+    List responses (e.g. from the recommendation API) never contain errors, and 
+    errors with a code in ``ALLOWED_ERROR_CODES`` are accepted.
+    """
+
+    if isinstance(parsed_response, list):
+        return None
+
+    error = parsed_response.get('error')
+
+    if error is None:
+        return None
+
+    if isinstance(error, dict) and error.get('code', None) in ALLOWED_ERROR_CODES:
+        return None
+
+    return error
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def make_request(request: Callable, kwargs: dict, session: requests.Session = None, max_retries: int = MAX_RETRIES, token_provider: Optional[TokenProvider] = None) -> requests.Response:
 
     """Wrapper for retrying request multiple times and handling errors.
 
     This function handles Python exceptions (e.g. HTTPConnectionPool), 
     unsuccessful HTTP error codes (e.g. 429, 403), and errors in the 
-    JSON response. If after 5 retries (using exponential backoff) the request 
-    is unsuccessful, an exception is raised. 
+    JSON response. If after ``max_retries`` retries (using jittered 
+    exponential backoff, or the ``Retry-After`` time of the response) the 
+    request is unsuccessful, an exception is raised. 
+
+    Requests go through the rate limiter of ``get_rate_limiter``, which limits 
+    the rate and concurrency of requests to each host, and raises a 
+    ``polyphemus.ratelimit.CircuitOpenError`` (a ``ValueError``) without 
+    sending the request if its endpoint has failed repeatedly.
+
+    If a response cache has been enabled with ``set_cache``, cached responses 
+    are returned without making a request, and successful responses are added 
+    to the cache.
+
+    Use ``request_json`` instead to get the decoded JSON payload without 
+    decoding the response a second time.
 
     Parameters
     ----------
@@ -47,12 +356,58 @@ def make_request(request: Callable, kwargs: dict) -> requests.Response:
         Keyword arguments for the ``request`` function. Must include ``url`` key.
         e.g. ``{'url': 'https://api.odysee.com/user/new'}``
         Uses a default timeout of 15 seconds.
+    session: requests.Session
+        Session used to send the request. If ``None``, the shared session from 
+        ``get_default_session`` is used, so that connections are reused.
+    max_retries: int
+        Maximum number of attempts before a ``ValueError`` is raised.
+    token_provider: polyphemus.auth.TokenProvider
+        If given, a token from this provider is set as the ``auth_token`` field 
+        of ``kwargs['data']`` (or of ``kwargs['params']`` if there is no 
+        ``data``) before each attempt. If the response status code is in 
+        ``TOKEN_REJECTED_STATUS_CODES``, the token is invalidated and the 
+        request is retried with a new one. If it is in 
+        ``TOKEN_THROTTLED_STATUS_CODES``, the provider is told to throttle the 
+        token, so that a ``polyphemus.auth.TokenPool`` retries the request with 
+        another token.
 
     Returns
     -------
     response: requests.Response
     """
 
+    response, _ = _send_request(request = request, kwargs = kwargs, session = session, max_retries = max_retries, token_provider = token_provider)
+
+    return response
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def request_json(request: Callable, kwargs: dict, session: requests.Session = None, max_retries: int = MAX_RETRIES, token_provider: Optional[TokenProvider] = None):
+
+    """Same as ``make_request``, but return the JSON payload of the response.
+
+    The response body is decoded from bytes exactly once (with ``orjson`` if 
+    it is installed), and the decoded payload is used both to check for errors 
+    and as the return value.
+
+    Returns
+    -------
+    payload: dict or list
+        Decoded JSON body of the response.
+    """
+
+    _, payload = _send_request(request = request, kwargs = kwargs, session = session, max_retries = max_retries, token_provider = token_provider)
+
+    return payload
+
+#-----------------------------------------------------------------------------#
+
+def _send_request(request: Callable, kwargs: dict, session: requests.Session = None, max_retries: int = MAX_RETRIES, token_provider: Optional[TokenProvider] = None) -> Tuple[requests.Response, object]:
+
+    """Implementation of ``make_request``, returning both the response and its 
+    decoded JSON payload.
+    """
+
     if request not in [requests.get, requests.post]:
         msg = f'`request` argument must be either `requests.get` or `requests.post`, not {type(request)}'
         raise ValueError(msg)
@@ -60,62 +415,151 @@ def make_request(request: Callable, kwargs: dict) -> requests.Response:
     if 'timeout' not in kwargs:
         kwargs['timeout'] = 15
 
-    n_retries = 0
+    if session is None:
+        session = get_default_session()
 
-    response = requests.Response()
-    response.status_code = 418
+    method = 'GET' if request is requests.get else 'POST'
 
-    retry_reasons = []
+    cache = _cache
+
+    if cache is not None:
+        content = cache.get(method, kwargs)
+        if content is not None:
+            return _make_cached_response(content, url = kwargs['url']), loads_json(content)
 
-    # TODO this looks a bit gross, try to refactor
-    while n_retries < 10:
-        time.sleep(2 ** n_retries - 1)
+    n_retries = 0
+
+    retry_reasons = []
+    status_codes = []
+
+    if token_provider is not None:
+        token_field = 'data' if 'data' in kwargs else 'params'
+        kwargs[token_field] = dict(kwargs.get(token_field) or {})
+
+    rate_limiter = _rate_limiter
+    endpoint = get_endpoint(kwargs)
+    retry_after = None
+
+    while n_retries < max_retries:
+        if n_retries > 0:
+            time.sleep(backoff_delay(n_retries, retry_after = retry_after))
+        status_code = None
+        retry_after = None
+        acquired = False
         try:
-            response = request(**kwargs)
+            if token_provider is not None:
+                auth_token = token_provider.get(session = session)
+                kwargs[token_field]['auth_token'] = auth_token
+            if rate_limiter is not None:
+                rate_limiter.acquire(url = kwargs['url'], endpoint = endpoint)
+                acquired = True
+            response = session.request(method, **kwargs)
+            status_code = response.status_code
+            retry_after = get_retry_after(response.headers)
+            if token_provider is not None and report_token_status(token_provider, auth_token, response.status_code, response.headers):
+                # The request is retried right away with another token
+                retry_after = None
             if response.status_code == 200:
-                parsed_response = json.loads(response.text)
-                if isinstance(parsed_response, list):
-                    return response
-                if parsed_response.get('error') is not None:
-                    if parsed_response['error'].get('code', None) not in ALLOWED_ERROR_CODES:
-                        retry_reasons.append(f'JSON response error: {parsed_response["error"]}')
-                        n_retries += 1
-                    else:
-                        return response
-                else:
-                    return response
+                payload = loads_json(response.content)
+                error = json_response_error(payload)
+                if error is None:
+                    if cache is not None:
+                        cache.set(method, kwargs, response.content)
+                    return response, payload
+                retry_reasons.append(f'JSON response error: {error}')
+                status_codes.append(status_code)
+                n_retries += 1
             else:
                 retry_reasons.append(f'HTTP status code: {response.status_code}')
+                status_codes.append(status_code)
                 n_retries += 1
+        except CircuitOpenError as exception:
+            # Wait for the circuit to let a trial request through, within the 
+            # retry budget
+            retry_reasons.append(f'Python exception: {exception}')
+            status_codes.append(None)
+            retry_after = rate_limiter.reset_timeout
+            n_retries += 1
         except Exception as exception:
             retry_reasons.append(f'Python exception: {exception}')
-            n_retries += 1            
+            status_codes.append(None)
+            n_retries += 1
+        finally:
+            if acquired:
+                rate_limiter.release(url = kwargs['url'], endpoint = endpoint, status_code = status_code, retry_after = retry_after)
 
     msg = f'Maximum number of retries reached for request {request} with kwargs {kwargs}. Retry reasons: {retry_reasons}'
-    raise ValueError(msg)
+    raise MaxRetriesError(msg, status_codes)
+
+#-----------------------------------------------------------------------------#
+
+def report_token_status(token_provider: TokenProvider, auth_token: str, status_code: int, headers) -> bool:
+
+    """Invalidate or throttle the token used for a request, depending on the 
+    status code of its response. Return ``True`` if the token was throttled 
+    and taken out of rotation, so that the request can be retried without 
+    waiting for the ``Retry-After`` time.
+    """
+
+    if status_code in TOKEN_REJECTED_STATUS_CODES:
+        token_provider.invalidate(auth_token)
+    elif status_code in TOKEN_THROTTLED_STATUS_CODES:
+        return bool(token_provider.throttle(auth_token, get_retry_after(headers)))
+
+    return False
+
+#-----------------------------------------------------------------------------#
+
+def get_retry_after(headers) -> Optional[float]:
+
+    """Return the number of seconds of the ``Retry-After`` header of a 
+    response, or ``None`` if it is missing or not a number of seconds.
+    """
+
+    try:
+        return max(0.0, float(headers.get('Retry-After')))
+    except (TypeError, ValueError):
+        return None
+
+#-----------------------------------------------------------------------------#
+
+def _make_cached_response(content: bytes, url: str) -> requests.Response:
+
+    """Build a successful ``requests.Response`` from a cached response body.
+    """
+
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.encoding = 'utf-8'
+    response._content = content
+
+    return response
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def get_auth_token() -> str:
+def get_auth_token(session: requests.Session = None) -> str:
 
     """Get a fresh authorization token, to use for API calls that require it.
 
     Note: calling this function many times in quick succession may result in a 
-    503 error. 
+    503 error. API calls that are not given an ``auth_token`` use the token of 
+    ``get_token_provider`` instead, which is only replaced once it is rejected.
     """
 
-    response = make_request(
+    result = request_json(
         request = requests.post,
         kwargs = {
-            'url' : NEW_USER_API_URL})
+            'url' : NEW_USER_API_URL},
+        session = session)
 
-    auth_token = json.loads(response.text)['data']['auth_token']
+    auth_token = result['data']['auth_token']
 
     return auth_token
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def get_channel_info(channel_name: str) -> dict:
+def get_channel_info(channel_name: str, session: requests.Session = None) -> dict:
 
     """Get the channel information and ID from the channel name. 
     """
@@ -128,175 +572,543 @@ def get_channel_info(channel_name: str) -> dict:
         "params":{
             "urls":[channel_url]}}
 
-    response = make_request(
+    response, result = _send_request(
         request = requests.post,
         kwargs = {
             'url' : BACKEND_API_URL, 
-            'json': json_data})
-
-    result = json.loads(response.text)
-    
-    info = result['result'][channel_url]
+            'json': json_data},
+        session = session)
     
-    info = {
+    info = parse_channel_info(result['result'][channel_url], raw = response.text)
+
+    return info 
+
+#-----------------------------------------------------------------------------#
+
+def get_channel_info_bulk(channel_names: List[str], session: requests.Session = None, batch_size: int = RESOLVE_BATCH_SIZE) -> Dict[str, dict]:
+
+    """Get the channel information and ID of many channels, resolving up to 
+    ``batch_size`` channel URLs per ``resolve`` request.
+
+    Parameters
+    ----------
+    channel_names: list<str>
+        Names of the channels, without the leading ``'@'``.
+    session: requests.Session
+        Session used for all requests.
+    batch_size: int
+        Maximum number of channels per request.
+
+    Returns
+    -------
+    channel_info: dict<str, dict>
+        Channel information as returned by ``get_channel_info``, keyed by 
+        channel name, with ``'raw'`` holding the JSON of the channel's claim 
+        only. Channels that cannot be resolved are left out.
+    """
+
+    channel_names = list(dict.fromkeys(channel_names))
+
+    channel_info = {}
+
+    for i in range(0, len(channel_names), batch_size):
+
+        batch = channel_names[i:i + batch_size]
+        channel_urls = [f'lbry://@{channel_name}' for channel_name in batch]
+
+        json_data = {
+            "jsonrpc":"2.0",
+            "method":"resolve",
+            "params":{
+                "urls":channel_urls}}
+
+        result = request_json(
+            request = requests.post,
+            kwargs = {
+                'url' : BACKEND_API_URL, 
+                'json': json_data},
+            session = session)
+
+        for channel_name, channel_url in zip(batch, channel_urls):
+            info = result['result'].get(channel_url, {})
+            if 'claim_id' in info:
+                channel_info[channel_name] = parse_channel_info(info, raw = json.dumps(info))
+
+    return channel_info
+
+#-----------------------------------------------------------------------------#
+
+def parse_channel_info(info: dict, raw: str) -> dict:
+
+    """Get the channel information returned by ``get_channel_info`` from the 
+    resolved claim of a channel, with ``raw`` as its ``'raw'`` field.
+    """
+
+    return {
         'channel_id' : info['claim_id'],
         'title' : info['value'].get('title'),
         'created': info['timestamp'],
         'description': info['value'].get('description'),
         'cover_image': info['value'].get('cover',{}).get('url'),
         'thumbnail_image': info['value'].get('thumbnail',{}).get('url'),
-        'raw' : response.text}
+        'raw' : raw}
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_subscribers(channel_id: str, auth_token: str = None, session: requests.Session = None) -> int:
+
+    """Get the number of subscribers for a channel.  
+    """
+
+    token_provider = get_token_provider() if auth_token is None else None
+
+    json_data = {
+        'auth_token': auth_token,
+        'claim_id': channel_id }
+
+    result = request_json(
+        request = requests.post,
+        kwargs = {
+            'url' : SUBSCRIBER_API_URL, 
+            'data': json_data},
+        session = session,
+        token_provider = token_provider)
+    subscribers = result['data'][0]
+
+    return subscribers
+
+#-----------------------------------------------------------------------------#
+
+def get_subscribers_bulk(channel_ids: List[str], auth_token: str = None, session: requests.Session = None, batch_size: int = BULK_BATCH_SIZE) -> Dict[str, int]:
+
+    """Get the number of subscribers for many channels, using one request per 
+    ``batch_size`` channel claim IDs.
+
+    Parameters
+    ----------
+    channel_ids: list<str>
+        Claim IDs of the channels. Duplicates are only requested once.
+    auth_token: str
+        Authorization token. If ``None``, the token of ``get_token_provider`` 
+        is used.
+    session: requests.Session
+        Session used for all requests.
+    batch_size: int
+        Maximum number of claim IDs per request. Batches that fail are split 
+        in two and retried.
+
+    Returns
+    -------
+    subscribers: dict<str, int>
+        Number of subscribers keyed by channel claim ID.
+    """
+
+    token_provider = get_token_provider() if auth_token is None else None
+
+    def _get_subscribers(batch: List[str], max_retries: int) -> Dict[str, int]:
+
+        json_data = {
+            'auth_token': auth_token,
+            'claim_id': ','.join(batch) }
+
+        result = request_json(
+            request = requests.post,
+            kwargs = {
+                'url' : SUBSCRIBER_API_URL, 
+                'data': json_data},
+            session = session,
+            max_retries = max_retries,
+            token_provider = token_provider)
+
+        subscribers = result['data']
+
+        if len(subscribers) != len(batch):
+            raise ValueError(f'Expected {len(batch)} subscriber counts, got {len(subscribers)}')
+
+        return dict(zip(batch, subscribers))
+
+    return _request_in_batches(_get_subscribers, channel_ids, batch_size)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_raw_video_info_list(channel_id: str, session: requests.Session = None, since: Optional[int] = None, known_claim_ids: Optional[Set[str]] = None) -> List[dict]:
+
+    """Get a list of all videos posted by a specified channel name. 
+
+    Odysee's ``claim_search`` API (which is used on the browser and LBRY 
+    desktop app) only allows up to 1000 videos to be fetched for a single value 
+    of the ``release_time`` parameter. You can check this by going to an Odysee 
+    channel with a lot of videos (e.g. @etresouverain) and holding the 
+    "Page Down" button until you reach the bottom, there will only be 1000 
+    videos. 
+    
+    This function loops over all pages for a single ``release_time`` and 
+    fetches the raw video info for all videos until it reaches that 1000 video 
+    limit, then uses the minimum of the ``creation_timestamp`` for all videos 
+    as the new ``release_time``, and starts over looping over all pages for 
+    that new ``release_time``. 
+
+    For incremental scraping, ``since`` and ``known_claim_ids`` stop the search 
+    once it reaches videos that have already been scraped, so that only the 
+    first few pages of a channel are requested.
+
+    Parameters
+    ----------
+    channel_id: str
+        Claim ID of the channel.
+    session: requests.Session
+        Session used for all requests.
+    since: int
+        If given, only videos with a ``release_time`` at or after this UNIX 
+        timestamp are returned (e.g. the latest release time from a previous 
+        scrape, so that videos released in the same second are not missed).
+    known_claim_ids: set<str>
+        If given, videos with these claim IDs are not returned. Without 
+        ``since``, paging also stops at the first page containing one of them; 
+        with ``since``, the search is already bounded, and known videos (e.g. 
+        scheduled ones, released in the future) can come before new ones.
+
+    Returns
+    -------
+    raw_video_info_list: list<dict>
+        List of dictionaries, with each dict corresponding to a JSON response 
+        containing data about a single video.
+
+    """
+
+    raw_video_info_list = list(iter_raw_video_info(
+        channel_id = channel_id,
+        session = session,
+        since = since,
+        known_claim_ids = known_claim_ids))
+
+    return raw_video_info_list
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def iter_raw_video_info(channel_id: str, session: requests.Session = None, since: Optional[int] = None, known_claim_ids: Optional[Set[str]] = None) -> Generator[dict, None, None]:
+
+    """Streaming version of ``get_raw_video_info_list``, yielding the raw video 
+    info of each video as soon as its ``claim_search`` page has been received. 
+
+    Only the claim IDs of the videos already yielded and the minimum 
+    ``creation_timestamp`` are kept in memory, so memory use does not grow with 
+    the size of the raw video info, and downstream processing can start after 
+    the first page. Takes the same parameters as ``get_raw_video_info_list``.
+
+    Returns
+    -------
+    raw_video_info: generator<dict>
+        Dictionaries corresponding to a JSON response containing data about a 
+        single video, in the same order as ``get_raw_video_info_list``.
+    """
+
+    pager = ClaimSearchPager(channel_id, since = since, known_claim_ids = known_claim_ids)
+
+    while not pager.done:
+
+        result = request_json(
+            request = requests.post,
+            kwargs = {
+                'url' : BACKEND_API_URL, 
+                'json': pager.next_request()},
+            session = session)
+
+        yield from pager.add_page(result['result']['items'])
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class ClaimSearchPager:
+
+    """Paging state of the ``claim_search`` requests listing the videos of a 
+    channel, shared by ``iter_raw_video_info`` and its asynchronous equivalent 
+    in ``polyphemus.aio``, which only differ in how each request is sent.
+
+    Parameters
+    ----------
+    channel_id: str
+    since: int
+    known_claim_ids: set<str>
+        See ``get_raw_video_info_list``.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, channel_id: str, since: Optional[int] = None, known_claim_ids: Optional[Set[str]] = None):
+
+        self.channel_id = channel_id
+        self.since = since
+        self.known_claim_ids = known_claim_ids
+        self.done = False
+
+        self._seen_claim_ids = set()
+        self._min_creation_timestamp = None
+        self._page = 1
+        self._release_time = int(time.time()) + 86400
+        self._hit_video_limit = False
+
+    #-------------------------------------------------------------------------#
+
+    def next_request(self) -> dict:
+
+        """Return the JSON payload of the next ``claim_search`` request.
+        """
+
+        return {
+            "jsonrpc":"2.0",
+            "method":"claim_search",
+            "params":{
+                "page_size":30,
+                "page":self._page,
+                "order_by":["release_time"],
+                "channel_ids":[self.channel_id],
+                "release_time": f"<{self._release_time}" if self.since is None else [f"<{self._release_time}", f">={self.since}"]}}
+
+    #-------------------------------------------------------------------------#
+
+    def add_page(self, videos: List[dict]) -> List[dict]:
+
+        """Record the videos of the page returned for the last request, and 
+        return those that have not been returned yet. Sets ``done`` once all 
+        videos of the channel have been listed.
+        """
+
+        if self.known_claim_ids is not None:
+            reached_known_video = self.since is None and any(video['claim_id'] in self.known_claim_ids for video in videos)
+            videos = [video for video in videos if video['claim_id'] not in self.known_claim_ids]
+        else:
+            reached_known_video = False
+
+        new_videos = {video['claim_id'] : video for video in videos if video['claim_id'] not in self._seen_claim_ids}
+
+        self._seen_claim_ids.update(new_videos)
+        for video in new_videos.values():
+            if self._min_creation_timestamp is None or video['meta']['creation_timestamp'] < self._min_creation_timestamp:
+                self._min_creation_timestamp = video['meta']['creation_timestamp']
+
+        if reached_known_video:
+            # videos are ordered by `release_time`, so all videos on the 
+            # following pages have already been scraped
+            self.done = True
+
+        elif len(new_videos) == 0:
+            # if there are no new videos that haven't already been scraped
+            if self._hit_video_limit:
+                # if Odysee's limit of 1000 videos for a given timestamp was 
+                # reached (which updates the `release_time`) on the last 
+                # request, this means we have scraped all videos on the channel, 
+                # so we stop.
+                self.done = True
+            else:
+                # we have hit Odysee's limit of 1000 videos for a given 
+                # timestamp, so we update `release_time` and reset `page`
+                self._hit_video_limit = True
+                self._release_time = self._min_creation_timestamp if self._min_creation_timestamp is not None else 0
+                self._page = 1
+        else:
+            # there were unscraped videos from the last request, so we keep 
+            # going and increment the `page` variable
+            self._page += 1
+            self._hit_video_limit = False
+
+        return list(new_videos.values())
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_raw_video_info_list_partitioned(channel_id: str, session: requests.Session = None, since: Optional[int] = None, max_workers: int = 8) -> List[dict]:
+
+    """Get a list of all videos posted by a channel, fetching disjoint 
+    ``release_time`` ranges concurrently.
+
+    Unlike ``get_raw_video_info_list``, which has to finish each window of 1000 
+    videos before it knows where the next one starts, this function first 
+    probes the release times of the channel's oldest and newest videos, and 
+    splits that interval into ``max_workers`` ranges bounded with both ``>=`` 
+    and ``<``. Any range with at least ``CLAIM_SEARCH_LIMIT`` videos is 
+    recursively split in half, and the pages of all remaining ranges are then 
+    fetched concurrently. 
+
+    Parameters
+    ----------
+    channel_id: str
+        Claim ID of the channel.
+    session: requests.Session
+        Session used for all requests.
+    since: int
+        If given, only videos with a ``release_time`` at or after this UNIX 
+        timestamp are returned.
+    max_workers: int
+        Number of requests made concurrently.
+
+    Returns
+    -------
+    raw_video_info_list: list<dict>
+        List of dictionaries, with each dict corresponding to a JSON response 
+        containing data about a single video, from newest to oldest and 
+        deduplicated by ``claim_id``.
+    """
+
+    upper = int(time.time()) + 86400
+    lower = 0 if since is None else since
+
+    newest = _claim_search_time_range(channel_id, lower, upper, page = 1, page_size = 1, session = session)['items']
+    oldest = _claim_search_time_range(channel_id, lower, upper, page = 1, page_size = 1, session = session, ascending = True)['items']
+
+    if not newest or not oldest:
+        return []
+
+    lower = max(lower, get_release_time(oldest[0]))
+    upper = get_release_time(newest[0]) + 1
+
+    step = max(1, -(-(upper - lower) // max(1, max_workers)))
+    time_ranges = [(start, min(start + step, upper)) for start in range(upper - step, lower - step, -step)]
+    time_ranges = [(max(start, lower), end) for start, end in time_ranges]
+
+    def _get_first_page(time_range: Tuple[int, int]) -> Tuple[Tuple[int, int], dict]:
+        return time_range, _claim_search_time_range(channel_id, *time_range, page = 1, page_size = CLAIM_SEARCH_PAGE_SIZE, session = session)
+
+    # Split every range that hits the `claim_search` limit, keeping the first 
+    # page of each final range
+    first_pages = []
+
+    while time_ranges:
+
+        results = list(imap(_get_first_page, time_ranges, max_workers = max_workers))
+        time_ranges = []
+
+        for (start, end), result in results:
+            if result.get('total_items', 0) >= CLAIM_SEARCH_LIMIT and end - start > 1:
+                middle = (start + end) // 2
+                time_ranges.extend([(middle, end), (start, middle)])
+            else:
+                first_pages.append(((start, end), result))
+
+    first_pages.sort(key = lambda time_range_and_result: -time_range_and_result[0][0])
+
+    # Fetch all remaining pages of every range concurrently
+    page_requests = [
+        ((start, end), page)
+        for (start, end), result in first_pages
+        for page in range(2, _get_n_pages(result) + 1)]
+
+    def _get_page(time_range_and_page: Tuple[Tuple[int, int], int]) -> List[dict]:
+        (start, end), page = time_range_and_page
+        return _claim_search_time_range(channel_id, start, end, page = page, page_size = CLAIM_SEARCH_PAGE_SIZE, session = session)['items']
+
+    pages = iter(imap(_get_page, page_requests, max_workers = max_workers))
+
+    claim_id_to_raw_video_info = {}
 
-    return info 
+    for (start, end), result in first_pages:
+        items = list(result['items'])
+        for _ in range(2, _get_n_pages(result) + 1):
+            items.extend(next(pages))
+        for raw_video_info in items:
+            claim_id_to_raw_video_info.setdefault(raw_video_info['claim_id'], raw_video_info)
 
-#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+    return list(claim_id_to_raw_video_info.values())
 
-def get_subscribers(channel_id: str, auth_token: str = None) -> int:
+#-----------------------------------------------------------------------------#
 
-    """Get the number of subscribers for a channel.  
-    """
+def _claim_search_time_range(channel_id: str, start: int, end: int, page: int, page_size: int, session: requests.Session = None, ascending: bool = False) -> dict:
 
-    if auth_token is None:
-        auth_token = get_auth_token()
+    """Request a single ``claim_search`` page for the videos of a channel with 
+    a ``release_time`` in ``[start, end)``.
+    """
 
     json_data = {
-        'auth_token': auth_token,
-        'claim_id': channel_id }
+        "jsonrpc":"2.0",
+        "method":"claim_search",
+        "params":{
+            "page_size":page_size,
+            "page":page,
+            "order_by":["^release_time" if ascending else "release_time"],
+            "channel_ids":[channel_id],
+            "release_time": [f"<{end}", f">={start}"]}}
 
-    response = make_request(
+    result = request_json(
         request = requests.post,
         kwargs = {
-            'url' : SUBSCRIBER_API_URL, 
-            'data': json_data})
-
-    result = json.loads(response.text)
-    subscribers = result['data'][0]
-
-    return subscribers
-
-#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
-
-def get_raw_video_info_list(channel_id: str) -> dict:
+            'url' : BACKEND_API_URL, 
+            'json': json_data},
+        session = session)
 
-    """Get a list of all videos posted by a specified channel name. 
+    return result['result']
 
-    Odysee's ``claim_search`` API (which is used on the browser and LBRY 
-    desktop app) only allows up to 1000 videos to be fetched for a single value 
-    of the ``release_time`` parameter. You can check this by going to an Odysee 
-    channel with a lot of videos (e.g. @etresouverain) and holding the 
-    "Page Down" button until you reach the bottom, there will only be 1000 
-    videos. 
-    
-    This function loops over all pages for a single ``release_time`` and 
-    fetches the raw video info for all videos until it reaches that 1000 video 
-    limit, then uses the minimum of the ``creation_timestamp`` for all videos 
-    as the new ``release_time``, and starts over looping over all pages for 
-    that new ``release_time``. 
+#-----------------------------------------------------------------------------#
 
-    Returns
-    -------
-    raw_video_info_list: list<dict>
-        List of dictionaries, with each dict corresponding to a JSON response 
-        containing data about a single video.
+def _get_n_pages(result: dict) -> int:
 
+    """Number of pages that can be requested for a ``claim_search`` query, 
+    given its first page.
     """
 
-    claim_id_to_raw_video_info = {}
-    page = 1
-    release_time = int(time.time()) + 86400
-    hit_video_limit = False
+    page_size = result.get('page_size', CLAIM_SEARCH_PAGE_SIZE)
+    max_pages = -(-CLAIM_SEARCH_LIMIT // page_size)
 
-    while True:
+    if 'total_items' in result:
+        return min(-(-result['total_items'] // page_size), max_pages)
 
-        json_data = {
-            "jsonrpc":"2.0",
-            "method":"claim_search",
-            "params":{
-                "page_size":30,
-                "page":page,
-                "order_by":["release_time"],
-                "channel_ids":[channel_id],
-                "release_time": f"<{release_time}"}}
+    return min(result.get('total_pages', 1), max_pages)
 
-        response = make_request(
-            request = requests.post,
-            kwargs = {
-                'url' : BACKEND_API_URL, 
-                'json': json_data})
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-        result = json.loads(response.text)
+def get_release_time(raw_video_info: dict) -> int:
 
-        videos = result['result']['items']
-        new_videos = {video['claim_id'] : video for video in videos if video['claim_id'] not in claim_id_to_raw_video_info}
+    """Get the ``release_time`` of a video as used by ``claim_search``, falling 
+    back to its ``creation_timestamp``.
+    """
 
-        if len(new_videos) == 0:
-            # if there are no new videos that haven't already been scraped
-            if hit_video_limit:
-                # if Odysee's limit of 1000 videos for a given timestamp was 
-                # reached (which updates the `release_time`) on the last 
-                # request, this means we have scraped all videos on the channel, 
-                # so we break the loop.
-                break
-            else:
-                # we have hit Odysee's limit of 1000 videos for a given 
-                # timestamp, so we update `release_time` and reset `page`
-                hit_video_limit = True
-                release_time = min([raw_video_info['meta']['creation_timestamp'] for raw_video_info in claim_id_to_raw_video_info.values()], default = 0)
-                page = 1
-        else:
-            # there were unscraped videos from the last request, so we keep 
-            # going in the loop and increment the `page` variable
-            claim_id_to_raw_video_info.update(new_videos)
-            page += 1
-            hit_video_limit = False
+    if 'release_time' in raw_video_info['value']:
+        return int(raw_video_info['value']['release_time'])
 
-    return list(claim_id_to_raw_video_info.values())
+    return int(raw_video_info['meta']['creation_timestamp'])
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def get_views(video_id: str, auth_token: str = None) -> int:
+def get_views(video_id: str, auth_token: str = None, session: requests.Session = None) -> int:
 
     """Get the number of views for a given video.
     """
 
-    if auth_token is None:
-        auth_token = get_auth_token()
+    token_provider = get_token_provider() if auth_token is None else None
 
     params = {
         'auth_token': auth_token,
         'claim_id': video_id }
 
-    response = make_request(
+    result = request_json(
         request = requests.get,
         kwargs = {
             'url' : VIEW_API_URL, 
-            'params': params})
+            'params': params},
+        session = session,
+        token_provider = token_provider)
 
-    views = json.loads(response.text)['data'][0]
+    views = result['data'][0]
 
     return views
     
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def get_video_reactions(video_id: str, auth_token: str = None) -> Tuple[Optional[int], Optional[int]]:
+def get_video_reactions(video_id: str, auth_token: str = None, session: requests.Session = None) -> Tuple[Optional[int], Optional[int]]:
 
     """Get all reactions for a given video.  
     """
 
-    if auth_token is None:
-        auth_token = get_auth_token()
+    token_provider = get_token_provider() if auth_token is None else None
 
     post_data = {
         'auth_token': auth_token,
         'claim_ids': video_id }
 
-    response = make_request(
+    result = request_json(
         request = requests.post,
         kwargs = {
             'url' : REACTION_API_URL, 
-            'data': post_data})
-
-    result = json.loads(response.text)
+            'data': post_data},
+        session = session,
+        token_provider = token_provider)
 
     if result['success']:
         reactions = result['data']['others_reactions'][video_id]
@@ -306,15 +1118,182 @@ def get_video_reactions(video_id: str, auth_token: str = None) -> Tuple[Optional
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def get_all_comments(video_id: str) -> List[dict]:
+def get_views_bulk(claim_ids: List[str], auth_token: str = None, session: requests.Session = None, batch_size: int = BULK_BATCH_SIZE) -> Dict[str, int]:
+
+    """Get the number of views for many videos, using one request per 
+    ``batch_size`` claim IDs. 
+
+    Parameters
+    ----------
+    claim_ids: list<str>
+        Claim IDs of the videos. Duplicates are only requested once.
+    auth_token: str
+        Authorization token. If ``None``, the token of ``get_token_provider`` 
+        is used.
+    session: requests.Session
+        Session used for all requests.
+    batch_size: int
+        Maximum number of claim IDs per request. Batches that fail are split 
+        in two and retried.
+
+    Returns
+    -------
+    views: dict<str, int>
+        Number of views, keyed by claim ID.
+    """
+
+    token_provider = get_token_provider() if auth_token is None else None
+
+    def _get_views(batch: List[str], max_retries: int) -> Dict[str, int]:
+
+        params = {
+            'auth_token': auth_token,
+            'claim_id': ','.join(batch) }
+
+        result = request_json(
+            request = requests.get,
+            kwargs = {
+                'url' : VIEW_API_URL, 
+                'params': params},
+            session = session,
+            max_retries = max_retries,
+            token_provider = token_provider)
+
+        views = result['data']
+
+        if len(views) != len(batch):
+            raise ValueError(f'Expected {len(batch)} view counts, got {len(views)}')
+
+        return dict(zip(batch, views))
+
+    return _request_in_batches(_get_views, claim_ids, batch_size)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_reactions_bulk(claim_ids: List[str], auth_token: str = None, session: requests.Session = None, batch_size: int = BULK_BATCH_SIZE) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+
+    """Get the likes and dislikes for many videos, using one request per 
+    ``batch_size`` claim IDs. 
+
+    Parameters
+    ----------
+    claim_ids: list<str>
+        Claim IDs of the videos. Duplicates are only requested once.
+    auth_token: str
+        Authorization token. If ``None``, the token of ``get_token_provider`` 
+        is used.
+    session: requests.Session
+        Session used for all requests.
+    batch_size: int
+        Maximum number of claim IDs per request. Batches that fail are split 
+        in two and retried.
+
+    Returns
+    -------
+    reactions: dict<str, tuple>
+        ``(likes, dislikes)`` tuples keyed by claim ID, with ``(None, None)`` 
+        for videos whose reactions are unavailable.
+    """
+
+    token_provider = get_token_provider() if auth_token is None else None
+
+    def _get_reactions(batch: List[str], max_retries: int) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+
+        post_data = {
+            'auth_token': auth_token,
+            'claim_ids': ','.join(batch) }
+
+        result = request_json(
+            request = requests.post,
+            kwargs = {
+                'url' : REACTION_API_URL, 
+                'data': post_data},
+            session = session,
+            max_retries = max_retries,
+            token_provider = token_provider)
+
+        if not result['success']:
+            return {claim_id : (None, None) for claim_id in batch}
+
+        others_reactions = result['data']['others_reactions']
+
+        return {claim_id : (others_reactions[claim_id]['like'], others_reactions[claim_id]['dislike']) for claim_id in batch}
+
+    return _request_in_batches(_get_reactions, claim_ids, batch_size)
+
+#-----------------------------------------------------------------------------#
+
+def _request_in_batches(request_batch: Callable[[List[str], int], dict], claim_ids: List[str], batch_size: int) -> dict:
+
+    """Call ``request_batch`` on consecutive batches of at most ``batch_size`` 
+    unique claim IDs and merge the resulting dicts. 
+
+    A batch that the API rejects (see ``MaxRetriesError.is_batch_rejected``) 
+    after ``BULK_MAX_RETRIES`` attempts, or whose response lacks some of its 
+    claim IDs, is split in half and each half is retried, down to single claim 
+    IDs, which get the full ``MAX_RETRIES`` attempts of ``make_request``. 
+    Throttled or otherwise failed batches are not split, since smaller 
+    requests would only add to the load, and their error is raised.
+    """
+
+    claim_ids = list(dict.fromkeys(claim_ids))
+
+    results = {}
+
+    for i in range(0, len(claim_ids), batch_size):
+        results.update(_request_with_fallback(request_batch, claim_ids[i:i + batch_size]))
+
+    return results
+
+#-----------------------------------------------------------------------------#
+
+def _request_with_fallback(request_batch: Callable[[List[str], int], dict], batch: List[str]) -> dict:
+
+    if len(batch) == 1:
+        return request_batch(batch, MAX_RETRIES)
+
+    try:
+        return request_batch(batch, BULK_MAX_RETRIES)
+    except MaxRetriesError as exception:
+        if not exception.is_batch_rejected():
+            raise
+    except (ValueError, KeyError, IndexError, TypeError):
+        # the response does not match the batch
+        pass
+
+    middle = len(batch) // 2
+
+    return {
+        **_request_with_fallback(request_batch, batch[:middle]),
+        **_request_with_fallback(request_batch, batch[middle:])}
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_all_comments(video_id: str, session: requests.Session = None, page_size: int = COMMENT_PAGE_SIZE, max_workers: int = COMMENT_MAX_WORKERS, reactions: bool = True) -> List[dict]:
 
     """Get a list of all comments for a single video. 
 
+    The first page of comments gives the total number of pages, the remaining 
+    pages are then fetched concurrently, and the reactions of each page are 
+    looked up in a separate stage as soon as the page has arrived, so comment 
+    pages and reaction lookups are requested at the same time.
+
     Parameters
     ----------
     video_id: str
         Claim ID for the video whose comments are to be scraped
         e.g. ``'84d2a91e910bee523af5422439a639f677b9c78f'`` 
+    session: requests.Session
+        Session used for all requests.
+    page_size: int
+        Number of comments requested per page.
+    max_workers: int
+        Number of comment pages (and reaction lookups) requested concurrently. 
+        If 1, pages are fetched one after the other.
+    reactions: bool
+        If ``False``, the ``'likes'`` and ``'dislikes'`` of the comments are not 
+        looked up, e.g. to request them later for the comments of many videos 
+        at once with ``append_comment_reactions_bulk``.
 
     Returns
     -------
@@ -323,44 +1302,83 @@ def get_all_comments(video_id: str) -> List[dict]:
         containing data about a single comment for the specified video.
     """
 
-    all_comments = []
+    def _get_page(page: int) -> dict:
+        return _get_comment_page(video_id = video_id, page = page, page_size = page_size, session = session)
 
-    page = 1
+    first_page = _get_page(1)
 
-    while True:
+    if 'items' not in first_page:
+        return []
 
-        json_data = {
-            "jsonrpc":"2.0",
-            "id":1,
-            "method":"comment.List",
-            "params":{
-                "page":page,
-                "claim_id":video_id,
-                "page_size":10,
-                "top_level":False,
-                "sort_by":3}}
+    if 'total_pages' in first_page:
+        pages = itertools.chain(
+            [first_page], 
+            imap(_get_page, range(2, first_page['total_pages'] + 1), max_workers = max_workers))
+    else:
+        pages = _iter_comment_pages(_get_page, first_page)
 
-        response = make_request(
-            request = requests.post,
-            kwargs = {
-                'url' : COMMENT_API_URL, 
-                'json': json_data})
+    def _append_reactions(comment_info_list: List[dict]) -> List[dict]:
+        return append_comment_reactions(comment_info_list = comment_info_list, session = session)
 
-        result = json.loads(response.text)
+    # Pages past the end (e.g. if comments were deleted while paging) have no 
+    # `items`, and are skipped
+    comment_pages = (page['items'] for page in pages if page.get('items'))
 
-        if 'items' not in result['result']:
-            break
-        else:
-            _comments = result['result']['items']
-            comments = append_comment_reactions(comment_info_list = _comments)
-            all_comments.extend(comments)
-            page += 1
+    if reactions:
+        comment_pages = imap(_append_reactions, comment_pages, max_workers = max_workers)
+
+    all_comments = []
+
+    for comments in comment_pages:
+        all_comments.extend(comments)
 
     return all_comments
 
+#-----------------------------------------------------------------------------#
+
+def _get_comment_page(video_id: str, page: int, page_size: int = COMMENT_PAGE_SIZE, session: requests.Session = None) -> dict:
+
+    """Request a single ``comment.List`` page for a video.
+    """
+
+    json_data = {
+        "jsonrpc":"2.0",
+        "id":1,
+        "method":"comment.List",
+        "params":{
+            "page":page,
+            "claim_id":video_id,
+            "page_size":page_size,
+            "top_level":False,
+            "sort_by":3}}
+
+    result = request_json(
+        request = requests.post,
+        kwargs = {
+            'url' : COMMENT_API_URL, 
+            'json': json_data},
+        session = session)
+
+    return result['result']
+
+#-----------------------------------------------------------------------------#
+
+def _iter_comment_pages(get_page: Callable[[int], dict], first_page: dict) -> Generator[dict, None, None]:
+
+    """Yield comment pages one after the other until a page has no ``items``, 
+    for responses that do not include ``total_pages``.
+    """
+
+    page, result = 1, first_page
+
+    while 'items' in result:
+        yield result
+        page += 1
+        result = get_page(page)
+
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def append_comment_reactions(comment_info_list: List[dict]) -> List[dict]:
+def append_comment_reactions(comment_info_list: List[dict], session: requests.Session = None) -> List[dict]:
     
     """Get reaction data for each comment and insert ``'reactions'`` key into 
     dict for each comment.
@@ -390,13 +1408,12 @@ def append_comment_reactions(comment_info_list: List[dict]) -> List[dict]:
         "params":{
             "comment_ids":comment_ids}}
 
-    response = make_request(
+    result = request_json(
         request = requests.post,
         kwargs = {
             'url' : COMMENT_API_URL, 
-            'json': json_data})
-
-    result = json.loads(response.text)
+            'json': json_data},
+        session = session)
 
     reactions = result['result']['others_reactions']
     
@@ -406,37 +1423,181 @@ def append_comment_reactions(comment_info_list: List[dict]) -> List[dict]:
         
     return comment_info_list
 
+#-----------------------------------------------------------------------------#
+
+def get_comment_reactions_bulk(comment_ids: List[str], session: requests.Session = None, batch_size: int = COMMENT_REACTION_BATCH_SIZE) -> Dict[str, Tuple[int, int]]:
+
+    """Get the likes and dislikes for many comments, possibly from many 
+    different videos, using one ``reaction.List`` request per ``batch_size`` 
+    comment IDs.
+
+    Parameters
+    ----------
+    comment_ids: list<str>
+        IDs of the comments. Duplicates are only requested once.
+    session: requests.Session
+        Session used for all requests.
+    batch_size: int
+        Maximum number of comment IDs per request. Batches that fail are split 
+        in two and retried.
+
+    Returns
+    -------
+    reactions: dict<str, tuple>
+        ``(likes, dislikes)`` tuples keyed by comment ID.
+    """
+
+    def _get_reactions(batch: List[str], max_retries: int) -> Dict[str, Tuple[int, int]]:
+
+        json_data = {
+            "jsonrpc":"2.0",
+            "id":1,
+            "method":"reaction.List",
+            "params":{
+                "comment_ids":','.join(batch)}}
+
+        result = request_json(
+            request = requests.post,
+            kwargs = {
+                'url' : COMMENT_API_URL, 
+                'json': json_data},
+            session = session,
+            max_retries = max_retries)
+
+        others_reactions = result['result']['others_reactions']
+
+        return {comment_id : (others_reactions[comment_id]['like'], others_reactions[comment_id]['dislike']) for comment_id in batch}
+
+    return _request_in_batches(_get_reactions, comment_ids, batch_size)
+
+#-----------------------------------------------------------------------------#
+
+def append_comment_reactions_bulk(comment_info_list: List[dict], session: requests.Session = None, batch_size: int = COMMENT_REACTION_BATCH_SIZE) -> List[dict]:
+
+    """Insert ``'likes'`` and ``'dislikes'`` keys into the dict of each 
+    comment, like ``append_comment_reactions``, but for any number of comments 
+    from any number of videos, using ``get_comment_reactions_bulk``.
+    """
+
+    reactions = get_comment_reactions_bulk(
+        comment_ids = [c['comment_id'] for c in comment_info_list], 
+        session = session, 
+        batch_size = batch_size)
+
+    for comment in comment_info_list:
+        comment['likes'], comment['dislikes'] = reactions[comment['comment_id']]
+
+    return comment_info_list
+
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def get_recommended(video_title: str, video_id: str) -> List[dict]:
+def get_recommended(video_title: str, video_id: str, session: requests.Session = None, resolver = None, depth: int = 1) -> List[dict]:
 
     """Get list of raw video info dicts for a specified video title and video 
     claim_id.
+
+    The normalized names of the first ``depth`` pages of recommended videos are 
+    fetched with ``get_recommended_names``, then resolved with 
+    ``normalized_names_to_video_info``, or with ``resolver`` if it is given 
+    (e.g. a ``polyphemus.resolver.ClaimResolver`` shared by many calls). 
     """
-    
+
+    normalized_names = get_recommended_names(video_title = video_title, video_id = video_id, session = session, depth = depth)
+
+    if resolver is None:
+        recommended_video_info = normalized_names_to_video_info(normalized_names, session = session)
+    else:
+        recommended_video_info = resolver.resolve(normalized_names)
+
+    recommended_video_info = [vi for vi in recommended_video_info if ((vi.get('value_type') == 'stream') & any(key in vi.get('value', []) for key in ('video', 'audio')))]
+
+    return recommended_video_info
+
+#-----------------------------------------------------------------------------#
+
+def get_recommended_names(video_title: str, video_id: str, session: requests.Session = None, depth: int = 1, page_size: int = RECOMMENDATION_PAGE_SIZE) -> List[str]:
+
+    """Get the list of normalized names of the videos recommended for a 
+    specified video title and video claim_id.
+
+    The ``depth`` pages of ``page_size`` results are requested concurrently. 
+    Results are kept in an in-process LRU memo (see 
+    ``clear_recommendation_cache``), so that repeated queries during a crawl 
+    are not sent again.
+
+    Parameters
+    ----------
+    video_title: str
+    video_id: str
+    session: requests.Session
+        Session used for all requests.
+    depth: int
+        Number of pages of recommendations to fetch.
+    page_size: int
+        Number of recommendations per page.
+
+    Returns
+    -------
+    normalized_names: list<str>
+        Normalized names of the recommended videos, page after page.
+    """
+
+    key = (video_title, video_id, depth, page_size)
+
+    with _recommendation_cache_lock:
+        if key in _recommendation_cache:
+            _recommendation_cache.move_to_end(key)
+            return list(_recommendation_cache[key])
+
+    pages = imap(
+        lambda page: _get_recommended_names_page(video_title, video_id, page * page_size, page_size, session = session),
+        range(depth),
+        max_workers = depth)
+
+    normalized_names = tuple(itertools.chain.from_iterable(pages))
+
+    with _recommendation_cache_lock:
+        _recommendation_cache[key] = normalized_names
+        _recommendation_cache.move_to_end(key)
+        while len(_recommendation_cache) > RECOMMENDATION_CACHE_SIZE:
+            _recommendation_cache.popitem(last = False)
+
+    return list(normalized_names)
+
+#-----------------------------------------------------------------------------#
+
+def _get_recommended_names_page(video_title: str, video_id: str, page_from: int, page_size: int, session: requests.Session = None) -> List[str]:
+
     name = quote(video_title)
 
     params = {
         's':name,
-        'size':'20',
-        'from':'0',
+        'size':str(page_size),
+        'from':str(page_from),
         'related_to':video_id}
     
-    response = make_request(
+    result = request_json(
         request = requests.get,
         kwargs = {
             'url' : RECOMMENDATION_API_URL, 
-            'params': params})
+            'params': params},
+        session = session)
 
-    result = json.loads(response.text)
-    recommended_video_info = normalized_names_to_video_info([r['name'] for r in result])
-    recommended_video_info = [vi for vi in recommended_video_info if ((vi.get('value_type') == 'stream') & any(key in vi.get('value', []) for key in ('video', 'audio')))]
+    return [r['name'] for r in result]
 
-    return recommended_video_info
+#-----------------------------------------------------------------------------#
+
+def clear_recommendation_cache():
+
+    """Empty the in-process memo of ``get_recommended_names``.
+    """
+
+    with _recommendation_cache_lock:
+        _recommendation_cache.clear()
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def normalized_names_to_video_info(normalized_names: List[str]) -> dict:
+def normalized_names_to_video_info(normalized_names: List[str], session: requests.Session = None) -> dict:
 
     """Convert a list of normalized names of videos to a list of raw video dicts for those videos. Example of a "normalized name" is:
 
@@ -455,19 +1616,18 @@ def normalized_names_to_video_info(normalized_names: List[str]) -> dict:
         "params":{
             "urls":video_urls}}
 
-    response = make_request(
+    result = request_json(
         request = requests.post,
         kwargs = {
             'url' : BACKEND_API_URL, 
-            'json': json_data})
-
-    result = json.loads(response.text)
+            'json': json_data},
+        session = session)
     
     return [result['result'][video_url] for video_url in video_urls]
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def get_streaming_url(canonical_url: str) -> str:
+def get_streaming_url(canonical_url: str, session: requests.Session = None) -> str:
 
     """Retrieve the `streaming_url` for a specified video.
     """
@@ -478,14 +1638,99 @@ def get_streaming_url(canonical_url: str) -> str:
         "params":{
             "uri":canonical_url}}
 
-    response = make_request(
+    result = request_json(
         request = requests.post,
         kwargs = {
             'url' : BACKEND_API_URL, 
-            'json': json_data})
+            'json': json_data},
+        session = session)
 
-    video_url = json.loads(response.text).get('result', {}).get('streaming_url')
+    video_url = result.get('result', {}).get('streaming_url')
 
     return video_url
 
-#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
\ No newline at end of file
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_streaming_urls(canonical_urls: List[str], session: requests.Session = None, batch_size: int = STREAMING_URL_BATCH_SIZE) -> Dict[str, Optional[str]]:
+
+    """Retrieve the `streaming_url` for many videos, sending the ``get`` calls 
+    for ``batch_size`` videos as a single JSON-RPC batch request.
+
+    Each call in a batch succeeds or fails on its own: calls that return an 
+    error with a code in ``ALLOWED_ERROR_CODES`` map to ``None``, as in 
+    ``get_streaming_url``, and calls that return any other error (or no 
+    response) are retried individually with ``get_streaming_url``, without 
+    resending the rest of the batch. If a batch request fails as a whole, all 
+    of its calls are retried individually, and if the backend rejected it 
+    (see ``MaxRetriesError.is_batch_rejected``), batching is skipped for the 
+    next ``BATCH_REJECTION_TIMEOUT`` seconds.
+
+    Parameters
+    ----------
+    canonical_urls: list<str>
+        Canonical URLs of the videos, e.g. 
+        ``'lbry://@Mak1nBacon#f/want-me-eat-all-chips-meme#a'``. Duplicates are 
+        only requested once.
+    session: requests.Session
+        Session used for all requests.
+    batch_size: int
+        Maximum number of calls per JSON-RPC batch request.
+
+    Returns
+    -------
+    streaming_urls: dict<str, str>
+        Streaming URL (or ``None``) keyed by canonical URL.
+    """
+
+    global _batch_requests_rejected_until
+
+    canonical_urls = list(dict.fromkeys(canonical_urls))
+
+    streaming_urls = {}
+
+    for i in range(0, len(canonical_urls), batch_size):
+
+        batch = canonical_urls[i:i + batch_size]
+
+        if time.time() < _batch_requests_rejected_until:
+            for canonical_url in batch:
+                streaming_urls[canonical_url] = get_streaming_url(canonical_url, session = session)
+            continue
+
+        json_data = [{
+            "jsonrpc":"2.0",
+            "id":request_id,
+            "method":"get",
+            "params":{
+                "uri":canonical_url}} for request_id, canonical_url in enumerate(batch)]
+
+        try:
+            results = request_json(
+                request = requests.post,
+                kwargs = {
+                    'url' : BACKEND_API_URL, 
+                    'json': json_data},
+                session = session,
+                max_retries = BULK_MAX_RETRIES)
+        except MaxRetriesError as exception:
+            if exception.is_batch_rejected():
+                _batch_requests_rejected_until = time.time() + BATCH_REJECTION_TIMEOUT
+            results = []
+
+        if not isinstance(results, list):
+            results = []
+
+        for result in results:
+            if not isinstance(result, dict) or not isinstance(result.get('id'), int) or not 0 <= result['id'] < len(batch):
+                continue
+            if json_response_error(result) is not None:
+                continue
+            streaming_urls[batch[result['id']]] = (result.get('result') or {}).get('streaming_url')
+
+        for canonical_url in batch:
+            if canonical_url not in streaming_urls:
+                streaming_urls[canonical_url] = get_streaming_url(canonical_url, session = session)
+
+    return streaming_urls
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
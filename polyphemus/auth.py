@@ -0,0 +1,406 @@
+# -*- coding: UTF-8 -*-
+
+"""Authorization tokens for the Odysee APIs that require one.
+
+Minting a token (``api.get_auth_token``) creates a new Odysee user, is slow,
+and fails with 503 errors when it is called in quick succession, so tokens
+are reused for as long as the APIs accept them. By default, the functions of
+``api`` that take an ``auth_token`` argument use the shared ``TokenProvider``
+returned by ``api.get_token_provider`` when no token is given, which keeps its
+token in a file so that it is also reused by later runs::
+
+    from polyphemus import api
+    from polyphemus.auth import TokenProvider
+
+    api.set_token_provider(TokenProvider('auth_token.txt'))
+
+Odysee throttles requests per user, so heavy enrichment can instead spread its 
+requests over several tokens with a ``TokenPool``, which has the same interface::
+
+    api.set_token_provider(TokenPool(size = 8))
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import logging
+import os
+import threading
+import time
+from typing import Optional, List, Dict
+
+import requests
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+logger = logging.getLogger(__name__)
+
+# Default location of the token file, following the XDG base directory spec
+DEFAULT_TOKEN_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'polyphemus',
+    'auth_token')
+
+# Default number of tokens in a `TokenPool`, minimum number of seconds between 
+# two tokens minted by a pool (to avoid the 503 errors of `user/new`), and number 
+# of seconds a token is taken out of rotation after a 429 response
+TOKEN_POOL_SIZE = 4
+MINT_INTERVAL = 5.0
+THROTTLE_TIME = 60.0
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TokenProvider:
+
+    """Thread-safe source of a single authorization token, which is only
+    replaced once an API rejects it.
+
+    Parameters
+    ----------
+    path: str
+        Path of the file the token is read from and saved to, so that it is
+        shared between processes and runs. If ``None``, the token is only kept
+        in memory.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, path: Optional[str] = DEFAULT_TOKEN_PATH):
+
+        self.path = path
+
+        self._token = None
+        self._lock = threading.Lock()
+
+    #-------------------------------------------------------------------------#
+
+    def get(self, session: requests.Session = None) -> str:
+
+        """Return the current token, reading it from ``path`` or minting a new
+        one if there is none yet.
+
+        Parameters
+        ----------
+        session: requests.Session
+            Session used if a new token has to be minted.
+        """
+
+        with self._lock:
+            if self._token is None:
+                self._token = self._load()
+            if self._token is None:
+                self._token = _new_token(session = session)
+                self._save()
+            return self._token
+
+    #-------------------------------------------------------------------------#
+
+    def invalidate(self, token: str):
+
+        """Discard ``token`` after an API has rejected it, so that the next call
+        to ``get`` returns another token.
+
+        Does nothing if the token has already been replaced, e.g. by another
+        thread that got the same rejection, or by another process using the same
+        file.
+        """
+
+        with self._lock:
+            if self._token == token:
+                self._token = None
+            if self._load() == token:
+                os.remove(self.path)
+
+    #-------------------------------------------------------------------------#
+
+    def throttle(self, token: str, seconds: Optional[float] = None) -> bool:
+
+        """Called when a request using ``token`` was throttled (HTTP 429). A 
+        single token cannot be rotated out, so this returns ``False``, and the 
+        request is only retried after the backoff of ``api.make_request``.
+        """
+
+        return False
+
+    #-------------------------------------------------------------------------#
+
+    def _load(self) -> Optional[str]:
+
+        if self.path is None:
+            return None
+
+        try:
+            with open(self.path) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    #-------------------------------------------------------------------------#
+
+    def _save(self):
+
+        """Atomically write the token to ``path``. Failures (e.g. a read-only
+        home directory) are ignored, and the token is then only kept in memory.
+        Must be called with ``_lock`` held.
+        """
+
+        if self.path is None:
+            return
+
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok = True)
+            _write_private(tmp_path, self._token)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TokenPool:
+
+    """Thread-safe pool of authorization tokens, handed out round-robin so that 
+    requests are spread over the per-user rate limits of several tokens.
+
+    Tokens are minted lazily, at most one every ``mint_interval`` seconds, until 
+    the pool holds ``size`` tokens (use ``fill`` to mint them all up front). A 
+    token that gets a 429 response is taken out of rotation for 
+    ``throttle_time`` seconds (or the ``Retry-After`` time of the response), and 
+    a token that is rejected is replaced.
+
+    Parameters
+    ----------
+    size: int
+        Number of tokens in the pool.
+    path: str
+        Path of the file the tokens are read from and saved to, one per line. 
+        If ``None``, the tokens are only kept in memory.
+    mint_interval: float
+        Minimum number of seconds between two minted tokens.
+    throttle_time: float
+        Default number of seconds a throttled token is out of rotation.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, size: int = TOKEN_POOL_SIZE, path: Optional[str] = None, mint_interval: float = MINT_INTERVAL, throttle_time: float = THROTTLE_TIME):
+
+        self.size = size
+        self.path = path
+        self.mint_interval = mint_interval
+        self.throttle_time = throttle_time
+
+        self._lock = threading.Lock()
+        self._minted = threading.Condition(self._lock)
+        self._tokens = self._load()[:size]
+        self._throttled_until = {}
+        self._next = 0
+        self._last_mint = float('-inf')
+        self._minting = False
+
+    #-------------------------------------------------------------------------#
+
+    def get(self, session: requests.Session = None) -> str:
+
+        """Return the next token that is not throttled, minting a new token 
+        first if the pool is not full and ``mint_interval`` has passed. If all 
+        tokens are throttled, the one that will be available the soonest is 
+        returned.
+
+        Tokens are minted without holding the pool's lock, by one caller at a 
+        time. If minting fails while the pool already holds tokens, the error 
+        is logged and an existing token is returned.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            mint = not self._minting and (not self._tokens or (len(self._tokens) < self.size and now - self._last_mint >= self.mint_interval))
+            if mint:
+                self._start_mint()
+
+        if mint:
+            try:
+                self._mint(session = session)
+            except Exception:
+                with self._lock:
+                    n_tokens = len(self._tokens)
+                if not n_tokens:
+                    raise
+                logger.warning('Failed to mint a new token, using the %d existing tokens', n_tokens, exc_info = True)
+
+        with self._lock:
+
+            # Another caller is minting the first token of the pool
+            while not self._tokens and self._minting:
+                self._minted.wait()
+
+            if not self._tokens:
+                raise ValueError('Failed to mint a token for an empty token pool')
+
+            now = time.monotonic()
+            n_tokens = len(self._tokens)
+
+            for i in range(n_tokens):
+                token = self._tokens[(self._next + i) % n_tokens]
+                if self._throttled_until.get(token, 0) <= now:
+                    self._next = (self._next + i + 1) % n_tokens
+                    return token
+
+            return min(self._tokens, key = lambda token: self._throttled_until.get(token, 0))
+
+    #-------------------------------------------------------------------------#
+
+    def fill(self, session: requests.Session = None):
+
+        """Mint tokens until the pool is full, waiting ``mint_interval`` 
+        seconds between two tokens.
+        """
+
+        while True:
+            with self._lock:
+                if len(self._tokens) >= self.size:
+                    return
+                wait = self._last_mint + self.mint_interval - time.monotonic()
+                if self._minting or wait > 0:
+                    self._minted.wait(timeout = wait if wait > 0 else None)
+                    continue
+                self._start_mint()
+            self._mint(session = session)
+
+    #-------------------------------------------------------------------------#
+
+    def invalidate(self, token: str):
+
+        """Remove a rejected token from the pool. It is replaced by a new token 
+        on a later call to ``get``.
+        """
+
+        with self._lock:
+            if token in self._tokens:
+                self._tokens.remove(token)
+                self._throttled_until.pop(token, None)
+                self._save()
+
+    #-------------------------------------------------------------------------#
+
+    def throttle(self, token: str, seconds: Optional[float] = None) -> bool:
+
+        """Take a token out of rotation for ``seconds`` (by default 
+        ``throttle_time``) after it got a 429 response. Return ``True`` if 
+        another token can be used in the meantime.
+        """
+
+        if seconds is None:
+            seconds = self.throttle_time
+
+        with self._lock:
+            if token in self._tokens:
+                self._throttled_until[token] = time.monotonic() + seconds
+            now = time.monotonic()
+            return any(self._throttled_until.get(other, 0) <= now for other in self._tokens) or len(self._tokens) < self.size
+
+    #-------------------------------------------------------------------------#
+
+    def stats(self) -> Dict[str, int]:
+
+        """Return the number of tokens in the pool, and how many of them are 
+        currently throttled.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'tokens': len(self._tokens),
+                'throttled': sum(self._throttled_until.get(token, 0) > now for token in self._tokens)}
+
+    #-------------------------------------------------------------------------#
+
+    def _start_mint(self):
+
+        """Reserve the right to mint the next token. Must be called with 
+        ``_lock`` held, and followed by ``_mint``.
+        """
+
+        self._minting = True
+        self._last_mint = time.monotonic()
+
+    #-------------------------------------------------------------------------#
+
+    def _mint(self, session: requests.Session = None):
+
+        """Mint a new token and add it to the pool. Must be called without 
+        ``_lock`` held, since minting sends a request, after ``_start_mint``.
+        """
+
+        token = None
+
+        try:
+            token = _new_token(session = session)
+        finally:
+            with self._lock:
+                self._minting = False
+                if token is not None:
+                    self._tokens.append(token)
+                    self._save()
+                self._minted.notify_all()
+
+    #-------------------------------------------------------------------------#
+
+    def _load(self) -> List[str]:
+
+        if self.path is None:
+            return []
+
+        try:
+            with open(self.path) as f:
+                return [line.strip() for line in f if line.strip()]
+        except OSError:
+            return []
+
+    #-------------------------------------------------------------------------#
+
+    def _save(self):
+
+        """Atomically write the tokens to ``path``, ignoring failures. Must be 
+        called with ``_lock`` held.
+        """
+
+        if self.path is None:
+            return
+
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok = True)
+            _write_private(tmp_path, ''.join(f'{token}\n' for token in self._tokens))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def _write_private(path: str, text: str):
+
+    """Write ``text`` to ``path``, creating the file readable and writable by 
+    its owner only, since it holds authorization tokens.
+    """
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+    with os.fdopen(fd, 'w') as f:
+        if hasattr(os, 'fchmod'):
+            # the mode of `os.open` only applies to new files, e.g. not to a 
+            # file left behind by a crashed process
+            os.fchmod(fd, 0o600)
+        f.write(text)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def _new_token(session: requests.Session = None) -> str:
+
+    # Imported here since `api` itself imports this module
+    from polyphemus import api
+
+    return api.get_auth_token(session = session)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
@@ -6,13 +6,36 @@
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
 import json
+import time
 from urllib.parse import unquote
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, InitVar
 import typing
 from datetime import datetime 
-from collections import Counter
+from collections import Counter, deque
+from contextlib import closing
+
+import requests
 
 from polyphemus import api
+from polyphemus.resolver import ClaimResolver
+from polyphemus import store as crawl_store
+from polyphemus.store import HighWaterMarkStore, CrawlStore, SeenClaimIndex
+from polyphemus._concurrency import imap, batched
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+# Default number of threads used to fetch additional video fields concurrently
+MAX_WORKERS = 8
+
+# Default number of videos expanded by a crawl between two checkpoints of its 
+# `CrawlStore`
+CHECKPOINT_INTERVAL = 100
+
+# Number of seconds by which the high-water mark of a channel is kept behind the 
+# latest release time of its scraped videos (and the time of the scrape), so 
+# that videos whose release time lags behind are still found by the next 
+# incremental scrape
+HIGH_WATER_MARK_OVERLAP = 3600
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
@@ -27,14 +50,49 @@ class Channel:
     cover_image: typing.Optional[str] = None
     thumbnail_image: typing.Optional[str] = None
 
-@dataclass
-class Video:
+class _RawInfo:
+
+    """Deferred serialization of the raw API payload of a ``Video`` or 
+    ``Comment``.
+
+    The ``raw`` constructor argument is either the JSON string of the payload, 
+    or the parsed payload itself, which is then only serialized with 
+    ``json.dumps`` the first time ``raw`` is accessed. The string replaces the 
+    reference to the payload, so it is serialized at most once.
+    """
+
+    __slots__ = ()
+
+    @property
+    def raw(self) -> str:
+        raw = self._raw
+        if not isinstance(raw, str):
+            raw = self._raw = json.dumps(raw)
+        return raw
+
+    def __post_init__(self, raw: typing.Union[str, dict]):
+        self._raw = raw
+
+    def as_dict(self) -> dict:
+
+        """Return the fields as a dict, with the raw payload serialized to a 
+        JSON string under the ``'raw'`` key (e.g. to build a DataFrame), in 
+        place of ``__dict__``, which slotted dataclasses do not have.
+        """
+
+        return {
+            ('raw' if f.name == '_raw' else f.name) : (self.raw if f.name == '_raw' else getattr(self, f.name))
+            for f in fields(self)}
+
+@dataclass(slots = True)
+class Video(_RawInfo):
     canonical_url: str
     type: str
     claim_id: str
     created: datetime
     title: str
-    raw: str
+    raw: InitVar[typing.Union[str, dict]]
+    _raw: typing.Union[str, dict] = field(init = False, repr = False, compare = False)
     views: typing.Optional[int] = None
     streaming_url: typing.Optional[str] = None
     text: typing.Optional[str] = None
@@ -48,8 +106,8 @@ class Video:
     dislikes: typing.Optional[int] = None
     is_comment: bool = False
 
-@dataclass
-class Comment:
+@dataclass(slots = True)
+class Comment(_RawInfo):
     text: str
     created: datetime
     claim_id : str
@@ -59,7 +117,8 @@ class Comment:
     replies: int
     likes: int
     dislikes: int
-    raw : str
+    raw : InitVar[typing.Union[str, dict]]
+    _raw: typing.Union[str, dict] = field(init = False, repr = False, compare = False)
     is_comment: bool = True
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
@@ -68,16 +127,21 @@ class OdyseeChannelScraper:
 
     #-------------------------------------------------------------------------#
     
-    def __init__(self, channel_name: str, auth_token: str = None):
+    def __init__(self, channel_name: str, auth_token: str = None, session: requests.Session = None, high_water_marks: HighWaterMarkStore = None):
         
         self._channel_name = unquote(channel_name)
 
-        if auth_token is None:
-            self.auth_token = api.get_auth_token()
+        self.high_water_marks = high_water_marks
+
+        if session is None:
+            self.session = api.get_default_session()
         else:
-            self.auth_token = auth_token
+            self.session = session
 
-        self._raw_channel_info = api.get_channel_info(channel_name = self._channel_name)
+        # If `None`, API calls use the token of `api.get_token_provider`
+        self.auth_token = auth_token
+
+        self._raw_channel_info = api.get_channel_info(channel_name = self._channel_name, session = self.session)
         self._channel_id = self._raw_channel_info['channel_id']
     
     #-------------------------------------------------------------------------#
@@ -89,61 +153,327 @@ class OdyseeChannelScraper:
 
         subscribers = api.get_subscribers(
             channel_id = self._channel_id,
-            auth_token = self.auth_token)
-
-        return Channel(
-            channel_id=self._raw_channel_info['channel_id'],
-            title=self._raw_channel_info['title'],
-            created=datetime.fromtimestamp(self._raw_channel_info['created']),
-            description=self._raw_channel_info['description'],
-            cover_image=self._raw_channel_info['cover_image'],
-            thumbnail_image=self._raw_channel_info['thumbnail_image'],
-            raw=self._raw_channel_info['raw'],
-            subscribers=subscribers)
+            auth_token = self.auth_token,
+            session = self.session)
+
+        return process_raw_channel_info(self._raw_channel_info, subscribers = subscribers)
         
     #-------------------------------------------------------------------------#
 
-    def get_all_videos(self, additional_fields: bool = True) -> typing.Generator[Video, None, None]:
+    def get_all_videos(self, additional_fields: bool = True, max_workers: int = MAX_WORKERS, ordered: bool = True, incremental: bool = False, partitioned: bool = False, high_water_mark: typing.Optional['PendingHighWaterMark'] = None) -> typing.Generator[Video, None, None]:
+
+        """Return generator of Video objects for all videos posted by the 
+        specified channel. 
+
+        If ``additional_fields`` is ``True``, the additional fields are fetched 
+        in bulk for batches of videos, ``max_workers`` batches at a time. If 
+        ``ordered`` is ``False``, batches are yielded as soon as they are 
+        processed rather than in the order returned by the API.
 
-        """Return list of Video objects for all videos posted by the specified channel
+        If the scraper was given a ``high_water_marks`` store, the channel's 
+        high-water mark is saved in it once the generator is exhausted (or, if 
+        ``high_water_mark`` is given, only tracked in it, to be committed by 
+        the caller), and with ``incremental = True`` only videos released at or 
+        after the saved mark, and not returned by a previous scrape, are 
+        returned.
+
+        If ``partitioned`` is ``True``, the list of videos is fetched with 
+        ``api.get_raw_video_info_list_partitioned`` using ``max_workers`` 
+        concurrent requests, which is faster for large channels but only 
+        starts yielding videos once the whole list has been fetched.
         """
 
-        raw_video_info_list = api.get_raw_video_info_list(channel_id=self._channel_id)
-        videos = (process_raw_video_info(raw_video_info = raw_video_info, auth_token = self.auth_token, additional_fields = additional_fields) for raw_video_info in raw_video_info_list)
-        
-        return videos
+        if partitioned:
+            raw_video_info_list = api.get_raw_video_info_list_partitioned(channel_id=self._channel_id, session = self.session, since = self._get_since(incremental), max_workers = max_workers)
+            if incremental:
+                known_claim_ids = self.high_water_marks.get_known_claim_ids(self._channel_id)
+                raw_video_info_list = [raw_video_info for raw_video_info in raw_video_info_list if raw_video_info['claim_id'] not in known_claim_ids]
+        else:
+            raw_video_info_list = self.iter_raw_video_info(incremental = incremental)
+
+        return self.process_videos(
+            raw_video_info_list = raw_video_info_list,
+            additional_fields = additional_fields,
+            max_workers = max_workers,
+            ordered = ordered,
+            high_water_mark = high_water_mark)
+
+    #-------------------------------------------------------------------------#
+
+    def iter_raw_video_info(self, incremental: bool = False) -> typing.Generator[dict, None, None]:
+
+        """Return generator of the raw video info dicts of all videos posted by 
+        the channel, one page at a time. With ``incremental = True``, only 
+        videos released at or after the channel's high-water mark, and not 
+        already returned by a previous scrape, are returned.
+        """
+
+        since = self._get_since(incremental)
+        known_claim_ids = None if since is None else self.high_water_marks.get_known_claim_ids(self._channel_id)
+
+        return api.iter_raw_video_info(channel_id=self._channel_id, session = self.session, since = since, known_claim_ids = known_claim_ids)
+
+    #-------------------------------------------------------------------------#
+
+    def process_videos(self, raw_video_info_list: typing.Iterable[dict], additional_fields: bool = True, max_workers: int = MAX_WORKERS, ordered: bool = True, high_water_mark: typing.Optional['PendingHighWaterMark'] = None) -> typing.Generator[Video, None, None]:
+
+        """Return generator of Video objects for raw video info dicts of the 
+        channel, see ``process_raw_video_info_list``. If the scraper was given 
+        a ``high_water_marks`` store, the channel's high-water mark is tracked 
+        in ``high_water_mark``, to be committed by the caller once it has 
+        handled every record derived from the videos, or, if 
+        ``high_water_mark`` is ``None``, saved once the generator is exhausted.
+        """
+
+        if self.high_water_marks is None:
+            return process_raw_video_info_list(
+                raw_video_info_list = raw_video_info_list,
+                auth_token = self.auth_token,
+                additional_fields = additional_fields,
+                session = self.session,
+                max_workers = max_workers,
+                ordered = ordered)
+
+        if high_water_mark is not None:
+            return process_raw_video_info_list(
+                raw_video_info_list = high_water_mark.track(raw_video_info_list),
+                auth_token = self.auth_token,
+                additional_fields = additional_fields,
+                session = self.session,
+                max_workers = max_workers,
+                ordered = ordered)
+
+        return self._update_high_water_mark(
+            raw_video_info_list = raw_video_info_list,
+            auth_token = self.auth_token,
+            additional_fields = additional_fields,
+            session = self.session,
+            max_workers = max_workers,
+            ordered = ordered)
 
     #-------------------------------------------------------------------------#
 
-    def get_all_videos_and_comments(self) -> typing.Tuple[typing.List['Video'], typing.List['Comment']]:
+    def pending_high_water_mark(self) -> typing.Optional['PendingHighWaterMark']:
+
+        """Return a new ``PendingHighWaterMark`` for the channel, or ``None`` 
+        if the scraper was not given a ``high_water_marks`` store.
+        """
+
+        if self.high_water_marks is None:
+            return None
+
+        return PendingHighWaterMark(self.high_water_marks, self._channel_id)
+
+    #-------------------------------------------------------------------------#
+
+    def _get_since(self, incremental: bool) -> typing.Optional[int]:
+
+        """Return the high-water mark of the channel if ``incremental``, or 
+        ``None`` to scrape all videos. A mark in the future (as saved by 
+        earlier versions for scheduled videos) is brought back to the present.
+        """
+
+        if not incremental:
+            return None
+
+        if self.high_water_marks is None:
+            raise ValueError('Incremental scraping requires `high_water_marks` to be set')
+
+        mark = self.high_water_marks.get(self._channel_id)
+
+        if mark is None:
+            return None
+
+        return min(mark, int(time.time()) - HIGH_WATER_MARK_OVERLAP)
+
+    #-------------------------------------------------------------------------#
+
+    def _update_high_water_mark(self, raw_video_info_list: typing.Iterable[dict], **kwargs) -> typing.Generator[Video, None, None]:
+
+        """Process all videos with ``process_raw_video_info_list`` while 
+        tracking the channel's high-water mark, then save it once every video 
+        has been processed.
+        """
+
+        high_water_mark = self.pending_high_water_mark()
+
+        yield from process_raw_video_info_list(raw_video_info_list = high_water_mark.track(raw_video_info_list), **kwargs)
+
+        high_water_mark.commit()
+
+    #-------------------------------------------------------------------------#
+
+    def get_all_videos_and_comments(self, incremental: bool = False) -> typing.Tuple[typing.List['Video'], typing.List['Comment']]:
 
         """Return list of OdyseeVideo and OdyseeComment objects for all videos 
-        posted by the channel and all comments posted to those videos
+        posted by the channel and all comments posted to those videos. 
+        
+        The reactions of the comments of all videos are looked up together, in 
+        batches of ``api.COMMENT_REACTION_BATCH_SIZE`` comments. The channel's 
+        high-water mark is only saved once all comments have been fetched.
         """
 
-        all_videos = list(self.get_all_videos())
+        high_water_mark = self.pending_high_water_mark()
+
+        all_videos = list(self.get_all_videos(incremental = incremental, high_water_mark = high_water_mark))
 
         raw_comment_info_list = []
         
         for video in all_videos:
-            raw_comment_info_list.extend(api.get_all_comments(video_id=video.claim_id))
+            raw_comment_info_list.extend(api.get_all_comments(video_id=video.claim_id, session = self.session, reactions = False))
+
+        api.append_comment_reactions_bulk(comment_info_list = raw_comment_info_list, session = self.session)
 
         all_comments = [process_raw_comment_info(raw_comment_info) for raw_comment_info in raw_comment_info_list]
+
+        if high_water_mark is not None:
+            high_water_mark.commit()
         
         return all_videos, all_comments
     
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
-def process_raw_video_info(raw_video_info: dict, auth_token: str = None, additional_fields: bool = True) -> Video:
+class PendingHighWaterMark:
 
-    if auth_token is None:
-        auth_token = api.get_auth_token()
-    else:
-        auth_token = auth_token
+    """High-water mark of a channel, tracked from the videos of a scrape and 
+    only saved in ``high_water_marks`` by ``commit``, so that a scrape that 
+    fails after listing the videos (e.g. while fetching their comments) does 
+    not move the mark past them.
 
-    raw = json.dumps(raw_video_info)
+    The mark is the latest release time of the videos, capped at the time the 
+    scrape started (scheduled videos can be released in the future), minus 
+    ``HIGH_WATER_MARK_OVERLAP``. The claim IDs of the videos released at or 
+    after the mark are saved with it, so that the next incremental scrape 
+    skips them.
 
-    claim_id = raw_video_info['claim_id']
+    Parameters
+    ----------
+    high_water_marks: HighWaterMarkStore
+        Store the mark is saved in.
+    channel_id: str
+        Claim ID of the channel.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, high_water_marks: HighWaterMarkStore, channel_id: str):
+
+        self.high_water_marks = high_water_marks
+        self.channel_id = channel_id
+
+        self.start_time = int(time.time())
+        self.mark = None
+        self.claim_release_times = {}
+
+    #-------------------------------------------------------------------------#
+
+    def track(self, raw_video_info_list: typing.Iterable[dict]) -> typing.Generator[dict, None, None]:
+
+        """Yield the raw video info dicts, updating the mark with each of them.
+        """
+
+        for raw_video_info in raw_video_info_list:
+            release_time = api.get_release_time(raw_video_info)
+            video_mark = min(release_time, self.start_time) - HIGH_WATER_MARK_OVERLAP
+            if self.mark is None or video_mark > self.mark:
+                # the mark only rises, so videos released before it can be 
+                # forgotten
+                self.mark = video_mark
+                self.claim_release_times = {claim_id : t for claim_id, t in self.claim_release_times.items() if t >= self.mark}
+            if release_time >= self.mark:
+                self.claim_release_times[raw_video_info['claim_id']] = release_time
+            yield raw_video_info
+
+    #-------------------------------------------------------------------------#
+
+    def commit(self):
+
+        """Save the mark, if any video has been tracked.
+        """
+
+        if self.mark is not None:
+            self.high_water_marks.update(self.channel_id, self.mark, self.claim_release_times)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def process_raw_channel_info(raw_channel_info: dict, subscribers: int) -> Channel:
+
+    """Convert a channel info dict from ``api.get_channel_info`` to a Channel 
+    object.
+    """
+
+    return Channel(
+        channel_id=raw_channel_info['channel_id'],
+        title=raw_channel_info['title'],
+        created=datetime.fromtimestamp(raw_channel_info['created']),
+        description=raw_channel_info['description'],
+        cover_image=raw_channel_info['cover_image'],
+        thumbnail_image=raw_channel_info['thumbnail_image'],
+        raw=raw_channel_info['raw'],
+        subscribers=subscribers)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_channels(channel_names: typing.Iterable[str], auth_token: str = None, session: requests.Session = None) -> typing.Dict[str, Channel]:
+
+    """Return Channel objects for many channels at once, keyed by channel name.
+
+    Unlike creating an ``OdyseeChannelScraper`` per channel, the channels are 
+    resolved in large batches with ``api.get_channel_info_bulk``, and their 
+    subscriber counts fetched with ``api.get_subscribers_bulk``.
+
+    Parameters
+    ----------
+    channel_names: iterable<str>
+        Names of the channels, with or without the leading ``'@'``.
+    auth_token: str
+        Authorization token. If ``None``, the token of 
+        ``api.get_token_provider`` is used.
+    session: requests.Session
+        Session used for all requests.
+
+    Returns
+    -------
+    channels: dict<str, Channel>
+        Channels keyed by the names given in ``channel_names``. Channels that 
+        cannot be resolved are left out.
+    """
+
+    name_to_channel_name = {name : unquote(name).lstrip('@') for name in channel_names}
+
+    channel_info = api.get_channel_info_bulk(list(name_to_channel_name.values()), session = session)
+
+    subscribers = api.get_subscribers_bulk(
+        channel_ids = [info['channel_id'] for info in channel_info.values()], 
+        auth_token = auth_token, 
+        session = session)
+
+    return {
+        name : process_raw_channel_info(channel_info[channel_name], subscribers = subscribers[channel_info[channel_name]['channel_id']])
+        for name, channel_name in name_to_channel_name.items()
+        if channel_name in channel_info}
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def process_raw_video_info(raw_video_info: dict, auth_token: str = None, additional_fields: bool = True, session: requests.Session = None, additional_info: typing.Optional[dict] = None) -> Video:
+
+    """Convert a raw video info dict to a Video object. 
+
+    If ``additional_fields`` is ``True``, the streaming URL, views and 
+    reactions of the video are fetched, except for those already given in 
+    ``additional_info`` (a dict with any of the keys ``'streaming_url'``, 
+    ``'views'``, ``'likes'`` and ``'dislikes'``), e.g. from bulk requests.
+    """
+
+    if additional_info is None:
+        additional_info = {}
+
+    claim_id, enrichment_url = get_enrichment_ids(raw_video_info)
+
+    # `raw_video_info` is stored as the raw payload of the video, so it is 
+    # never modified here
+    value = raw_video_info['value']
+    canonical_url = raw_video_info['canonical_url']
 
     # Handle edge cases
     #.....................................................................#
@@ -158,11 +488,10 @@ def process_raw_video_info(raw_video_info: dict, auth_token: str = None, additio
         video_type = 'repost'
         duration = None
         if 'reposted_claim' in raw_video_info:
-            raw_video_info['value'] = raw_video_info['reposted_claim']['value']
-            raw_video_info['canonical_url'] = raw_video_info['reposted_claim']['canonical_url']
-            claim_id = raw_video_info['reposted_claim']['claim_id']
+            value = raw_video_info['reposted_claim']['value']
+            canonical_url = raw_video_info['reposted_claim']['canonical_url']
         else:
-            raw_video_info['value'] = {}
+            value = {}
     elif 'image' in raw_video_info['value']:
         video_type = 'image'
         duration = None
@@ -180,13 +509,13 @@ def process_raw_video_info(raw_video_info: dict, auth_token: str = None, additio
         channel_name = None
         channel_id = None
 
-    if 'release_time' in raw_video_info['value']:
-        created = raw_video_info['value']['release_time']
+    if 'release_time' in value:
+        created = value['release_time']
     else:
         created = raw_video_info['meta']['creation_timestamp']
 
-    if 'thumbnail' in raw_video_info['value']:
-        thumbnail = raw_video_info['value']['thumbnail'].get('url', None)
+    if 'thumbnail' in value:
+        thumbnail = value['thumbnail'].get('url', None)
     else:
         thumbnail = None
     
@@ -194,14 +523,23 @@ def process_raw_video_info(raw_video_info: dict, auth_token: str = None, additio
     #.....................................................................#
 
     if additional_fields:
-        if raw_video_info['name'] == 'live':
+        if 'streaming_url' in additional_info:
+            streaming_url = additional_info['streaming_url']
+        elif enrichment_url is None:
             streaming_url = None
         else:
-            streaming_url = api.get_streaming_url(raw_video_info['canonical_url'])
-        views = api.get_views(video_id=claim_id, auth_token = auth_token)
-        likes, dislikes = api.get_video_reactions(
-            video_id = claim_id,
-            auth_token = auth_token)
+            streaming_url = api.get_streaming_url(enrichment_url, session = session)
+        if 'views' in additional_info:
+            views = additional_info['views']
+        else:
+            views = api.get_views(video_id=claim_id, auth_token = auth_token, session = session)
+        if 'likes' in additional_info and 'dislikes' in additional_info:
+            likes, dislikes = additional_info['likes'], additional_info['dislikes']
+        else:
+            likes, dislikes = api.get_video_reactions(
+                video_id = claim_id,
+                auth_token = auth_token,
+                session = session)
 
     else:
         streaming_url = None
@@ -213,20 +551,20 @@ def process_raw_video_info(raw_video_info: dict, auth_token: str = None, additio
     #.....................................................................#
 
     return Video(
-        canonical_url = raw_video_info['canonical_url'],
+        canonical_url = canonical_url,
         type = video_type,
         channel_id = channel_id,
         channel_name = channel_name,
         claim_id = raw_video_info['claim_id'],
         created = datetime.fromtimestamp(max(int(created), 0)),
-        text = raw_video_info['value'].get('description'),
-        languages = raw_video_info['value'].get('languages'),
-        tags = raw_video_info['value'].get('tags',[]),
-        title = raw_video_info['value'].get('title'),
+        text = value.get('description'),
+        languages = value.get('languages'),
+        tags = value.get('tags',[]),
+        title = value.get('title'),
         duration = duration,
         thumbnail = thumbnail,
         is_comment = False,
-        raw = raw,
+        raw = raw_video_info,
         views = views,
         likes = likes,
         dislikes = dislikes,
@@ -234,6 +572,103 @@ def process_raw_video_info(raw_video_info: dict, auth_token: str = None, additio
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
+def process_raw_video_info_list(raw_video_info_list: typing.Iterable[dict], auth_token: str = None, additional_fields: bool = True, session: requests.Session = None, max_workers: int = MAX_WORKERS, ordered: bool = True, batch_size: int = api.BULK_BATCH_SIZE) -> typing.Generator[Video, None, None]:
+
+    """Process many raw video info dicts, fetching the additional fields 
+    (streaming URL, views and reactions) in bulk.
+
+    Videos are split into batches of ``batch_size``. For each batch, views and 
+    reactions are fetched with ``api.get_views_bulk`` and 
+    ``api.get_reactions_bulk``, and streaming URLs with 
+    ``api.get_streaming_urls``, so a channel costs a handful of requests per 
+    batch instead of three per video. Up to ``max_workers`` batches are 
+    processed concurrently.
+
+    Parameters
+    ----------
+    raw_video_info_list: iterable<dict>
+        Raw video info dicts, e.g. from ``api.get_raw_video_info_list``. Consumed 
+        lazily.
+    auth_token: str
+        Authorization token shared by all requests. If ``None``, the token of 
+        ``api.get_token_provider`` is used.
+    additional_fields: bool
+        Whether to fetch the streaming URL, views and reactions of each video.
+    session: requests.Session
+        Session used for all requests.
+    max_workers: int
+        Number of batches processed concurrently. If 1, batches are processed 
+        serially in the calling thread.
+    ordered: bool
+        If ``True``, videos are yielded in the same order as 
+        ``raw_video_info_list``, otherwise batches are yielded in order of 
+        completion.
+    batch_size: int
+        Number of videos whose additional fields are fetched together.
+
+    Returns
+    -------
+    videos: generator<Video>
+    """
+
+    if not additional_fields:
+        return (process_raw_video_info(raw_video_info = raw_video_info, auth_token = auth_token, additional_fields = False) for raw_video_info in raw_video_info_list)
+
+    def _process_batch(batch: typing.List[dict]) -> typing.List[Video]:
+
+        enrichment_ids = [get_enrichment_ids(raw_video_info) for raw_video_info in batch]
+        claim_ids = [claim_id for claim_id, _ in enrichment_ids]
+        canonical_urls = [canonical_url for _, canonical_url in enrichment_ids if canonical_url is not None]
+
+        views = api.get_views_bulk(claim_ids = claim_ids, auth_token = auth_token, session = session, batch_size = batch_size)
+        reactions = api.get_reactions_bulk(claim_ids = claim_ids, auth_token = auth_token, session = session, batch_size = batch_size)
+        streaming_urls = api.get_streaming_urls(canonical_urls = canonical_urls, session = session)
+
+        return [
+            process_raw_video_info(
+                raw_video_info = raw_video_info,
+                auth_token = auth_token,
+                additional_fields = True,
+                session = session,
+                additional_info = {
+                    'views': views[claim_id],
+                    'likes': reactions[claim_id][0],
+                    'dislikes': reactions[claim_id][1],
+                    'streaming_url': streaming_urls.get(canonical_url)})
+            for raw_video_info, (claim_id, canonical_url) in zip(batch, enrichment_ids)]
+
+    def _generate_videos() -> typing.Generator[Video, None, None]:
+        with closing(imap(_process_batch, batched(raw_video_info_list, batch_size), max_workers = max_workers, ordered = ordered)) as batches:
+            for videos in batches:
+                yield from videos
+
+    return _generate_videos()
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_enrichment_ids(raw_video_info: dict) -> typing.Tuple[str, typing.Optional[str]]:
+
+    """Return the claim ID used to look up views and reactions for a video, and 
+    the canonical URL used to look up its streaming URL. 
+
+    For reposts these refer to the reposted claim. The canonical URL is 
+    ``None`` for livestreams, which have no streaming URL.
+    """
+
+    claim_id = raw_video_info['claim_id']
+    canonical_url = raw_video_info['canonical_url']
+
+    if 'claim_hash' in raw_video_info['value'] and 'reposted_claim' in raw_video_info:
+        claim_id = raw_video_info['reposted_claim']['claim_id']
+        canonical_url = raw_video_info['reposted_claim']['canonical_url']
+
+    if raw_video_info['name'] == 'live':
+        canonical_url = None
+
+    return claim_id, canonical_url
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
 def process_raw_comment_info(raw_comment_info: dict) -> Comment:
 
     return Comment(
@@ -247,80 +682,385 @@ def process_raw_comment_info(raw_comment_info: dict) -> Comment:
         likes = raw_comment_info['likes'],
         dislikes = raw_comment_info['dislikes'],
         is_comment = True,
-        raw = json.dumps(raw_comment_info))
+        raw = raw_comment_info)
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
 class RecommendationEngine:
 
+    """Crawl the network of videos recommended by Odysee, starting from all 
+    videos of the channels in ``channel_list``.
+
+    Claim IDs are interned to integer indices, so that the crawl state only 
+    holds each claim ID string once: the weighted edges between videos are 
+    counted incrementally in ``edge_counts``, keyed by pairs of indices, and the 
+    videos left to expand are kept in a FIFO ``frontier`` of claim IDs.
+
+    Each iteration of ``generate`` expands one level of the frontier, fetching 
+    the recommendations of up to ``max_workers`` videos concurrently. The crawl 
+    state is only updated from the calling thread, in frontier order, so the 
+    results are the same as for a sequential crawl, and no video is expanded 
+    twice.
+
+    If a ``store`` is given, the crawl state is written to it as the crawl 
+    goes, with a checkpoint every ``checkpoint_interval`` expanded videos, at 
+    the end of each level, and when ``generate`` returns or raises. A crawl 
+    that was interrupted is continued from its last checkpoint with 
+    ``resume``::
+
+        engine = RecommendationEngine.resume(CrawlStore('crawl.sqlite'))
+        engine.generate(iterations = 2)
+
+    Crawls that are repeated over time on the same channels can share a 
+    ``seen_claims`` index. The videos of the channels are always expanded, so 
+    that new recommendations from them are found, but the videos found at 
+    later levels that were expanded by earlier crawls are skipped, and 
+    requests are only spent on the new parts of the network.
+
+    Parameters
+    ----------
+    channel_list: list<str>
+        Names of the channels whose videos the crawl starts from.
+    session: requests.Session
+        Session used for all requests.
+    auth_token: str
+        Authorization token. If ``None``, the token of 
+        ``api.get_token_provider`` is used.
+    max_workers: int
+        Number of videos whose recommendations are fetched concurrently.
+    max_frontier_size: int
+        If given, at most this many videos are expanded per level, in the order 
+        they were found; the other videos of the level are kept in 
+        ``claim_id_to_video`` but never expanded.
+    max_depth: int
+        If given, the number of levels expanded over all calls to ``generate`` 
+        (the videos of the channels in ``channel_list`` being level 0).
+    store: CrawlStore
+        If given, store in which the crawl state is saved. If it already holds 
+        the state of a crawl, that crawl is continued.
+    checkpoint_interval: int
+        Number of videos expanded between two checkpoints of ``store``.
+    seen_claims: SeenClaimIndex
+        If given, videos in the index are not expanded, except at level 0, and 
+        expanded videos are added to it (and saved when ``generate`` returns or 
+        raises).
+    recommendation_depth: int
+        Number of pages of recommendations fetched for each video (see 
+        ``api.get_recommended``).
+    """
+
     #-------------------------------------------------------------------------#
     
-    def __init__(self, channel_list):
+    def __init__(self, channel_list, session: requests.Session = None, auth_token: str = None, max_workers: int = MAX_WORKERS, max_frontier_size: typing.Optional[int] = None, max_depth: typing.Optional[int] = None, store: typing.Optional[CrawlStore] = None, checkpoint_interval: int = CHECKPOINT_INTERVAL, seen_claims: typing.Optional[SeenClaimIndex] = None, recommendation_depth: int = 1):
         
         self.channel_list = channel_list
-        self.auth_token = api.get_auth_token()
-        
-        self.edge_list = []
-        self.new_videos = []
+        self.max_workers = max_workers
+        self.max_frontier_size = max_frontier_size
+        self.max_depth = max_depth
+        self.store = store
+        self.checkpoint_interval = checkpoint_interval
+        self.seen_claims = seen_claims
+        self.recommendation_depth = recommendation_depth
+
+        if session is None:
+            self.session = api.get_default_session()
+        else:
+            self.session = session
+
+        # If `None`, API calls use the token of `api.get_token_provider`
+        self.auth_token = auth_token
+
+        # Shared by all `get_recommended` calls, so that names are resolved in 
+        # large batches and only once per crawl
+        self.resolver = ClaimResolver(session = self.session)
         
-        self.already_done_claim_ids = []
         self.claim_id_to_video = {}
+        self.frontier = deque()
+        self.edge_counts = Counter()
+        self.depth = 0
+
+        self._claim_ids = []
+        self._claim_id_to_index = {}
+        self._expanded = set()
+        self._seeded = False
+
+        # Number of videos at the start of `frontier` that make up the current 
+        # level, if it was interrupted before being fully expanded
+        self._level_size = None
+
+        if self.store is not None:
+            self._load()
+
+    #-------------------------------------------------------------------------#
+
+    @classmethod
+    def resume(cls, store: CrawlStore, **kwargs) -> 'RecommendationEngine':
+
+        """Continue the crawl saved in ``store``, from the last checkpoint. 
+        Keyword arguments are passed to ``RecommendationEngine``.
+
+        Raises
+        ------
+        ValueError
+            If ``store`` holds no crawl.
+        """
+
+        channel_list = store.get_state('channel_list')
+
+        if channel_list is None:
+            raise ValueError(f'No crawl to resume in {store.path!r}')
+
+        return cls(channel_list = channel_list, store = store, **kwargs)
+
+    #-------------------------------------------------------------------------#
+
+    @property
+    def new_videos(self) -> typing.List[Video]:
+
+        """Videos that have been found but not expanded yet.
+        """
+
+        return [self.claim_id_to_video[claim_id] for claim_id in self.frontier]
+
+    #-------------------------------------------------------------------------#
+
+    @property
+    def already_done_claim_ids(self) -> typing.Set[str]:
+
+        """Claim IDs of the videos whose recommendations have been fetched.
+        """
+
+        return {self._claim_ids[index] for index in self._expanded}
+
+    #-------------------------------------------------------------------------#
+
+    @property
+    def claim_ids(self) -> typing.List[str]:
+
+        """Claim IDs of the crawl, in the order of their indices in 
+        ``edge_counts``.
+        """
+
+        return self._claim_ids
+
+    #-------------------------------------------------------------------------#
+
+    @property
+    def edge_list(self) -> typing.List[typing.Tuple[str, str]]:
+
+        """List of ``(claim_id, recommended_claim_id)`` edges, with each edge 
+        repeated as many times as it was found.
+        """
+
+        return [
+            (self._claim_ids[source], self._claim_ids[target])
+            for (source, target), weight in self.edge_counts.items()
+            for _ in range(weight)]
 
     #-------------------------------------------------------------------------#
 
     def generate(self, iterations = 1):
 
-        if not self.new_videos:
+        try:
+            return self._generate(iterations = iterations)
+        finally:
+            if self.store is not None:
+                self.store.checkpoint()
+            if self.seen_claims is not None:
+                self.seen_claims.save()
+
+    #-------------------------------------------------------------------------#
+
+    def _generate(self, iterations = 1):
+
+        if not self._seeded:
             for channel_name in self.channel_list:
                 print(channel_name)
-                scraper = OdyseeChannelScraper(channel_name = channel_name, auth_token = self.auth_token)
-                
-                self.new_videos.extend(list(scraper.get_all_videos(additional_fields = False)))
+                scraper = OdyseeChannelScraper(channel_name = channel_name, auth_token = self.auth_token, session = self.session)
                 
-            self.claim_id_to_video.update(dict(zip([v.claim_id for v in self.new_videos], self.new_videos)))
+                for video in scraper.get_all_videos(additional_fields = False):
+                    self._add_video(video, depth = 0)
+            self._seeded = True
+            if self.store is not None:
+                self.store.set_state('seeded', True)
+                self.store.checkpoint()
         
+        def _get_recommended(claim_id: str) -> typing.List[dict]:
+            video = self.claim_id_to_video[claim_id]
+            return api.get_recommended(video_title = video.title, video_id = claim_id, session = self.session, resolver = self.resolver, depth = self.recommendation_depth)
+
         for iteration in range(int(iterations)):
 
-            for i, video in enumerate(self.new_videos):
-                claim_id = video.claim_id
-                title = video.title
+            if self.max_depth is not None and self.depth >= self.max_depth:
+                break
+
+            # Videos found while expanding this level are expanded in the next 
+            # iteration
+            level_size = len(self.frontier) if self._level_size is None else self._level_size
+            self._level_size = None
+            level = [self.frontier.popleft() for _ in range(level_size)]
+
+            skipped = []
+
+            if self.seen_claims is not None and self.depth > 0:
+                seen = [claim_id in self.seen_claims for claim_id in level]
+                skipped = [claim_id for claim_id, is_seen in zip(level, seen) if is_seen]
+                level = [claim_id for claim_id, is_seen in zip(level, seen) if not is_seen]
+
+            if self.max_frontier_size is not None:
+                skipped += level[self.max_frontier_size:]
+                level = level[:self.max_frontier_size]
+
+            if self.store is not None and skipped:
+                self.store.set_status((self._claim_id_to_index[claim_id] for claim_id in skipped), crawl_store.SKIPPED)
 
-                print(f'ITERATION: {iteration} | VIDEO: {i} / {len(self.new_videos)} | CLAIM_ID: {claim_id}')
+            results = imap(_get_recommended, level, max_workers = self.max_workers)
 
-                recommended_video_info = api.get_recommended(video_title = title, video_id = claim_id)
+            for i, (claim_id, recommended_video_info) in enumerate(zip(level, results)):
 
-                for rec_video_info in recommended_video_info:
-                    rec_claim_id = rec_video_info['claim_id']
+                print(f'ITERATION: {iteration} | VIDEO: {i} / {len(level)} | CLAIM_ID: {claim_id}')
 
-                    self.edge_list.append((claim_id, rec_claim_id))
+                self._add_recommendations(claim_id, recommended_video_info)
 
-                    if rec_video_info['claim_id'] not in self.claim_id_to_video:
-                        
-                        self.claim_id_to_video[rec_claim_id] = process_raw_video_info(
-                            raw_video_info = rec_video_info,
-                            auth_token = self.auth_token,
-                            additional_fields = False)
+                if self.seen_claims is not None:
+                    self.seen_claims.add(claim_id)
 
-                self.already_done_claim_ids.append(claim_id)
+                if self.store is not None and (i + 1) % self.checkpoint_interval == 0:
+                    self.store.checkpoint()
+
+            self.depth += 1
+
+            if self.store is not None:
+                self.store.set_state('depth', self.depth)
+                self.store.checkpoint()
 
-            self.new_videos = [video for video in self.claim_id_to_video.values() if video.claim_id not in self.already_done_claim_ids]
-            
         claim_id_to_channel = {claim_id : video.channel_name for claim_id, video in self.claim_id_to_video.items()}
-        _channel_edge_list = [(claim_id_to_channel[target], claim_id_to_channel[source]) for target, source in self.edge_list]
-        channel_edge_list = [(source, target) for source, target in _channel_edge_list if all(item is not None for item in (source, target))]
 
-        c = Counter(channel_edge_list)
+        c = Counter()
+        for (source, target), weight in self.edge_counts.items():
+            edge = (claim_id_to_channel[self._claim_ids[source]], claim_id_to_channel[self._claim_ids[target]])
+            if all(item is not None for item in edge):
+                c[edge] += weight
+
         self.weighted_edge_list = [(source, target, weight) for (source, target), weight in c.most_common()]
         
         usernames = set([channel.strip('@') for edge in self.weighted_edge_list for channel in edge[:2]])
 
-        self.channels = {}
-        for username in usernames:
-            try:
-                self.channels['@' + username] = OdyseeChannelScraper(channel_name = username, auth_token=self.auth_token).get_entity().__dict__
-            except KeyError:
-                pass
+        channels = get_channels(usernames, auth_token = self.auth_token, session = self.session)
+
+        self.channels = {'@' + username : channel.__dict__ for username, channel in channels.items()}
 
         return self.weighted_edge_list, self.channels, self.claim_id_to_video
 
+    #-------------------------------------------------------------------------#
+
+    def _add_recommendations(self, claim_id: str, recommended_video_info: typing.List[dict]):
+
+        """Record the edges from a video to its recommended videos, add the 
+        recommended videos that are new to the frontier, and mark the video as 
+        expanded.
+        """
+
+        source = self._intern(claim_id)
+        edges = []
+
+        for rec_video_info in recommended_video_info:
+            rec_claim_id = rec_video_info['claim_id']
+
+            if rec_claim_id not in self.claim_id_to_video:
+                self._add_video(process_raw_video_info(
+                    raw_video_info = rec_video_info,
+                    auth_token = self.auth_token,
+                    additional_fields = False,
+                    session = self.session), depth = self.depth + 1)
+
+            edges.append((source, self._intern(rec_claim_id)))
+
+        self.edge_counts.update(edges)
+        self._expanded.add(source)
+
+        if self.store is not None:
+            self.store.add_edges(edges)
+            self.store.set_status([source], crawl_store.EXPANDED)
+
+    #-------------------------------------------------------------------------#
+
+    def _add_video(self, video: Video, depth: int):
+
+        """Add a video found at level ``depth`` of the crawl to the frontier, 
+        unless it is already known.
+        """
+
+        if video.claim_id in self.claim_id_to_video:
+            return
+
+        self.claim_id_to_video[video.claim_id] = video
+        index = self._intern(video.claim_id)
+        self.frontier.append(video.claim_id)
+
+        if self.store is not None:
+            self.store.add_video(index, video.claim_id, depth, video.raw)
+
+    #-------------------------------------------------------------------------#
+
+    def _load(self):
+
+        """Restore the crawl state saved in ``store``. Videos and edges are 
+        interned again in the order they were found, and the videos of the 
+        current level that were not expanded yet are put back at the start of 
+        the frontier.
+        """
+
+        if self.store.get_state('channel_list') is None:
+            self.store.set_state('channel_list', list(self.channel_list))
+            self.store.checkpoint()
+
+        self._seeded = self.store.get_state('seeded', False)
+        self.depth = self.store.get_state('depth', 0)
+
+        stored_index_to_index = {}
+        level_size = 0
+
+        for stored_index, claim_id, depth, status, raw in self.store.iter_videos():
+
+            self.claim_id_to_video[claim_id] = process_raw_video_info(
+                raw_video_info = json.loads(raw),
+                additional_fields = False)
+
+            index = self._intern(claim_id)
+            stored_index_to_index[stored_index] = index
+
+            if status == crawl_store.EXPANDED:
+                self._expanded.add(index)
+            elif status == crawl_store.FRONTIER:
+                self.frontier.append(claim_id)
+                level_size += depth <= self.depth
+
+        for source, target, weight in self.store.iter_edges():
+            self.edge_counts[(stored_index_to_index[source], stored_index_to_index[target])] += weight
+
+        if level_size:
+            self._level_size = level_size
+        elif self.frontier:
+            # The level was fully expanded, but the crawl stopped before its 
+            # end was checkpointed
+            self.depth += 1
+
+    #-------------------------------------------------------------------------#
+
+    def _intern(self, claim_id: str) -> int:
+
+        """Return the integer index of a claim ID, assigning a new one if the 
+        claim ID has not been seen yet.
+        """
+
+        index = self._claim_id_to_index.get(claim_id)
+
+        if index is None:
+            index = len(self._claim_ids)
+            self._claim_id_to_index[claim_id] = index
+            self._claim_ids.append(claim_id)
+
+        return index
+
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
\ No newline at end of file
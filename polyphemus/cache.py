@@ -0,0 +1,287 @@
+# -*- coding: UTF-8 -*-
+
+"""Persistent on-disk cache for responses from the Odysee APIs.
+
+The cache is opt-in, and is used by ``api.make_request`` once it has been
+enabled with ``api.set_cache``::
+
+    from polyphemus import api
+    from polyphemus.cache import ResponseCache
+
+    api.set_cache(ResponseCache('polyphemus_cache.sqlite'))
+
+Responses are stored zlib-compressed in a single SQLite file, keyed by the
+HTTP method, URL and canonical request body. Each endpoint has its own
+time-to-live, and the least recently used responses are evicted once the
+cache grows beyond ``max_size`` bytes.
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+from typing import Optional, Dict
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Time-to-live in seconds for each endpoint, keyed by JSON-RPC method name or
+# URL path. Endpoints that are not listed (or have a TTL of 0) are not cached.
+DEFAULT_TTLS = {
+    'resolve': 7 * DAY,
+    'claim_search': 7 * DAY,
+    'get': DAY,
+    'search': DAY,
+    'comment.List': HOUR,
+    'reaction.List': 10 * MINUTE,
+    'file/view_count': 10 * MINUTE,
+    'reaction/list': 10 * MINUTE,
+    'subscription/sub_count': 10 * MINUTE,
+    'user/new': 0}
+
+# Default maximum total size of the compressed responses, in bytes
+MAX_SIZE = 512 * 1024 ** 2
+
+# Request fields that are not part of the cache key, so that responses can be
+# shared between authorization tokens
+IGNORED_FIELDS = ('auth_token',)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class ResponseCache:
+
+    """SQLite-backed cache of API response bodies with per-endpoint TTLs and
+    size-bounded LRU eviction.
+
+    Parameters
+    ----------
+    path: str
+        Path of the SQLite database file. Use ``':memory:'`` for a cache that
+        only lasts as long as the process.
+    ttls: dict<str, float>
+        Time-to-live in seconds for each endpoint, overriding the values in
+        ``DEFAULT_TTLS``.
+    max_size: int
+        Maximum total size of the stored (compressed) responses, in bytes.
+
+    Attributes
+    ----------
+    hits: int
+        Number of requests served from the cache.
+    misses: int
+        Number of cacheable requests that were not found in the cache.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, path: str, ttls: Optional[Dict[str, float]] = None, max_size: int = MAX_SIZE):
+
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread = False)
+        self._connection.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL)''')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self._connection.commit()
+
+        self._size = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    #-------------------------------------------------------------------------#
+
+    def get(self, method: str, kwargs: dict) -> Optional[bytes]:
+
+        """Return the cached response body for a request, or ``None`` if it is
+        not cached or has expired.
+
+        Parameters
+        ----------
+        method: str
+            HTTP method of the request, e.g. ``'POST'``.
+        kwargs: dict
+            Keyword arguments of the request, as passed to
+            ``api.make_request``.
+        """
+
+        if self.get_ttl(kwargs) <= 0:
+            return None
+
+        key = self.get_key(method, kwargs)
+        now = time.time()
+
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT content, expires FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None or row[1] < now:
+                self.misses += 1
+                return None
+            self._connection.execute(
+                'UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            self._connection.commit()
+            self.hits += 1
+
+        return zlib.decompress(row[0])
+
+    #-------------------------------------------------------------------------#
+
+    def set(self, method: str, kwargs: dict, content: bytes):
+
+        """Store the response body for a request, if its endpoint is cacheable,
+        evicting the least recently used responses if the cache is full.
+        """
+
+        ttl = self.get_ttl(kwargs)
+
+        if ttl <= 0:
+            return
+
+        key = self.get_key(method, kwargs)
+        compressed = zlib.compress(content)
+        now = time.time()
+
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                self._size -= row[0]
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                (key, compressed, len(compressed), now + ttl, now))
+            self._size += len(compressed)
+            self._evict()
+            self._connection.commit()
+
+    #-------------------------------------------------------------------------#
+
+    def _evict(self):
+
+        """Delete expired responses, then the least recently used responses,
+        until the cache is no larger than ``max_size``. Must be called with
+        ``_lock`` held.
+        """
+
+        if self._size <= self.max_size:
+            return
+
+        self._connection.execute('DELETE FROM responses WHERE expires < ?', (time.time(),))
+        self._size = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+        cursor = self._connection.execute('SELECT key, size FROM responses ORDER BY accessed')
+        evicted = []
+        for key, size in cursor:
+            if self._size <= self.max_size:
+                break
+            evicted.append((key,))
+            self._size -= size
+
+        self._connection.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+    #-------------------------------------------------------------------------#
+
+    def get_ttl(self, kwargs: dict) -> float:
+
+        """Return the time-to-live of the endpoint targeted by a request.
+        """
+
+        return self.ttls.get(get_endpoint(kwargs), 0)
+
+    #-------------------------------------------------------------------------#
+
+    @staticmethod
+    def get_key(method: str, kwargs: dict) -> str:
+
+        """Return the cache key of a request, from its method, URL and
+        canonical body, ignoring the fields in ``IGNORED_FIELDS``.
+        """
+
+        body = {
+            field : _strip_ignored_fields(kwargs.get(field))
+            for field in ('params', 'data', 'json')}
+
+        canonical = json.dumps([method, kwargs['url'], body], sort_keys = True, separators = (',', ':'))
+
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    #-------------------------------------------------------------------------#
+
+    def stats(self) -> dict:
+
+        """Return the number of hits, misses, stored responses and total size
+        of the cache.
+        """
+
+        with self._lock:
+            n_responses = self._connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'responses': n_responses,
+            'size': self._size}
+
+    #-------------------------------------------------------------------------#
+
+    def clear(self):
+
+        """Delete all responses from the cache.
+        """
+
+        with self._lock:
+            self._connection.execute('DELETE FROM responses')
+            self._connection.commit()
+            self._size = 0
+
+    #-------------------------------------------------------------------------#
+
+    def close(self):
+
+        with self._lock:
+            self._connection.close()
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def get_endpoint(kwargs: dict) -> str:
+
+    """Return the name of the endpoint targeted by a request: the JSON-RPC
+    method for JSON-RPC requests (the method of the first call for batch
+    requests), otherwise the path of the URL, e.g. ``'file/view_count'``.
+    """
+
+    json_data = kwargs.get('json')
+
+    if isinstance(json_data, list) and json_data:
+        json_data = json_data[0]
+
+    if isinstance(json_data, dict) and 'method' in json_data:
+        return json_data['method']
+
+    return urlparse(kwargs['url']).path.strip('/')
+
+#-----------------------------------------------------------------------------#
+
+def _strip_ignored_fields(value):
+
+    if isinstance(value, dict):
+        return {k : v for k, v in value.items() if k not in IGNORED_FIELDS}
+
+    return value
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
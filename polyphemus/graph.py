@@ -0,0 +1,304 @@
+# -*- coding: UTF-8 -*-
+
+"""Sparse recommendation graphs, for analyzing large crawls of the
+``base.RecommendationEngine`` in memory.
+
+Videos and channels are interned to integer indices, and the weighted
+video-level and channel-level graphs are kept as sparse CSR matrices, so that
+degrees, PageRank and channel aggregation are vectorized, and millions of
+edges take a few bytes each::
+
+    from polyphemus.graph import RecommendationGraph
+
+    engine.generate(iterations = 2)
+    graph = RecommendationGraph.from_engine(engine)
+    pagerank = graph.pagerank(level = 'channel')
+    graph.write_gexf('network.gexf')
+
+Requires the optional ``numpy`` and ``scipy`` dependencies
+(``pip install polyphemus[graph]``).
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+from typing import List, Optional, Mapping, Tuple, Iterator
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+import scipy.sparse as sp
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+# Default damping factor, tolerance and maximum number of iterations of PageRank
+PAGERANK_ALPHA = 0.85
+PAGERANK_TOL = 1e-10
+PAGERANK_MAX_ITER = 100
+
+LEVELS = ('video', 'channel')
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class RecommendationGraph:
+
+    """Weighted, directed graphs of recommendations between videos, and
+    between the channels of the videos.
+
+    The video-level graph is the sparse matrix ``adjacency``, whose entry
+    ``(i, j)`` is the number of times video ``claim_ids[j]`` was recommended
+    for video ``claim_ids[i]``. The channel-level graph ``channel_adjacency``
+    is aggregated from it as ``M.T @ adjacency @ M``, where ``M`` is the sparse
+    video-to-channel membership matrix. Videos without a channel are left out
+    of the channel-level graph.
+
+    Parameters
+    ----------
+    claim_ids: list<str>
+        Claim IDs of the videos, indexed as in ``edge_counts``.
+    edge_counts: dict<(int, int), int>
+        Weight of each ``(source, target)`` edge between video indices, e.g.
+        ``RecommendationEngine.edge_counts``.
+    video_channels: list<str>
+        Channel name of each video, or ``None`` if it is not known.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, claim_ids: List[str], edge_counts: Mapping[Tuple[int, int], int], video_channels: List[Optional[str]]):
+
+        self.claim_ids = list(claim_ids)
+
+        n_videos = len(self.claim_ids)
+        n_edges = len(edge_counts)
+
+        sources = np.fromiter((source for source, _ in edge_counts.keys()), dtype = np.int64, count = n_edges)
+        targets = np.fromiter((target for _, target in edge_counts.keys()), dtype = np.int64, count = n_edges)
+        weights = np.fromiter(edge_counts.values(), dtype = np.float64, count = n_edges)
+
+        self.adjacency = sp.csr_matrix((weights, (sources, targets)), shape = (n_videos, n_videos))
+
+        # Intern channel names, -1 standing for videos without a channel
+        self.channel_names = []
+        channel_to_index = {}
+        self.video_channel = np.full(n_videos, -1, dtype = np.int64)
+
+        for i, channel_name in enumerate(video_channels):
+            if channel_name is None:
+                continue
+            index = channel_to_index.get(channel_name)
+            if index is None:
+                index = channel_to_index[channel_name] = len(self.channel_names)
+                self.channel_names.append(channel_name)
+            self.video_channel[i] = index
+
+        has_channel = np.flatnonzero(self.video_channel >= 0)
+
+        self.membership = sp.csr_matrix(
+            (np.ones(len(has_channel)), (has_channel, self.video_channel[has_channel])),
+            shape = (n_videos, len(self.channel_names)))
+
+        self.channel_adjacency = (self.membership.T @ self.adjacency @ self.membership).tocsr()
+
+    #-------------------------------------------------------------------------#
+
+    @classmethod
+    def from_engine(cls, engine) -> 'RecommendationGraph':
+
+        """Build the graph of the crawl of a ``base.RecommendationEngine``.
+        """
+
+        video_channels = [
+            video.channel_name if video is not None else None
+            for video in map(engine.claim_id_to_video.get, engine.claim_ids)]
+
+        return cls(
+            claim_ids = engine.claim_ids,
+            edge_counts = engine.edge_counts,
+            video_channels = video_channels)
+
+    #-------------------------------------------------------------------------#
+
+    def get_adjacency(self, level: str = 'video') -> sp.csr_matrix:
+
+        if level not in LEVELS:
+            raise ValueError(f'level must be one of {LEVELS}, not {level!r}')
+
+        return self.adjacency if level == 'video' else self.channel_adjacency
+
+    #-------------------------------------------------------------------------#
+
+    def get_labels(self, level: str = 'video') -> List[str]:
+
+        """Return the claim IDs of the videos, or the names of the channels, in
+        index order.
+        """
+
+        self.get_adjacency(level)
+
+        return self.claim_ids if level == 'video' else self.channel_names
+
+    #-------------------------------------------------------------------------#
+
+    def out_degree(self, level: str = 'video', weighted: bool = True) -> np.ndarray:
+
+        """Return the (weighted) number of recommendations from each node.
+        """
+
+        adjacency = self.get_adjacency(level)
+
+        if weighted:
+            return np.asarray(adjacency.sum(axis = 1)).ravel()
+
+        return np.diff(adjacency.indptr)
+
+    #-------------------------------------------------------------------------#
+
+    def in_degree(self, level: str = 'video', weighted: bool = True) -> np.ndarray:
+
+        """Return the (weighted) number of recommendations to each node.
+        """
+
+        adjacency = self.get_adjacency(level)
+
+        if weighted:
+            return np.asarray(adjacency.sum(axis = 0)).ravel()
+
+        return np.bincount(adjacency.indices, minlength = adjacency.shape[1])
+
+    #-------------------------------------------------------------------------#
+
+    def pagerank(self, level: str = 'video', alpha: float = PAGERANK_ALPHA, tol: float = PAGERANK_TOL, max_iter: int = PAGERANK_MAX_ITER) -> np.ndarray:
+
+        """Return the weighted PageRank of each node, see ``pagerank``.
+        """
+
+        return pagerank(self.get_adjacency(level), alpha = alpha, tol = tol, max_iter = max_iter)
+
+    #-------------------------------------------------------------------------#
+
+    def weighted_edge_list(self, level: str = 'channel') -> List[Tuple[str, str, int]]:
+
+        """Return the ``(source, target, weight)`` edges, from the heaviest to
+        the lightest, like ``RecommendationEngine.weighted_edge_list``.
+        """
+
+        return sorted(self.iter_edges(level), key = lambda edge: edge[2], reverse = True)
+
+    #-------------------------------------------------------------------------#
+
+    def iter_edges(self, level: str = 'channel') -> Iterator[Tuple[str, str, int]]:
+
+        """Yield the ``(source, target, weight)`` edges, one node at a time.
+        """
+
+        adjacency = self.get_adjacency(level)
+        labels = self.get_labels(level)
+
+        for i in range(adjacency.shape[0]):
+            start, end = adjacency.indptr[i], adjacency.indptr[i + 1]
+            for j, weight in zip(adjacency.indices[start:end].tolist(), adjacency.data[start:end].tolist()):
+                yield labels[i], labels[j], int(weight)
+
+    #-------------------------------------------------------------------------#
+
+    def write_edge_list(self, path: str, level: str = 'channel', delimiter: str = '\t'):
+
+        """Stream the edges to a ``source, target, weight`` text file.
+        """
+
+        with open(path, 'w') as f:
+            for source, target, weight in self.iter_edges(level):
+                f.write(f'{source}{delimiter}{target}{delimiter}{weight}\n')
+
+    #-------------------------------------------------------------------------#
+
+    def write_gexf(self, path: str, level: str = 'channel'):
+
+        """Stream the graph to a GEXF file, e.g. for Gephi, with the PageRank
+        of each node as an attribute.
+        """
+
+        adjacency = self.get_adjacency(level)
+        labels = self.get_labels(level)
+        scores = pagerank(adjacency).tolist()
+
+        with open(path, 'w', encoding = 'utf-8') as f:
+
+            f.write(
+                '<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<gexf xmlns="http://gexf.net/1.2" version="1.2">\n'
+                '  <graph mode="static" defaultedgetype="directed">\n'
+                '    <attributes class="node">\n'
+                '      <attribute id="0" title="pagerank" type="double"/>\n'
+                '    </attributes>\n'
+                '    <nodes>\n')
+
+            for i, (label, score) in enumerate(zip(labels, scores)):
+                f.write(
+                    f'      <node id="{i}" label={quoteattr(label)}>'
+                    f'<attvalues><attvalue for="0" value="{score!r}"/></attvalues></node>\n')
+
+            f.write(
+                '    </nodes>\n'
+                '    <edges>\n')
+
+            edge_id = 0
+            for i in range(adjacency.shape[0]):
+                start, end = adjacency.indptr[i], adjacency.indptr[i + 1]
+                for j, weight in zip(adjacency.indices[start:end].tolist(), adjacency.data[start:end].tolist()):
+                    f.write(f'      <edge id="{edge_id}" source="{i}" target="{j}" weight="{weight!r}"/>\n')
+                    edge_id += 1
+
+            f.write(
+                '    </edges>\n'
+                '  </graph>\n'
+                '</gexf>\n')
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def pagerank(adjacency: sp.spmatrix, alpha: float = PAGERANK_ALPHA, tol: float = PAGERANK_TOL, max_iter: int = PAGERANK_MAX_ITER) -> np.ndarray:
+
+    """Return the PageRank of each node of a weighted graph, by power iteration
+    on its sparse adjacency matrix. The rank of nodes without outgoing edges is
+    spread evenly over all nodes.
+
+    Parameters
+    ----------
+    adjacency: scipy.sparse matrix
+        Square matrix whose entry ``(i, j)`` is the weight of the edge from
+        node ``i`` to node ``j``.
+    alpha: float
+        Damping factor.
+    tol: float
+        The iteration stops once the L1 norm of the change of the ranks is
+        below ``tol``.
+    max_iter: int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    ranks: numpy.ndarray
+        Ranks of the nodes, summing to 1.
+    """
+
+    n_nodes = adjacency.shape[0]
+
+    if n_nodes == 0:
+        return np.zeros(0)
+
+    out_weights = np.asarray(adjacency.sum(axis = 1)).ravel()
+    dangling = out_weights == 0
+    inverse_out_weights = np.divide(1.0, out_weights, out = np.zeros(n_nodes), where = ~dangling)
+
+    transposed = sp.csr_matrix(adjacency.T)
+    ranks = np.full(n_nodes, 1.0 / n_nodes)
+
+    for _ in range(max_iter):
+        new_ranks = alpha * (transposed @ (ranks * inverse_out_weights))
+        new_ranks += (alpha * ranks[dangling].sum() + 1 - alpha) / n_nodes
+        if np.abs(new_ranks - ranks).sum() < tol:
+            return new_ranks
+        ranks = new_ranks
+
+    return ranks
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
@@ -0,0 +1,390 @@
+# -*- coding: UTF-8 -*-
+
+"""Streaming scrape of a channel's videos and comments.
+
+``OdyseeChannelScraper.get_all_videos_and_comments`` returns lists holding
+every video and comment of a channel. A ``ChannelPipeline`` instead runs the
+scrape as stages connected by bounded queues, and hands each video and comment
+to a ``sink`` as soon as it is ready, so memory use does not grow with the size
+of the channel, and writing overlaps with fetching::
+
+    from polyphemus.base import OdyseeChannelScraper
+    from polyphemus.pipeline import ChannelPipeline, CsvSink
+
+    scraper = OdyseeChannelScraper(channel_name = 'Mak1nBacon')
+
+    with CsvSink('videos.csv', 'comments.csv') as sink:
+        ChannelPipeline(scraper, sink).run()
+
+The stages are:
+
+1. list the raw video info of the channel, one page at a time;
+2. fetch the additional fields of the videos, in bulk batches processed by
+   ``video_workers`` threads;
+3. fetch the comments of each video, in ``comment_workers`` threads;
+4. look up the reactions of the comments of all videos together, in batches of
+   ``reaction_batch_size`` comments;
+5. call ``sink`` with each video and comment, in the calling thread.
+
+When a queue is full, the stage feeding it waits, so a slow stage (or sink)
+slows down the stages before it instead of letting records pile up.
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import csv
+import queue
+import threading
+from contextlib import closing
+from typing import Callable, Union, Dict, Iterator, Optional, Any
+
+from polyphemus import api
+from polyphemus.base import OdyseeChannelScraper, PendingHighWaterMark, Video, Comment, MAX_WORKERS, process_raw_comment_info
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+# Default maximum number of records waiting in each queue between two stages
+QUEUE_SIZE = 1000
+
+# Default number of videos whose comments are fetched concurrently
+COMMENT_WORKERS = 4
+
+# Number of seconds between two checks of whether another stage has failed,
+# while waiting on a queue
+POLL_INTERVAL = 0.1
+
+# Marks the end of the records put in a queue by a stage
+_DONE = object()
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class _Stopped(Exception):
+
+    """Raised in a stage waiting on a queue once another stage has failed.
+    """
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class ChannelPipeline:
+
+    """Scrape all videos of a channel, and optionally their comments, streaming
+    each Video and Comment object to ``sink`` as soon as it is processed.
+
+    Records reach ``sink`` in order of completion, the comments of a video
+    always after the video itself. If any stage (or ``sink``) raises, the other
+    stages are stopped and ``run`` raises the same exception.
+
+    Parameters
+    ----------
+    scraper: OdyseeChannelScraper
+        Scraper of the channel. Its session, authorization token and
+        high-water marks are used by all stages.
+    sink: callable
+        Called with each Video and Comment object, from the thread calling
+        ``run``.
+    comments: bool
+        Whether to fetch the comments of the videos.
+    incremental: bool
+        Whether to only scrape the videos released at or after the channel's
+        high-water mark, see ``OdyseeChannelScraper.get_all_videos``. The mark
+        is only saved once ``run`` has passed every record to ``sink``.
+    video_workers: int
+        Number of batches of videos whose additional fields are fetched
+        concurrently.
+    comment_workers: int
+        Number of videos whose comments are fetched concurrently.
+    reaction_batch_size: int
+        Number of comments, from any number of videos, whose reactions are
+        looked up together.
+    queue_size: int
+        Maximum number of records waiting in each queue.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, scraper: OdyseeChannelScraper, sink: Callable[[Union[Video, Comment]], Any], comments: bool = True, incremental: bool = False, video_workers: int = MAX_WORKERS, comment_workers: int = COMMENT_WORKERS, reaction_batch_size: int = api.COMMENT_REACTION_BATCH_SIZE, queue_size: int = QUEUE_SIZE):
+
+        self.scraper = scraper
+        self.sink = sink
+        self.comments = comments
+        self.incremental = incremental
+        self.video_workers = video_workers
+        self.comment_workers = comment_workers
+        self.reaction_batch_size = reaction_batch_size
+        self.queue_size = queue_size
+
+        self._stop = threading.Event()
+        self._error = None
+        self._error_lock = threading.Lock()
+
+    #-------------------------------------------------------------------------#
+
+    def run(self) -> Dict[str, int]:
+
+        """Run the pipeline until every record has been passed to ``sink``.
+
+        Returns
+        -------
+        counts: dict<str, int>
+            Number of videos and comments passed to ``sink``.
+        """
+
+        self._stop.clear()
+        self._error = None
+
+        raw_video_queue = queue.Queue(maxsize = self.queue_size)
+        comment_queue = queue.Queue(maxsize = self.queue_size)
+        reaction_queue = queue.Queue(maxsize = self.queue_size)
+        record_queue = queue.Queue(maxsize = self.queue_size)
+
+        n_comment_workers = self.comment_workers if self.comments else 0
+
+        # The high-water mark of the videos is only saved once all their 
+        # records have reached `sink`
+        high_water_mark = self.scraper.pending_high_water_mark()
+
+        threads = [
+            threading.Thread(target = self._run_stage, args = (self._list_videos, raw_video_queue)),
+            threading.Thread(target = self._run_stage, args = (self._process_videos, raw_video_queue, comment_queue, record_queue, n_comment_workers, high_water_mark))]
+
+        threads.extend(
+            threading.Thread(target = self._run_stage, args = (self._get_comments, comment_queue, reaction_queue))
+            for _ in range(n_comment_workers))
+
+        if n_comment_workers:
+            threads.append(threading.Thread(target = self._run_stage, args = (self._get_comment_reactions, reaction_queue, record_queue, n_comment_workers)))
+
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        counts = {'videos': 0, 'comments': 0}
+
+        try:
+            n_running = 2 if n_comment_workers else 1
+            while n_running:
+                record = self._get(record_queue)
+                if record is _DONE:
+                    n_running -= 1
+                    continue
+                self.sink(record)
+                counts['comments' if record.is_comment else 'videos'] += 1
+        except _Stopped:
+            pass
+        except BaseException as exception:
+            self._fail(exception)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+        if high_water_mark is not None:
+            high_water_mark.commit()
+
+        return counts
+
+    #-------------------------------------------------------------------------#
+
+    def _list_videos(self, raw_video_queue: queue.Queue):
+
+        for raw_video_info in self.scraper.iter_raw_video_info(incremental = self.incremental):
+            self._put(raw_video_queue, raw_video_info)
+
+        self._put(raw_video_queue, _DONE)
+
+    #-------------------------------------------------------------------------#
+
+    def _process_videos(self, raw_video_queue: queue.Queue, comment_queue: queue.Queue, record_queue: queue.Queue, n_comment_workers: int, high_water_mark: Optional[PendingHighWaterMark]):
+
+        videos = self.scraper.process_videos(
+            raw_video_info_list = self._iter_queue(raw_video_queue),
+            max_workers = self.video_workers,
+            ordered = False,
+            high_water_mark = high_water_mark)
+
+        with closing(videos):
+            for video in videos:
+                self._put(record_queue, video)
+                if n_comment_workers:
+                    self._put(comment_queue, video.claim_id)
+
+        for _ in range(n_comment_workers):
+            self._put(comment_queue, _DONE)
+
+        self._put(record_queue, _DONE)
+
+    #-------------------------------------------------------------------------#
+
+    def _get_comments(self, comment_queue: queue.Queue, reaction_queue: queue.Queue):
+
+        for claim_id in self._iter_queue(comment_queue):
+            raw_comment_info_list = api.get_all_comments(video_id = claim_id, session = self.scraper.session, reactions = False)
+            for raw_comment_info in raw_comment_info_list:
+                self._put(reaction_queue, raw_comment_info)
+
+        self._put(reaction_queue, _DONE)
+
+    #-------------------------------------------------------------------------#
+
+    def _get_comment_reactions(self, reaction_queue: queue.Queue, record_queue: queue.Queue, n_comment_workers: int):
+
+        """Buffer the comments of all videos, and look up their reactions with
+        ``api.append_comment_reactions_bulk`` once ``reaction_batch_size``
+        comments are buffered, or once every comment worker is done.
+        """
+
+        batch = []
+        n_running = n_comment_workers
+
+        while n_running:
+
+            raw_comment_info = self._get(reaction_queue)
+
+            if raw_comment_info is _DONE:
+                n_running -= 1
+            else:
+                batch.append(raw_comment_info)
+
+            if len(batch) >= self.reaction_batch_size or (batch and not n_running):
+                api.append_comment_reactions_bulk(comment_info_list = batch, session = self.scraper.session, batch_size = self.reaction_batch_size)
+                for raw_comment_info in batch:
+                    self._put(record_queue, process_raw_comment_info(raw_comment_info))
+                batch = []
+
+        self._put(record_queue, _DONE)
+
+    #-------------------------------------------------------------------------#
+
+    def _run_stage(self, stage: Callable, *args):
+
+        try:
+            stage(*args)
+        except _Stopped:
+            pass
+        except BaseException as exception:
+            self._fail(exception)
+
+    #-------------------------------------------------------------------------#
+
+    def _fail(self, exception: BaseException):
+
+        """Record the first exception raised by a stage, and stop the others.
+        """
+
+        with self._error_lock:
+            if self._error is None:
+                self._error = exception
+
+        self._stop.set()
+
+    #-------------------------------------------------------------------------#
+
+    def _put(self, q: queue.Queue, item):
+
+        """Put an item in a queue, waiting while it is full, unless the
+        pipeline is stopped.
+        """
+
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            try:
+                q.put(item, timeout = POLL_INTERVAL)
+                return
+            except queue.Full:
+                pass
+
+    #-------------------------------------------------------------------------#
+
+    def _get(self, q: queue.Queue):
+
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            try:
+                return q.get(timeout = POLL_INTERVAL)
+            except queue.Empty:
+                pass
+
+    #-------------------------------------------------------------------------#
+
+    def _iter_queue(self, q: queue.Queue) -> Iterator:
+
+        """Yield the items of a queue until ``_DONE``.
+        """
+
+        while True:
+            item = self._get(q)
+            if item is _DONE:
+                return
+            yield item
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class CsvSink:
+
+    """Sink writing videos and comments to two CSV files as they arrive, with
+    the columns of ``Video.as_dict`` and ``Comment.as_dict``.
+
+    Parameters
+    ----------
+    video_path: str
+        Path of the CSV file of videos.
+    comment_path: str
+        Path of the CSV file of comments. If ``None``, comments are ignored.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, video_path: str, comment_path: Optional[str] = None):
+
+        self.video_path = video_path
+        self.comment_path = comment_path
+
+        self._files = {}
+        self._writers = {}
+
+    #-------------------------------------------------------------------------#
+
+    def __call__(self, record: Union[Video, Comment]):
+
+        path = self.comment_path if record.is_comment else self.video_path
+
+        if path is None:
+            return
+
+        row = record.as_dict()
+
+        if path not in self._writers:
+            self._files[path] = open(path, 'w', newline = '', encoding = 'utf-8')
+            self._writers[path] = csv.DictWriter(self._files[path], fieldnames = list(row), quoting = csv.QUOTE_NONNUMERIC)
+            self._writers[path].writeheader()
+
+        self._writers[path].writerow(row)
+
+    #-------------------------------------------------------------------------#
+
+    def close(self):
+
+        for f in self._files.values():
+            f.close()
+
+        self._files.clear()
+        self._writers.clear()
+
+    #-------------------------------------------------------------------------#
+
+    def __enter__(self) -> 'CsvSink':
+
+        return self
+
+    #-------------------------------------------------------------------------#
+
+    def __exit__(self, *exc_info):
+
+        self.close()
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
@@ -0,0 +1,399 @@
+# -*- coding: UTF-8 -*-
+
+"""Rate limiting and retry policy shared by all requests made through
+``api.make_request``.
+
+A single ``RateLimiter`` (see ``api.get_rate_limiter``) is shared by all
+threads, so that what one request learns about a server is applied to all of
+them:
+
+* each host has a token bucket limiting the rate of requests, which is paused
+  for every caller when a response asks to retry later (``Retry-After``);
+* each host has an adaptive concurrency limit, which is halved when the server
+  throttles requests (HTTP 429 or 503) and slowly grows back on success;
+* retries wait for a jittered exponential backoff, or at least the
+  ``Retry-After`` time of the response, so that throttled workers do not all
+  retry at the same moment;
+* each endpoint has a circuit breaker, which makes requests wait (and
+  eventually fail with a ``CircuitOpenError``) after repeated server failures
+  other than throttling, until the endpoint has had time to recover.
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import random
+import threading
+import time
+from typing import Optional, Dict
+from urllib.parse import urlparse
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+# Default maximum number of requests per second and burst size for each host
+DEFAULT_RATE = 50.0
+DEFAULT_BURST = 100
+
+# Default bounds of the adaptive number of concurrent requests to each host,
+# and the minimum number of seconds between two decreases of the limit
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 32
+DECREASE_INTERVAL = 1.0
+
+# Base and maximum of the exponential backoff between retries, in seconds
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+# Number of consecutive failures after which the circuit of an endpoint opens,
+# and number of seconds before a trial request is let through
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+# HTTP status codes of responses that throttle requests to a host
+THROTTLED_STATUS_CODES = [429, 503]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class CircuitOpenError(ValueError):
+
+    """Raised instead of sending a request to an endpoint whose circuit is
+    open.
+    """
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TokenBucket:
+
+    """Thread-safe token bucket, letting through on average ``rate`` calls to
+    ``acquire`` per second, with bursts of up to ``capacity`` calls.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float = DEFAULT_BURST):
+
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    #-------------------------------------------------------------------------#
+
+    def acquire(self):
+
+        """Wait until a token is available (and the bucket is not paused), then
+        take it.
+        """
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._paused_until > now:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    #-------------------------------------------------------------------------#
+
+    def pause(self, seconds: float):
+
+        """Stop letting calls through for ``seconds``, e.g. after a response
+        with a ``Retry-After`` header.
+        """
+
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class AdaptiveConcurrencyLimit:
+
+    """Thread-safe limit on the number of concurrent requests, using additive
+    increase and multiplicative decrease: the limit is halved when a request
+    is throttled (at most once every ``DECREASE_INTERVAL`` seconds), and grows
+    by about one for every ``limit`` successful requests.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, minimum: int = MIN_CONCURRENCY, maximum: int = MAX_CONCURRENCY):
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(maximum)
+
+        self._in_flight = 0
+        self._last_decrease = float('-inf')
+        self._condition = threading.Condition()
+
+    #-------------------------------------------------------------------------#
+
+    def acquire(self):
+
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    #-------------------------------------------------------------------------#
+
+    def release(self, throttled: Optional[bool] = False):
+
+        """Release a slot, decreasing the limit if the request was throttled,
+        and increasing it if it succeeded (``throttled`` is ``None`` for
+        requests that neither succeeded nor were throttled).
+        """
+
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                now = time.monotonic()
+                if now - self._last_decrease >= DECREASE_INTERVAL:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = now
+            elif throttled is not None:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class CircuitBreaker:
+
+    """Thread-safe circuit breaker. After ``failure_threshold`` consecutive
+    failures the circuit opens and ``allow`` returns ``False`` for
+    ``reset_timeout`` seconds. A single trial request is then let through,
+    which closes the circuit if it succeeds, or opens it again if it fails.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._failures = 0
+        self._opened = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    #-------------------------------------------------------------------------#
+
+    def allow(self) -> bool:
+
+        with self._lock:
+            if self._opened is None:
+                return True
+            if not self._trial and time.monotonic() - self._opened >= self.reset_timeout:
+                self._trial = True
+                return True
+            return False
+
+    #-------------------------------------------------------------------------#
+
+    def record(self, success: Optional[bool]):
+
+        """Record the outcome of a request. ``success`` is ``None`` for 
+        requests that neither succeeded nor failed (e.g. throttled requests), 
+        which only end a trial, so that another one can be let through.
+        """
+
+        with self._lock:
+            if success is None:
+                pass
+            elif success:
+                self._failures = 0
+                self._opened = None
+            else:
+                self._failures += 1
+                if self._trial or self._failures >= self.failure_threshold:
+                    self._opened = time.monotonic()
+            self._trial = False
+
+    #-------------------------------------------------------------------------#
+
+    @property
+    def is_open(self) -> bool:
+
+        return self._opened is not None
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class RateLimiter:
+
+    """Token bucket and adaptive concurrency limit for each host, and circuit
+    breaker for each endpoint, shared by all requests.
+
+    Parameters
+    ----------
+    rate: float
+        Default maximum number of requests per second to each host.
+    burst: int
+        Default number of requests that can be sent to a host at once.
+    host_rates: dict<str, float>
+        Maximum number of requests per second for specific hosts, e.g.
+        ``{'comments.odysee.com': 10}``.
+    max_concurrency: int
+        Maximum number of concurrent requests to each host.
+    failure_threshold: int
+        Number of consecutive failures after which an endpoint's circuit opens.
+    reset_timeout: float
+        Number of seconds an endpoint's circuit stays open.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, host_rates: Optional[Dict[str, float]] = None, max_concurrency: int = MAX_CONCURRENCY, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+
+        self.rate = rate
+        self.burst = burst
+        self.host_rates = host_rates or {}
+        self.max_concurrency = max_concurrency
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._buckets = {}
+        self._concurrency_limits = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    #-------------------------------------------------------------------------#
+
+    def acquire(self, url: str, endpoint: str):
+
+        """Wait until a request to ``endpoint`` at ``url`` can be sent.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the circuit of the endpoint is open.
+        """
+
+        if not self._get_breaker(endpoint).allow():
+            raise CircuitOpenError(f'Circuit open for endpoint {endpoint!r} after repeated failures')
+
+        host = urlparse(url).netloc
+
+        self._get_bucket(host).acquire()
+        self._get_concurrency_limit(host).acquire()
+
+    #-------------------------------------------------------------------------#
+
+    def release(self, url: str, endpoint: str, status_code: Optional[int], retry_after: Optional[float] = None):
+
+        """Record the outcome of a request sent after ``acquire``.
+
+        Parameters
+        ----------
+        url: str
+        endpoint: str
+        status_code: int
+            HTTP status code of the response, or ``None`` if no response was
+            received (e.g. a connection error).
+        retry_after: float
+            ``Retry-After`` time of the response in seconds, if any, during
+            which no request is sent to the host.
+        """
+
+        host = urlparse(url).netloc
+
+        throttled = status_code in THROTTLED_STATUS_CODES
+
+        if status_code == 200:
+            self._get_concurrency_limit(host).release(throttled = False)
+        elif throttled:
+            self._get_concurrency_limit(host).release(throttled = True)
+        else:
+            self._get_concurrency_limit(host).release(throttled = None)
+
+        if throttled and retry_after:
+            self._get_bucket(host).pause(retry_after)
+
+        # Throttled requests are neither failures nor successes of the endpoint, 
+        # so that a temporary throttle never opens its circuit
+        if throttled:
+            self._get_breaker(endpoint).record(success = None)
+        elif status_code is None or status_code >= 500:
+            self._get_breaker(endpoint).record(success = False)
+        elif status_code < 400:
+            self._get_breaker(endpoint).record(success = True)
+
+    #-------------------------------------------------------------------------#
+
+    def cancel(self, url: str):
+
+        """Give back the slot of a request acquired with ``acquire`` that was
+        cancelled before it completed, without recording any outcome.
+        """
+
+        host = urlparse(url).netloc
+
+        self._get_concurrency_limit(host).release(throttled = None)
+
+    #-------------------------------------------------------------------------#
+
+    def stats(self) -> dict:
+
+        """Return the current concurrency limit of each host and the endpoints
+        whose circuit is open.
+        """
+
+        with self._lock:
+            return {
+                'concurrency_limits': {host : int(limit.limit) for host, limit in self._concurrency_limits.items()},
+                'open_circuits': [endpoint for endpoint, breaker in self._breakers.items() if breaker.is_open]}
+
+    #-------------------------------------------------------------------------#
+
+    def _get_bucket(self, host: str) -> TokenBucket:
+
+        with self._lock:
+            if host not in self._buckets:
+                rate = self.host_rates.get(host, self.rate)
+                self._buckets[host] = TokenBucket(rate = rate, capacity = max(1, min(self.burst, rate * 2)))
+            return self._buckets[host]
+
+    #-------------------------------------------------------------------------#
+
+    def _get_concurrency_limit(self, host: str) -> AdaptiveConcurrencyLimit:
+
+        with self._lock:
+            if host not in self._concurrency_limits:
+                self._concurrency_limits[host] = AdaptiveConcurrencyLimit(maximum = self.max_concurrency)
+            return self._concurrency_limits[host]
+
+    #-------------------------------------------------------------------------#
+
+    def _get_breaker(self, endpoint: str) -> CircuitBreaker:
+
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(failure_threshold = self.failure_threshold, reset_timeout = self.reset_timeout)
+            return self._breakers[endpoint]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def backoff_delay(n_retries: int, retry_after: Optional[float] = None, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+
+    """Return the number of seconds to wait before retry number ``n_retries``
+    (starting at 1): a random time between 0 and ``base * 2 ** (n_retries - 1)``
+    capped at ``cap`` ("full jitter"), or at least ``retry_after`` if the
+    response asked for it.
+    """
+
+    delay = random.uniform(0, min(cap, base * 2 ** (n_retries - 1)))
+
+    if retry_after is not None:
+        delay = max(delay, retry_after + random.uniform(0, base))
+
+    return delay
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
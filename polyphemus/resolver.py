@@ -0,0 +1,205 @@
+# -*- coding: UTF-8 -*-
+
+"""Coalescing of ``resolve`` requests made by many concurrent callers.
+
+``api.get_recommended`` resolves the (at most 20) names of the recommended
+videos with its own ``resolve`` request, and during a crawl many of those names
+have already been resolved by earlier calls. A ``ClaimResolver`` shared by all
+calls keeps the resolved claims in memory, and gathers the names that still
+need to be resolved into large ``resolve`` batches::
+
+    from polyphemus import api
+    from polyphemus.resolver import ClaimResolver
+
+    resolver = ClaimResolver()
+    api.get_recommended(video_title, video_id, resolver = resolver)
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Dict, Optional
+
+import requests
+
+from polyphemus import api
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+# Maximum number of names sent in a single `resolve` request
+RESOLVE_BATCH_SIZE = api.RESOLVE_BATCH_SIZE
+
+# Default number of seconds a batch waits for other callers to add their names,
+# when it was queued behind a request in flight
+MAX_WAIT = 0
+
+# Default maximum number of resolved claims kept in memory
+MAX_CACHE_SIZE = 50000
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class ClaimResolver:
+
+    """Thread-safe resolver of normalized names to raw claim dicts, with an
+    in-memory cache of resolved claims and batching of concurrent requests.
+
+    Names that are not cached are queued. If no ``resolve`` request is in
+    flight, or ``batch_size`` names are queued, the caller sends them right
+    away. Otherwise they wait for the request in flight, whose sender then
+    sends all the names queued in the meantime as one batch, after waiting
+    another ``max_wait`` seconds for more names. Each name is only requested
+    once, even if several callers ask for it at the same time.
+
+    Parameters
+    ----------
+    session: requests.Session
+        Session used for all requests.
+    batch_size: int
+        Maximum number of names per ``resolve`` request.
+    max_wait: float
+        Number of seconds a batch queued behind a request in flight waits for
+        other callers before it is sent.
+    max_cache_size: int
+        Maximum number of resolved claims kept in memory, the least recently
+        used claims being evicted first. If ``None``, the cache is unbounded.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, session: requests.Session = None, batch_size: int = RESOLVE_BATCH_SIZE, max_wait: float = MAX_WAIT, max_cache_size: Optional[int] = MAX_CACHE_SIZE):
+
+        self.session = session
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.max_cache_size = max_cache_size
+
+        self.hits = 0
+        self.misses = 0
+        self.n_requests = 0
+
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._queue = []
+        self._n_senders = 0
+        self._lock = threading.Lock()
+
+    #-------------------------------------------------------------------------#
+
+    def resolve(self, normalized_names: List[str]) -> List[dict]:
+
+        """Resolve normalized names to raw claim dicts, like
+        ``api.normalized_names_to_video_info``.
+
+        Parameters
+        ----------
+        normalized_names: list<str>
+            e.g. ``['want-me-eat-all-chips-meme']``
+
+        Returns
+        -------
+        raw_claim_info_list: list<dict>
+            Raw claim dicts, in the order of ``normalized_names``.
+        """
+
+        resolved = {}
+        futures = {}
+
+        with self._lock:
+            for name in normalized_names:
+                if name in resolved or name in futures:
+                    continue
+                if name in self._cache:
+                    self._cache.move_to_end(name)
+                    resolved[name] = self._cache[name]
+                    self.hits += 1
+                elif name in self._pending:
+                    futures[name] = self._pending[name]
+                else:
+                    future = Future()
+                    self._pending[name] = future
+                    self._queue.append(name)
+                    futures[name] = future
+                    self.misses += 1
+            # send the queued names now if no request is in flight, otherwise 
+            # the sender of that request sends them once it is done
+            send = bool(self._queue) and (self._n_senders == 0 or len(self._queue) >= self.batch_size)
+            if send:
+                self._n_senders += 1
+
+        if send:
+            self._flush()
+
+        for name, future in futures.items():
+            resolved[name] = future.result()
+
+        return [resolved[name] for name in normalized_names]
+
+    #-------------------------------------------------------------------------#
+
+    def stats(self) -> Dict[str, int]:
+
+        """Return the number of cache hits and misses, the number of ``resolve``
+        requests sent, and the number of cached claims.
+        """
+
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'requests': self.n_requests,
+                'claims': len(self._cache)}
+
+    #-------------------------------------------------------------------------#
+
+    def _flush(self):
+
+        """Send all queued names, in batches of at most ``batch_size``, and set
+        the result (or exception) of their futures, until the queue is empty.
+        Must be called after incrementing ``_n_senders``.
+        """
+
+        n_batches = 0
+
+        while True:
+
+            if n_batches and self.max_wait:
+                with self._lock:
+                    full_batch = len(self._queue) >= self.batch_size
+                if not full_batch:
+                    time.sleep(self.max_wait)
+
+            with self._lock:
+                batch = self._queue[:self.batch_size]
+                del self._queue[:self.batch_size]
+                if not batch:
+                    self._n_senders -= 1
+                    return
+                self.n_requests += 1
+
+            n_batches += 1
+
+            try:
+                raw_claim_info_list = api.normalized_names_to_video_info(batch, session = self.session)
+            except Exception as exception:
+                with self._lock:
+                    futures = [self._pending.pop(name) for name in batch]
+                for future in futures:
+                    future.set_exception(exception)
+                continue
+
+            with self._lock:
+                futures = [self._pending.pop(name) for name in batch]
+                for name, raw_claim_info in zip(batch, raw_claim_info_list):
+                    self._cache[name] = raw_claim_info
+                    self._cache.move_to_end(name)
+                if self.max_cache_size is not None:
+                    while len(self._cache) > self.max_cache_size:
+                        self._cache.popitem(last = False)
+
+            for future, raw_claim_info in zip(futures, raw_claim_info_list):
+                future.set_result(raw_claim_info)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
@@ -0,0 +1,409 @@
+# -*- coding: UTF-8 -*-
+
+"""Local persistent state for scrapes that are repeated over time, and for long
+crawls that may have to be resumed.
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import heapq
+import json
+import mmap
+import os
+import sqlite3
+import threading
+from typing import Optional, Iterable, Iterator, Tuple, Any, Set, Mapping
+
+# Status of the videos of a crawl: not expanded yet, expanded (their 
+# recommendations have been recorded), or skipped because their level was 
+# larger than the maximum frontier size
+FRONTIER = 0
+EXPANDED = 1
+SKIPPED = 2
+
+# Size in bytes of a claim ID in a `SeenClaimIndex`
+RECORD_SIZE = 20
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class HighWaterMarkStore:
+
+    """JSON file recording, for each channel, the ``release_time`` from which 
+    later scrapes of the channel need to fetch videos (its high-water mark), 
+    and the claim IDs of the scraped videos released at or after it, so that 
+    they are not returned again.
+
+    Parameters
+    ----------
+    path: str
+        Path of the JSON file. It is created on the first update if it does 
+        not exist. Files written by earlier versions, mapping each channel to 
+        its mark only, can still be read.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, path: str):
+
+        self.path = path
+
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path) as f:
+                self._marks = {
+                    channel_id : entry if isinstance(entry, dict) else {'release_time': entry, 'claim_ids': {}}
+                    for channel_id, entry in json.load(f).items()}
+        else:
+            self._marks = {}
+
+    #-------------------------------------------------------------------------#
+
+    def get(self, channel_id: str) -> Optional[int]:
+
+        """Return the high-water mark of a channel, or ``None`` if it has never 
+        been scraped.
+        """
+
+        with self._lock:
+            entry = self._marks.get(channel_id)
+            return None if entry is None else entry['release_time']
+
+    #-------------------------------------------------------------------------#
+
+    def get_known_claim_ids(self, channel_id: str) -> Set[str]:
+
+        """Return the claim IDs of the scraped videos of a channel released at 
+        or after its high-water mark.
+        """
+
+        with self._lock:
+            entry = self._marks.get(channel_id)
+            return set() if entry is None else set(entry['claim_ids'])
+
+    #-------------------------------------------------------------------------#
+
+    def update(self, channel_id: str, release_time: int, claim_release_times: Optional[Mapping[str, int]] = None):
+
+        """Raise the high-water mark of a channel to ``release_time`` (it is 
+        never lowered), record the claim IDs of ``claim_release_times`` (a 
+        mapping of claim IDs of scraped videos to their release time) that are 
+        at or after the mark, and save the file.
+        """
+
+        with self._lock:
+
+            entry = self._marks.get(channel_id, {'release_time': int(release_time), 'claim_ids': {}})
+            mark = max(entry['release_time'], int(release_time))
+
+            claim_ids = {**entry['claim_ids'], **(claim_release_times or {})}
+            claim_ids = {claim_id : int(t) for claim_id, t in claim_ids.items() if t >= mark}
+
+            if channel_id in self._marks and mark == entry['release_time'] and claim_ids == entry['claim_ids']:
+                return
+
+            self._marks[channel_id] = {'release_time': mark, 'claim_ids': claim_ids}
+            self._save()
+
+    #-------------------------------------------------------------------------#
+
+    def _save(self):
+
+        """Atomically write the marks to ``path``. Must be called with ``_lock`` 
+        held.
+        """
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok = True)
+
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._marks, f, indent = 2, sort_keys = True)
+        os.replace(tmp_path, self.path)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class CrawlStore:
+
+    """SQLite file holding the state of a recommendation crawl, so that it can 
+    be resumed after a crash (see ``base.RecommendationEngine.resume``).
+
+    Videos are stored with the integer index the crawl assigned to their claim 
+    ID, the level of the crawl at which they were found, their status 
+    (``FRONTIER``, ``EXPANDED`` or ``SKIPPED``) and their raw claim info. Edges 
+    are stored as weighted pairs of video indices. Writes are only made durable 
+    by ``checkpoint``.
+
+    Parameters
+    ----------
+    path: str
+        Path of the SQLite database file. It is created if it does not exist.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, path: str):
+
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread = False)
+        self._connection.executescript('''
+            CREATE TABLE IF NOT EXISTS videos (
+                idx INTEGER PRIMARY KEY,
+                claim_id TEXT NOT NULL UNIQUE,
+                depth INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                raw TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS edges (
+                source INTEGER NOT NULL,
+                target INTEGER NOT NULL,
+                weight INTEGER NOT NULL,
+                PRIMARY KEY (source, target));
+            CREATE TABLE IF NOT EXISTS state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL);''')
+        self._connection.commit()
+
+    #-------------------------------------------------------------------------#
+
+    def add_video(self, index: int, claim_id: str, depth: int, raw: str, status: int = FRONTIER):
+
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR IGNORE INTO videos VALUES (?, ?, ?, ?, ?)',
+                (index, claim_id, depth, status, raw))
+
+    #-------------------------------------------------------------------------#
+
+    def add_edges(self, edges: Iterable[Tuple[int, int]]):
+
+        """Add one to the weight of each ``(source, target)`` edge.
+        """
+
+        with self._lock:
+            self._connection.executemany('''
+                INSERT INTO edges VALUES (?, ?, 1)
+                ON CONFLICT (source, target) DO UPDATE SET weight = weight + 1''',
+                edges)
+
+    #-------------------------------------------------------------------------#
+
+    def set_status(self, indices: Iterable[int], status: int):
+
+        with self._lock:
+            self._connection.executemany(
+                'UPDATE videos SET status = ? WHERE idx = ?',
+                ((status, index) for index in indices))
+
+    #-------------------------------------------------------------------------#
+
+    def get_state(self, key: str, default: Any = None) -> Any:
+
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+
+        return default if row is None else json.loads(row[0])
+
+    #-------------------------------------------------------------------------#
+
+    def set_state(self, key: str, value: Any):
+
+        """Set a JSON-serializable value of the crawl, e.g. its depth.
+        """
+
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO state VALUES (?, ?)', (key, json.dumps(value)))
+
+    #-------------------------------------------------------------------------#
+
+    def iter_videos(self) -> Iterator[Tuple[int, str, int, int, str]]:
+
+        """Yield the ``(index, claim_id, depth, status, raw)`` of each video, in 
+        the order they were found.
+        """
+
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT idx, claim_id, depth, status, raw FROM videos ORDER BY idx').fetchall()
+
+        return iter(rows)
+
+    #-------------------------------------------------------------------------#
+
+    def iter_edges(self) -> Iterator[Tuple[int, int, int]]:
+
+        """Yield the ``(source, target, weight)`` of each edge.
+        """
+
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT source, target, weight FROM edges').fetchall()
+
+        return iter(rows)
+
+    #-------------------------------------------------------------------------#
+
+    def checkpoint(self):
+
+        """Commit all writes since the last checkpoint.
+        """
+
+        with self._lock:
+            self._connection.commit()
+
+    #-------------------------------------------------------------------------#
+
+    def close(self):
+
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class SeenClaimIndex:
+
+    """Compact file of the claim IDs that earlier crawls have already expanded, 
+    so that recurring crawls (see ``base.RecommendationEngine``) can skip them.
+
+    Claim IDs are stored as sorted 20-byte records, which are memory-mapped 
+    and looked up with a binary search, so that tens of millions of claims take 
+    a few hundred MB on disk and almost no memory. Claims added since the file 
+    was last saved are kept in memory until ``save`` merges them into the file.
+
+    Parameters
+    ----------
+    path: str
+        Path of the index file. It is created on the first save if it does not 
+        exist.
+    """
+
+    #-------------------------------------------------------------------------#
+
+    def __init__(self, path: str):
+
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._new = set()
+        self._file = None
+        self._records = b''
+
+        self._open()
+
+    #-------------------------------------------------------------------------#
+
+    def __contains__(self, claim_id: str) -> bool:
+
+        record = bytes.fromhex(claim_id)
+
+        with self._lock:
+            return record in self._new or self._search(record)
+
+    #-------------------------------------------------------------------------#
+
+    def __len__(self) -> int:
+
+        with self._lock:
+            return len(self._records) // RECORD_SIZE + len(self._new)
+
+    #-------------------------------------------------------------------------#
+
+    def add(self, claim_id: str):
+
+        """Add a claim ID (40 hexadecimal characters) to the index.
+        """
+
+        record = bytes.fromhex(claim_id)
+
+        with self._lock:
+            if not self._search(record):
+                self._new.add(record)
+
+    #-------------------------------------------------------------------------#
+
+    def update(self, claim_ids: Iterable[str]):
+
+        for claim_id in claim_ids:
+            self.add(claim_id)
+
+    #-------------------------------------------------------------------------#
+
+    def save(self):
+
+        """Merge the claim IDs added since the last save into the file, which 
+        is replaced atomically.
+        """
+
+        with self._lock:
+
+            if not self._new:
+                return
+
+            n_records = len(self._records) // RECORD_SIZE
+            records = (self._records[i * RECORD_SIZE:(i + 1) * RECORD_SIZE] for i in range(n_records))
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok = True)
+
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.writelines(heapq.merge(records, sorted(self._new)))
+
+            self._close()
+            os.replace(tmp_path, self.path)
+            self._new.clear()
+            self._open()
+
+    #-------------------------------------------------------------------------#
+
+    def close(self):
+
+        with self._lock:
+            self._close()
+
+    #-------------------------------------------------------------------------#
+
+    def _search(self, record: bytes) -> bool:
+
+        """Binary search of the saved records. Must be called with ``_lock`` 
+        held.
+        """
+
+        low = 0
+        high = len(self._records) // RECORD_SIZE
+
+        while low < high:
+            middle = (low + high) // 2
+            middle_record = self._records[middle * RECORD_SIZE:(middle + 1) * RECORD_SIZE]
+            if middle_record < record:
+                low = middle + 1
+            elif middle_record > record:
+                high = middle
+            else:
+                return True
+
+        return False
+
+    #-------------------------------------------------------------------------#
+
+    def _open(self):
+
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self._file = open(self.path, 'rb')
+            self._records = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+
+    #-------------------------------------------------------------------------#
+
+    def _close(self):
+
+        if self._file is not None:
+            self._records.close()
+            self._file.close()
+        self._file = None
+        self._records = b''
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
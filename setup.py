@@ -31,6 +31,13 @@ setup(
         'beautifulsoup4 >= 4.10.0',
         'pandas >= 1.4.0'],
     extras_require = {
+        'async': [
+            'aiohttp >= 3.8'],
+        'speedups': [
+            'orjson >= 3.6'],
+        'graph': [
+            'numpy >= 1.22',
+            'scipy >= 1.8'],
         'docs': [
             'sphinx >= 3.3.1',
             'sphinx_rtd_theme >= 0.5',],
@@ -41,6 +48,7 @@ setup(
             'pytest-metadata >= 1.10.0']},
     include_package_data = True,
     zip_safe = False,
+    python_requires = '>=3.10',
     entry_points = {
         'console_scripts': [
             'polyphemus = polyphemus._cli:main']})
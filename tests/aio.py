@@ -0,0 +1,157 @@
+# -*- coding: UTF-8 -*-
+
+"""Tests for to polyphemus.aio module.
+
+The full set of tests for this module can be evaluated by executing the
+command::
+
+  $ python -m pytest tests/aio.py
+
+from the project root directory.
+
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import asyncio
+import json
+
+import pytest
+
+from polyphemus import api
+from polyphemus.cache import ResponseCache
+from polyphemus.ratelimit import RateLimiter
+
+aio = pytest.importorskip('polyphemus.aio')
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+KWARGS_LIST = [
+    ('get_auth_token', []),
+    ('get_channel_info', ['channel_name']),
+    ('get_subscribers', ['channel_id', 'auth_token']),
+    ('get_raw_video_info_list', ['channel_id']),
+    ('get_views', ['video_id', 'auth_token']),
+    ('get_video_reactions', ['video_id', 'auth_token']),
+    ('get_all_comments', ['video_id']),
+    ('append_comment_reactions', ['comment_info_list']),
+    ('get_recommended', ['video_title', 'video_id']),
+    ('normalized_names_to_video_info', ['normalized_names']),
+    ('get_streaming_url', ['canonical_url']),]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+@pytest.mark.parametrize('function_str,kwargs', KWARGS_LIST)
+def test_minimal_init(resources, function_str, kwargs):
+
+  function = eval(f'aio.{function_str}')
+  function_kwargs = {kwarg: resources[kwarg] for kwarg in kwargs}
+
+  async def run():
+    async with aio.AsyncClient() as client:
+      await function(client, **function_kwargs)
+
+  asyncio.run(run())
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_async_channel_scraper(resources):
+
+  async def run():
+    async with aio.AsyncClient() as client:
+      scraper = await aio.AsyncOdyseeChannelScraper.create(client, channel_name = resources['channel_name'])
+      await scraper.get_entity()
+      await scraper.get_all_videos_and_comments()
+
+  asyncio.run(run())
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class FakeResponse:
+
+  def __init__(self, status, payload):
+    self.status = status
+    self.headers = {}
+    self.content = json.dumps(payload).encode()
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, *exc_info):
+    pass
+
+  async def read(self):
+    return self.content
+
+class FakeSession:
+
+  def __init__(self, respond):
+    self.respond = respond
+    self.requests = []
+
+  def request(self, method, **kwargs):
+    self.requests.append((method, kwargs))
+    return self.respond(method, kwargs)
+
+  async def close(self):
+    pass
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_make_request_shared_hooks(monkeypatch):
+
+  rate_limiter = RateLimiter(rate = 1000, burst = 1000)
+  monkeypatch.setattr(api, '_rate_limiter', rate_limiter)
+  monkeypatch.setattr(api, '_cache', ResponseCache(':memory:'))
+  monkeypatch.setattr(aio, 'backoff_delay', lambda n_retries, retry_after = None: 0)
+
+  kwargs = {'url': api.BACKEND_API_URL, 'json': {'method': 'resolve', 'params': {'urls': ['lbry://@a']}}}
+
+  async def run(session):
+    async with aio.AsyncClient() as client:
+      client._session = session
+      return await client.make_request('POST', dict(kwargs), max_retries = 3)
+
+  session = FakeSession(lambda method, kwargs: FakeResponse(200, {'result': {}}))
+  assert asyncio.run(run(session))[1] == {'result': {}}
+  assert asyncio.run(run(session))[1] == {'result': {}}
+  # the second response is served by the shared cache
+  assert len(session.requests) == 1
+
+  api.get_cache().clear()
+  session = FakeSession(lambda method, kwargs: FakeResponse(413, {}))
+  with pytest.raises(api.MaxRetriesError) as exc_info:
+    asyncio.run(run(session))
+  assert exc_info.value.status_codes == [413] * 3
+  assert exc_info.value.is_batch_rejected()
+  # every slot acquired from the shared rate limiter was released
+  assert all(limit._in_flight == 0 for limit in rate_limiter._concurrency_limits.values())
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_iter_raw_video_info_window(monkeypatch):
+
+  monkeypatch.setattr(api, '_rate_limiter', None)
+  monkeypatch.setattr(api, '_cache', None)
+
+  # 40 videos released at the same time, of which claim_search returns at most 
+  # 30 for a given `release_time`, as with Odysee's limit of 1000 videos
+  videos = [{'claim_id': f'{i:040x}', 'meta': {'creation_timestamp': 1000 - i}} for i in range(40)]
+
+  def respond(method, kwargs):
+    params = kwargs['json']['params']
+    release_time = int(params['release_time'][1:])
+    window = [video for video in videos if video['meta']['creation_timestamp'] < release_time][:30]
+    page = window[(params['page'] - 1) * 10:params['page'] * 10]
+    return FakeResponse(200, {'result': {'items': page}})
+
+  async def run():
+    async with aio.AsyncClient() as client:
+      client._session = FakeSession(respond)
+      return await aio.get_raw_video_info_list(client, channel_id = 'channel')
+
+  assert [video['claim_id'] for video in asyncio.run(run())] == [video['claim_id'] for video in videos]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
@@ -13,6 +13,9 @@ from the project root directory.
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
+import json
+import time
+
 import pytest
 
 from polyphemus import api
@@ -20,17 +23,25 @@ from polyphemus import api
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
 KWARGS_LIST = [
+    ('make_session', []),
     ('get_auth_token', []),
     ('get_channel_info', ['channel_name']),
+    ('get_channel_info_bulk', ['channel_names']),
     ('get_subscribers', ['channel_id', 'auth_token']),
+    ('get_subscribers_bulk', ['channel_ids', 'auth_token']),
     ('get_raw_video_info_list', ['channel_id']),
     ('get_views', ['video_id', 'auth_token']),
     ('get_video_reactions', ['video_id', 'auth_token']),
+    ('get_views_bulk', ['claim_ids', 'auth_token']),
+    ('get_reactions_bulk', ['claim_ids', 'auth_token']),
     ('get_all_comments', ['video_id']),
     ('append_comment_reactions', ['comment_info_list']),
+    ('append_comment_reactions_bulk', ['comment_info_list']),
     ('get_recommended', ['video_title', 'video_id']),
+    ('get_recommended_names', ['video_title', 'video_id']),
     ('normalized_names_to_video_info', ['normalized_names']),
-    ('get_streaming_url', ['canonical_url']),]
+    ('get_streaming_url', ['canonical_url']),
+    ('get_streaming_urls', ['canonical_urls']),]
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
@@ -42,4 +53,148 @@ def test_minimal_init(resources, function_str, kwargs):
 
   function(**function_kwargs)
 
-#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
\ No newline at end of file
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_iter_raw_video_info(resources):
+
+  raw_video_info_list = api.get_raw_video_info_list(channel_id = resources['channel_id'])
+  streamed_claim_ids = [raw_video_info['claim_id'] for raw_video_info in api.iter_raw_video_info(channel_id = resources['channel_id'])]
+
+  assert streamed_claim_ids == [raw_video_info['claim_id'] for raw_video_info in raw_video_info_list]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_get_raw_video_info_list_partitioned(resources):
+
+  raw_video_info_list = api.get_raw_video_info_list(channel_id = resources['channel_id'])
+  partitioned_raw_video_info_list = api.get_raw_video_info_list_partitioned(channel_id = resources['channel_id'], max_workers = 4)
+
+  assert {raw_video_info['claim_id'] for raw_video_info in raw_video_info_list} <= {raw_video_info['claim_id'] for raw_video_info in partitioned_raw_video_info_list}
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_get_all_comments_concurrent(resources):
+
+  sequential_comments = api.get_all_comments(video_id = resources['video_id'], page_size = 10, max_workers = 1)
+  concurrent_comments = api.get_all_comments(video_id = resources['video_id'], max_workers = 4)
+
+  assert [c['comment_id'] for c in concurrent_comments] == [c['comment_id'] for c in sequential_comments]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_get_channel_info_bulk(resources):
+
+  channel_name = resources['channel_names'][0]
+  channel_info = api.get_channel_info(channel_name = channel_name)
+  bulk_channel_info = api.get_channel_info_bulk(channel_names = resources['channel_names'])
+
+  assert bulk_channel_info[channel_name]['channel_id'] == channel_info['channel_id']
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_get_recommended_names_paged(monkeypatch):
+
+  requested_pages = []
+
+  def request_json(request, kwargs, session = None):
+    page_from = int(kwargs['params']['from'])
+    requested_pages.append(page_from)
+    return [{'name': f'video-{i}'} for i in range(page_from, page_from + int(kwargs['params']['size']))]
+
+  monkeypatch.setattr(api, 'request_json', request_json)
+  api.clear_recommendation_cache()
+
+  normalized_names = api.get_recommended_names(video_title = 'title', video_id = 'a' * 40, depth = 3, page_size = 5)
+  assert normalized_names == [f'video-{i}' for i in range(15)]
+  assert sorted(requested_pages) == [0, 5, 10]
+
+  assert api.get_recommended_names(video_title = 'title', video_id = 'a' * 40, depth = 3, page_size = 5) == normalized_names
+  assert len(requested_pages) == 3
+
+  api.clear_recommendation_cache()
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+@pytest.mark.parametrize('status_code,split', [(413, True), (200, True), (429, False), (503, False), (None, False)])
+def test_request_in_batches_split(status_code, split):
+
+  batch_sizes = []
+
+  def request_batch(batch, max_retries):
+    batch_sizes.append(len(batch))
+    if len(batch) > 1:
+      raise api.MaxRetriesError('rejected', [status_code] * max_retries)
+    return {batch[0]: 0}
+
+  claim_ids = [str(i) for i in range(4)]
+
+  if split:
+    assert api._request_in_batches(request_batch, claim_ids, batch_size = 4) == dict.fromkeys(claim_ids, 0)
+    assert batch_sizes == [4, 2, 1, 1, 2, 1, 1]
+  else:
+    with pytest.raises(api.MaxRetriesError):
+      api._request_in_batches(request_batch, claim_ids, batch_size = 4)
+    assert batch_sizes == [4]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+@pytest.mark.parametrize('batch_response', ['accepted', 'rejected', 'unexpected'])
+def test_get_streaming_urls_batch(monkeypatch, batch_response):
+
+  class Response:
+    status_code = 200
+    headers = {}
+    def __init__(self, payload):
+      self.content = json.dumps(payload).encode()
+
+  class Session:
+    def __init__(self):
+      self.requests = []
+    def request(self, method, **kwargs):
+      self.requests.append((method, kwargs['json']))
+      if isinstance(kwargs['json'], list):
+        if batch_response == 'rejected':
+          return Response({'error': {'code': -32600, 'message': 'batch requests are not supported'}})
+        if batch_response == 'unexpected':
+          return Response({'result': None})
+        return Response([{'id': call['id'], 'result': {'streaming_url': call['params']['uri']}} for call in kwargs['json']])
+      return Response({'result': {'streaming_url': kwargs['json']['params']['uri']}})
+
+  def count_batches(session):
+    return sum(isinstance(body, list) for _, body in session.requests)
+
+  monkeypatch.setattr(api, '_rate_limiter', None)
+  monkeypatch.setattr(api, '_batch_requests_rejected_until', 0.0)
+  monkeypatch.setattr(api, 'backoff_delay', lambda n_retries, retry_after = None: 0)
+
+  canonical_urls = [f'lbry://video-{i}' for i in range(3)]
+
+  session = Session()
+  assert api.get_streaming_urls(canonical_urls, session = session) == {url: url for url in canonical_urls}
+
+  if batch_response == 'accepted':
+    assert len(session.requests) == 1
+    method, body = session.requests[0]
+    assert method == 'POST'
+    assert [call['params']['uri'] for call in body] == canonical_urls
+  elif batch_response == 'rejected':
+    assert count_batches(session) == api.BULK_MAX_RETRIES
+    session = Session()
+    api.get_streaming_urls(canonical_urls, session = session)
+    assert count_batches(session) == 0
+    # batching is tried again once the rejection has expired
+    monkeypatch.setattr(api, '_batch_requests_rejected_until', time.time() - 1)
+    api.get_streaming_urls(canonical_urls, session = session)
+    assert count_batches(session) == api.BULK_MAX_RETRIES
+  else:
+    session = Session()
+    api.get_streaming_urls(canonical_urls, session = session)
+    assert count_batches(session) == 1
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_loads_json():
+
+  assert api.loads_json(b'{"result": {"items": [1, "\xc3\xa9"]}}') == {'result': {'items': [1, 'é']}}
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
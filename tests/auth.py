@@ -0,0 +1,125 @@
+# -*- coding: UTF-8 -*-
+
+"""Tests for to polyphemus.auth module.
+
+The full set of tests for this module can be evaluated by executing the
+command::
+
+  $ python -m pytest tests/auth.py
+
+from the project root directory.
+
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import itertools
+import os
+import stat
+
+import pytest
+
+from polyphemus import api
+from polyphemus import auth
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TestTokenProvider:
+
+    @pytest.fixture(autouse=True)
+    def test_simple_init(self, tmp_path, monkeypatch):
+        tokens = (f'token{i}' for i in itertools.count())
+        monkeypatch.setattr(auth, '_new_token', lambda session = None: next(tokens))
+        self.path = str(tmp_path / 'auth_token')
+        self.provider = auth.TokenProvider(self.path)
+
+    def test_get_is_reused(self):
+        assert self.provider.get() == self.provider.get() == 'token0'
+
+    def test_get_is_persisted(self):
+        token = self.provider.get()
+        assert auth.TokenProvider(self.path).get() == token
+
+    def test_invalidate(self):
+        token = self.provider.get()
+        self.provider.invalidate(token)
+        assert self.provider.get() != token
+        assert auth.TokenProvider(self.path).get() == self.provider.get()
+
+    def test_invalidate_replaced_token(self):
+        self.provider.invalidate('token_from_another_process')
+        assert self.provider.get() == 'token0'
+
+    @pytest.mark.skipif(os.name != 'posix', reason = 'POSIX file modes')
+    def test_file_is_private(self):
+        self.provider.get()
+        assert stat.S_IMODE(os.stat(self.path).st_mode) == 0o600
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TestTokenPool:
+
+    @pytest.fixture(autouse=True)
+    def test_simple_init(self, tmp_path, monkeypatch):
+        tokens = (f'token{i}' for i in itertools.count())
+        monkeypatch.setattr(auth, '_new_token', lambda session = None: next(tokens))
+        self.path = str(tmp_path / 'auth_tokens')
+        self.pool = auth.TokenPool(size = 3, path = self.path, mint_interval = 0)
+
+    def test_round_robin(self):
+        self.pool.fill()
+        assert [self.pool.get() for _ in range(6)] == ['token0', 'token1', 'token2'] * 2
+
+    def test_throttle(self):
+        self.pool.fill()
+        self.pool.throttle('token1', 60)
+        assert 'token1' not in {self.pool.get() for _ in range(6)}
+        assert self.pool.stats() == {'tokens': 3, 'throttled': 1}
+
+    def test_invalidate(self):
+        self.pool.fill()
+        self.pool.invalidate('token0')
+        assert auth.TokenPool(path = self.path).stats()['tokens'] == 2
+        assert 'token3' in {self.pool.get() for _ in range(3)}
+
+    @pytest.mark.skipif(os.name != 'posix', reason = 'POSIX file modes')
+    def test_file_is_private(self):
+        self.pool.fill()
+        assert stat.S_IMODE(os.stat(self.path).st_mode) == 0o600
+
+    def test_mint_interval(self):
+        pool = auth.TokenPool(size = 3, mint_interval = 60)
+        assert {pool.get() for _ in range(3)} == {'token0'}
+
+    def test_mint_failure(self, monkeypatch):
+        self.pool.get()
+
+        def _new_token(session = None):
+            raise ValueError('user/new 503')
+
+        monkeypatch.setattr(auth, '_new_token', _new_token)
+        assert self.pool.get() == 'token0'
+        with pytest.raises(ValueError):
+            auth.TokenPool(size = 1).get()
+
+    def test_mint_failure_in_request(self, monkeypatch):
+
+        class Response:
+            status_code = 200
+            headers = {}
+            content = b'{"success": true, "data": [7]}'
+
+        class Session:
+            def request(self, method, **kwargs):
+                assert kwargs['params']['auth_token'] == 'token0'
+                return Response()
+
+        def _new_token(session = None):
+            raise ValueError('user/new 503')
+
+        self.pool.get()
+        monkeypatch.setattr(auth, '_new_token', _new_token)
+        monkeypatch.setattr(api, '_token_provider', self.pool)
+        assert api.get_views(video_id = 'a' * 40, session = Session()) == 7
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
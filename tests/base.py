@@ -13,9 +13,15 @@ from the project root directory.
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
+import json
+import time
+
 import pytest
 
 from polyphemus import base
+from polyphemus import store
+
+from tests.conftest import FULL_VIDEO_INFO
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
@@ -34,6 +40,69 @@ class TestOdyseeChannelScraper:
     def test_get_all_videos_and_comments(self):
         self.scraper.get_all_videos_and_comments()
 
+    def test_get_all_videos_incremental(self, resources, tmp_path):
+        high_water_marks = store.HighWaterMarkStore(str(tmp_path / 'marks.json'))
+        scraper = base.OdyseeChannelScraper(channel_name = resources['channel_name'], high_water_marks = high_water_marks)
+        all_videos = list(scraper.get_all_videos(additional_fields = False, incremental = True))
+        new_videos = list(scraper.get_all_videos(additional_fields = False, incremental = True))
+        assert len(new_videos) <= len(all_videos)
+
+#-----------------------------------------------------------------------------#
+
+def test_high_water_mark_scheduled_videos(tmp_path, monkeypatch):
+
+    now = int(time.time())
+    raw_video_info_list = [
+        {'claim_id': 'scheduled', 'value': {'release_time': now + 86400}, 'meta': {'creation_timestamp': now}},
+        {'claim_id': 'new', 'value': {'release_time': now - 60}, 'meta': {'creation_timestamp': now - 60}},
+        {'claim_id': 'old', 'value': {'release_time': now - 86400}, 'meta': {'creation_timestamp': now - 86400}}]
+    calls = []
+
+    def iter_raw_video_info(channel_id, session = None, since = None, known_claim_ids = None):
+        calls.append((since, known_claim_ids))
+        return iter(raw_video_info_list)
+
+    monkeypatch.setattr(base.api, 'get_channel_info', lambda channel_name, session = None: {'channel_id': 'channel'})
+    monkeypatch.setattr(base.api, 'iter_raw_video_info', iter_raw_video_info)
+    monkeypatch.setattr(base, 'process_raw_video_info_list', lambda raw_video_info_list, **kwargs: iter(list(raw_video_info_list)))
+
+    high_water_marks = store.HighWaterMarkStore(str(tmp_path / 'marks.json'))
+    scraper = base.OdyseeChannelScraper(channel_name = 'channel', high_water_marks = high_water_marks)
+    list(scraper.get_all_videos(incremental = True))
+    list(scraper.get_all_videos(incremental = True))
+
+    assert high_water_marks.get('channel') <= now - base.HIGH_WATER_MARK_OVERLAP
+    assert calls[0] == (None, None)
+    assert calls[1][0] <= now - base.HIGH_WATER_MARK_OVERLAP
+    assert calls[1][1] == {'scheduled', 'new'}
+
+#-----------------------------------------------------------------------------#
+
+def test_high_water_mark_waits_for_comments(tmp_path, monkeypatch):
+
+    now = int(time.time())
+    raw_video_info_list = [{'claim_id': 'video', 'value': {'release_time': now - 86400}, 'meta': {'creation_timestamp': now - 86400}}]
+
+    def get_all_comments(video_id, session = None, reactions = True):
+        raise ValueError('comment.List 503')
+
+    monkeypatch.setattr(base.api, 'get_channel_info', lambda channel_name, session = None: {'channel_id': 'channel'})
+    monkeypatch.setattr(base.api, 'iter_raw_video_info', lambda channel_id, session = None, since = None, known_claim_ids = None: iter(raw_video_info_list))
+    monkeypatch.setattr(base.api, 'get_all_comments', get_all_comments)
+    monkeypatch.setattr(base.api, 'append_comment_reactions_bulk', lambda comment_info_list, session = None: None)
+    monkeypatch.setattr(base, 'process_raw_video_info_list', lambda raw_video_info_list, **kwargs: iter([base.Video('url', 'video', raw_video_info['claim_id'], None, 'title', raw = raw_video_info) for raw_video_info in raw_video_info_list]))
+
+    high_water_marks = store.HighWaterMarkStore(str(tmp_path / 'marks.json'))
+    scraper = base.OdyseeChannelScraper(channel_name = 'channel', high_water_marks = high_water_marks)
+
+    with pytest.raises(ValueError):
+        scraper.get_all_videos_and_comments(incremental = True)
+    assert high_water_marks.get('channel') is None
+
+    monkeypatch.setattr(base.api, 'get_all_comments', lambda video_id, session = None, reactions = True: [])
+    scraper.get_all_videos_and_comments(incremental = True)
+    assert high_water_marks.get('channel') == now - 86400 - base.HIGH_WATER_MARK_OVERLAP
+
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
 def test_process_raw_video_info(resources):
@@ -41,9 +110,35 @@ def test_process_raw_video_info(resources):
 
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
+@pytest.mark.parametrize('max_workers,ordered', [(1, True), (4, True), (4, False)])
+def test_process_raw_video_info_list(resources, max_workers, ordered):
+    raw_video_info_list = [dict(resources['full_video_info']) for _ in range(4)]
+    videos = list(base.process_raw_video_info_list(raw_video_info_list = raw_video_info_list, auth_token = resources['auth_token'], max_workers = max_workers, ordered = ordered))
+    assert len(videos) == len(raw_video_info_list)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
 def test_process_raw_comment_info(resources):
     base.process_raw_comment_info(raw_comment_info = resources['full_comment_info'])
 
+#-----------------------------------------------------------------------------#
+
+def test_raw_info(resources):
+    raw_video_info = json.loads(json.dumps(resources['full_video_info']))
+    video = base.process_raw_video_info(raw_video_info = raw_video_info, additional_fields = False)
+    assert raw_video_info == resources['full_video_info']
+    assert video.raw == json.dumps(raw_video_info)
+    assert video.raw is video.raw
+    assert video.as_dict()['raw'] == video.raw
+    assert not hasattr(video, '__dict__')
+    assert base.Video(**{**video.as_dict(), 'raw': '{}'}).raw == '{}'
+
+#-----------------------------------------------------------------------------#
+
+def test_get_channels(resources):
+    channels = base.get_channels(channel_names = [resources['channel_name']])
+    assert channels[resources['channel_name']].channel_id == resources['channel_id']
+
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
 
 class TestRecommendationEngine:
@@ -55,4 +150,58 @@ class TestRecommendationEngine:
     def test_generate(self):
         self.engine.generate(iterations = 1)
 
-#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
\ No newline at end of file
+    def test_crawl_state(self):
+        weighted_edge_list, _, claim_id_to_video = self.engine.generate(iterations = 1)
+        assert len(self.engine.edge_list) == sum(self.engine.edge_counts.values())
+        assert self.engine.already_done_claim_ids.isdisjoint(self.engine.frontier)
+        assert set(self.engine.frontier) <= claim_id_to_video.keys()
+
+    def test_generate_bounded(self, resources):
+        engine = base.RecommendationEngine(channel_list = [resources['channel_name']], max_workers = 4, max_frontier_size = 5, max_depth = 1)
+        engine.generate(iterations = 2)
+        assert engine.depth == 1
+        assert len(engine.already_done_claim_ids) <= 5
+
+    def test_resume(self, resources, tmp_path):
+        path = str(tmp_path / 'crawl.sqlite')
+        engine = base.RecommendationEngine(channel_list = [resources['channel_name']], max_frontier_size = 5, store = store.CrawlStore(path))
+        engine.generate(iterations = 1)
+        resumed_engine = base.RecommendationEngine.resume(store.CrawlStore(path), max_frontier_size = 5)
+        assert resumed_engine.depth == engine.depth
+        assert resumed_engine.edge_list == engine.edge_list
+        assert resumed_engine.already_done_claim_ids == engine.already_done_claim_ids
+        assert list(resumed_engine.frontier) == list(engine.frontier)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_seen_claims_recurring_crawl(tmp_path, monkeypatch):
+
+    seed, a, b = (f'{i:040x}' for i in range(3))
+    recommendations = {seed: [a]}
+
+    def raw_video_info(claim_id):
+        return {**FULL_VIDEO_INFO, 'claim_id': claim_id}
+
+    def get_recommended(video_title, video_id, session = None, resolver = None, depth = 1):
+        return [raw_video_info(claim_id) for claim_id in recommendations.get(video_id, [])]
+
+    monkeypatch.setattr(base.api, 'get_channel_info', lambda channel_name, session = None: {'channel_id': 'channel'})
+    monkeypatch.setattr(base.api, 'iter_raw_video_info', lambda channel_id, session = None, since = None, known_claim_ids = None: iter([raw_video_info(seed)]))
+    monkeypatch.setattr(base.api, 'get_recommended', get_recommended)
+    monkeypatch.setattr(base, 'get_channels', lambda channel_names, auth_token = None, session = None: {})
+
+    path = str(tmp_path / 'seen_claims.idx')
+
+    engine = base.RecommendationEngine(channel_list = ['channel'], max_workers = 1, seen_claims = store.SeenClaimIndex(path))
+    engine.generate(iterations = 2)
+    assert engine.already_done_claim_ids == {seed, a}
+
+    # a week later, the seed is also recommending a new video
+    recommendations[seed].append(b)
+
+    engine = base.RecommendationEngine(channel_list = ['channel'], max_workers = 1, seen_claims = store.SeenClaimIndex(path))
+    engine.generate(iterations = 2)
+    assert engine.already_done_claim_ids == {seed, b}
+    assert engine.edge_list == [(seed, a), (seed, b)]
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
@@ -0,0 +1,93 @@
+# -*- coding: UTF-8 -*-
+
+"""Tests for to polyphemus.cache module.
+
+The full set of tests for this module can be evaluated by executing the
+command::
+
+  $ python -m pytest tests/cache.py
+
+from the project root directory.
+
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import pytest
+
+from polyphemus import api
+from polyphemus.cache import ResponseCache, get_endpoint
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+RESOLVE_KWARGS = {
+    'url': api.BACKEND_API_URL,
+    'json': {'jsonrpc': '2.0', 'method': 'resolve', 'params': {'urls': ['lbry://@Mak1nBacon']}}}
+
+VIEW_KWARGS = {
+    'url': api.VIEW_API_URL,
+    'params': {'auth_token': 'a', 'claim_id': 'a754344cd7887a15ab4fddaa893ff08926c63bf3'}}
+
+NEW_USER_KWARGS = {
+    'url': api.NEW_USER_API_URL}
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    yield cache
+    cache.close()
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+@pytest.mark.parametrize('kwargs,endpoint', [
+    (RESOLVE_KWARGS, 'resolve'),
+    (VIEW_KWARGS, 'file/view_count'),
+    (NEW_USER_KWARGS, 'user/new')])
+def test_get_endpoint(kwargs, endpoint):
+    assert get_endpoint(kwargs) == endpoint
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_hit_and_miss(cache):
+    assert cache.get('POST', RESOLVE_KWARGS) is None
+    cache.set('POST', RESOLVE_KWARGS, b'{"result": {}}')
+    assert cache.get('POST', RESOLVE_KWARGS) == b'{"result": {}}'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_key_ignores_auth_token(cache):
+    cache.set('GET', VIEW_KWARGS, b'{"data": [1]}')
+    other_token_kwargs = {**VIEW_KWARGS, 'params': {**VIEW_KWARGS['params'], 'auth_token': 'b'}}
+    assert cache.get('GET', other_token_kwargs) == b'{"data": [1]}'
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_uncacheable_endpoint(cache):
+    cache.set('POST', NEW_USER_KWARGS, b'{"data": {}}')
+    assert cache.get('POST', NEW_USER_KWARGS) is None
+    assert cache.stats()['responses'] == 0
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_expiry(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttls = {'resolve': -1})
+    cache.set('POST', RESOLVE_KWARGS, b'{}')
+    assert cache.get('POST', RESOLVE_KWARGS) is None
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_lru_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), max_size = 100)
+    kwargs_list = [
+        {**RESOLVE_KWARGS, 'json': {'method': 'resolve', 'params': {'urls': [str(i)]}}}
+        for i in range(20)]
+    for kwargs in kwargs_list:
+        cache.set('POST', kwargs, b'{"result": "%d"}' % len(kwargs_list))
+    assert cache.stats()['size'] <= 100
+    assert cache.get('POST', kwargs_list[-1]) is not None
+    assert cache.get('POST', kwargs_list[0]) is None
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
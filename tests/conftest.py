@@ -86,11 +86,15 @@ def resources():
     resources_dict = dict(
         channel_name = CHANNEL_NAME,
         channel_id = CHANNEL_ID,
+        channel_names = [CHANNEL_NAME.lstrip('@')],
+        channel_ids = [CHANNEL_ID],
         video_id = VIDEO_ID,
+        claim_ids = [VIDEO_ID, FULL_VIDEO_INFO['claim_id']],
         video_title = VIDEO_TITLE,
         normalized_name = NORMALIZED_NAME,
         normalized_names = [NORMALIZED_NAME],
         canonical_url = CANONICAL_URL,
+        canonical_urls = [CANONICAL_URL, FULL_VIDEO_INFO['canonical_url']],
         full_video_info = FULL_VIDEO_INFO,
         full_comment_info = {**COMMENT_INFO_LIST[0], **{'likes': 8, 'dislikes': 0}},
         comment_info_list = COMMENT_INFO_LIST,
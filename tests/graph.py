@@ -0,0 +1,71 @@
+# -*- coding: UTF-8 -*-
+
+"""Tests for to polyphemus.graph module.
+
+The full set of tests for this module can be evaluated by executing the
+command::
+
+  $ python -m pytest tests/graph.py
+
+from the project root directory.
+
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import xml.dom.minidom
+
+import pytest
+
+graph = pytest.importorskip('polyphemus.graph')
+
+import numpy as np
+import scipy.sparse as sp
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TestRecommendationGraph:
+
+    @pytest.fixture(autouse=True)
+    def test_simple_init(self):
+        self.graph = graph.RecommendationGraph(
+            claim_ids = ['a', 'b', 'c', 'd'],
+            edge_counts = {(0, 1): 2, (1, 2): 1, (2, 0): 1, (3, 0): 5},
+            video_channels = ['@x', '@x', '@y', None])
+
+    def test_channel_aggregation(self):
+        assert self.graph.channel_names == ['@x', '@y']
+        assert self.graph.channel_adjacency.toarray().tolist() == [[2, 1], [1, 0]]
+
+    def test_degree(self):
+        assert self.graph.out_degree().tolist() == [2, 1, 1, 5]
+        assert self.graph.in_degree(weighted = False).tolist() == [2, 1, 1, 0]
+        assert self.graph.in_degree(level = 'channel').tolist() == [3, 1]
+
+    def test_pagerank(self):
+        ranks = self.graph.pagerank()
+        assert ranks.sum() == pytest.approx(1)
+        assert ranks.argmax() == 0
+        assert ranks[3] == pytest.approx(0.15 / 4)
+
+    def test_weighted_edge_list(self):
+        assert self.graph.weighted_edge_list()[0] == ('@x', '@x', 2)
+        assert self.graph.weighted_edge_list(level = 'video')[0] == ('d', 'a', 5)
+
+    def test_write(self, tmp_path):
+        self.graph.write_edge_list(str(tmp_path / 'edges.tsv'), level = 'video')
+        self.graph.write_gexf(str(tmp_path / 'network.gexf'))
+        assert (tmp_path / 'edges.tsv').read_text().splitlines()[0] == 'a\tb\t2'
+        assert len(xml.dom.minidom.parse(str(tmp_path / 'network.gexf')).getElementsByTagName('edge')) == 3
+
+    def test_invalid_level(self):
+        with pytest.raises(ValueError):
+            self.graph.pagerank(level = 'comment')
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_pagerank_dangling_nodes():
+    ranks = graph.pagerank(sp.csr_matrix(np.zeros((4, 4))))
+    assert ranks == pytest.approx(np.full(4, 0.25))
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
@@ -0,0 +1,142 @@
+# -*- coding: UTF-8 -*-
+
+"""Tests for to polyphemus.pipeline module.
+
+The full set of tests for this module can be evaluated by executing the
+command::
+
+  $ python -m pytest tests/pipeline.py
+
+from the project root directory.
+
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import csv
+
+import pytest
+
+from polyphemus import api
+from polyphemus import auth
+from polyphemus import base
+from polyphemus import pipeline
+from polyphemus import store
+
+from tests.conftest import FULL_VIDEO_INFO, COMMENT_INFO_LIST
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+N_VIDEOS = 30
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class OfflineSession:
+
+    def request(self, method, **kwargs):
+        raise AssertionError(f'Unexpected {method} request to {kwargs["url"]}')
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class FakeScraper:
+
+    def __init__(self, full_video_info, high_water_marks = None):
+        self.session = OfflineSession()
+        self.high_water_marks = high_water_marks
+        self.raw_video_info_list = [
+            {**full_video_info, 'claim_id': f'{i:040x}'} for i in range(N_VIDEOS)]
+
+    def iter_raw_video_info(self, incremental = False):
+        return iter(self.raw_video_info_list)
+
+    def pending_high_water_mark(self):
+        if self.high_water_marks is None:
+            return None
+        return base.PendingHighWaterMark(self.high_water_marks, 'channel')
+
+    def process_videos(self, raw_video_info_list, max_workers, ordered, high_water_mark = None):
+        if high_water_mark is not None:
+            raw_video_info_list = high_water_mark.track(raw_video_info_list)
+        return base.process_raw_video_info_list(raw_video_info_list, additional_fields = False)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TestChannelPipeline:
+
+    @pytest.fixture(autouse=True)
+    def test_simple_init(self, monkeypatch):
+
+        self.reaction_batches = []
+
+        def get_all_comments(video_id, session = None, reactions = True):
+            assert not reactions
+            return [
+                {**COMMENT_INFO_LIST[0], 'claim_id': video_id, 'comment_id': f'{video_id}-{i}'}
+                for i in range(3)]
+
+        def append_comment_reactions_bulk(comment_info_list, session = None, batch_size = api.COMMENT_REACTION_BATCH_SIZE):
+            self.reaction_batches.append(len(comment_info_list))
+            for comment in comment_info_list:
+                comment['likes'], comment['dislikes'] = 0, 0
+            return comment_info_list
+
+        def _new_token(session = None):
+            raise AssertionError('Unexpected authorization token request')
+
+        monkeypatch.setattr(api, 'get_all_comments', get_all_comments)
+        monkeypatch.setattr(api, 'append_comment_reactions_bulk', append_comment_reactions_bulk)
+        monkeypatch.setattr(api, 'get_default_session', OfflineSession)
+        monkeypatch.setattr(api, '_token_provider', auth.TokenProvider(path = None))
+        monkeypatch.setattr(auth, '_new_token', _new_token)
+
+        self.scraper = FakeScraper(FULL_VIDEO_INFO)
+
+    def test_run(self):
+        records = []
+        counts = pipeline.ChannelPipeline(self.scraper, records.append, queue_size = 4, comment_workers = 2).run()
+        assert counts == {'videos': N_VIDEOS, 'comments': 3 * N_VIDEOS}
+        positions = {record.claim_id : i for i, record in enumerate(records)}
+        assert all(positions[record.video_claim_id] < i for i, record in enumerate(records) if record.is_comment)
+
+    def test_reactions_are_batched_across_videos(self):
+        counts = pipeline.ChannelPipeline(self.scraper, lambda record: None, reaction_batch_size = 40).run()
+        assert counts == {'videos': N_VIDEOS, 'comments': 3 * N_VIDEOS}
+        assert self.reaction_batches == [40, 40, 10]
+
+    def test_run_without_comments(self):
+        counts = pipeline.ChannelPipeline(self.scraper, lambda record: None, comments = False).run()
+        assert counts == {'videos': N_VIDEOS, 'comments': 0}
+
+    def test_sink_error_is_raised(self):
+
+        def sink(record):
+            raise RuntimeError('sink')
+
+        with pytest.raises(RuntimeError):
+            pipeline.ChannelPipeline(self.scraper, sink, queue_size = 1).run()
+
+    def test_high_water_mark_waits_for_sink(self, tmp_path):
+
+        high_water_marks = store.HighWaterMarkStore(str(tmp_path / 'marks.json'))
+        scraper = FakeScraper(FULL_VIDEO_INFO, high_water_marks = high_water_marks)
+        records = []
+
+        def sink(record):
+            records.append(record)
+            if len(records) == N_VIDEOS * 4:
+                raise RuntimeError('sink')
+
+        with pytest.raises(RuntimeError):
+            pipeline.ChannelPipeline(scraper, sink).run()
+        assert high_water_marks.get('channel') is None
+
+        pipeline.ChannelPipeline(scraper, lambda record: None).run()
+        assert high_water_marks.get('channel') is not None
+
+    def test_csv_sink(self, tmp_path):
+        with pipeline.CsvSink(str(tmp_path / 'videos.csv'), str(tmp_path / 'comments.csv')) as sink:
+            pipeline.ChannelPipeline(self.scraper, sink).run()
+        with open(tmp_path / 'comments.csv') as f:
+            assert len(list(csv.DictReader(f))) == 3 * N_VIDEOS
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
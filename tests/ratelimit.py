@@ -0,0 +1,123 @@
+# -*- coding: UTF-8 -*-
+
+"""Tests for to polyphemus.ratelimit module.
+
+The full set of tests for this module can be evaluated by executing the
+command::
+
+  $ python -m pytest tests/ratelimit.py
+
+from the project root directory.
+
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import time
+
+import pytest
+
+from polyphemus import api
+from polyphemus import ratelimit
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+URL = 'https://api.odysee.com/file/view_count'
+ENDPOINT = 'file/view_count'
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_token_bucket():
+    bucket = ratelimit.TokenBucket(rate = 100, capacity = 5)
+    start = time.monotonic()
+    for _ in range(15):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+#-----------------------------------------------------------------------------#
+
+def test_adaptive_concurrency_limit():
+    limit = ratelimit.AdaptiveConcurrencyLimit(minimum = 1, maximum = 8)
+    limit.acquire()
+    limit.release(throttled = True)
+    assert limit.limit == 4
+    limit.acquire()
+    limit.release(throttled = False)
+    assert 4 < limit.limit < 5
+
+#-----------------------------------------------------------------------------#
+
+def test_circuit_breaker():
+    breaker = ratelimit.CircuitBreaker(failure_threshold = 2, reset_timeout = 0.05)
+    breaker.record(success = False)
+    assert breaker.allow()
+    breaker.record(success = False)
+    assert not breaker.allow()
+    time.sleep(0.05)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record(success = True)
+    assert breaker.allow()
+
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.parametrize('n_retries,retry_after', [(1, None), (5, None), (20, None), (1, 3.0)])
+def test_backoff_delay(n_retries, retry_after):
+    delay = ratelimit.backoff_delay(n_retries, retry_after = retry_after)
+    assert 0 <= delay <= max(ratelimit.BACKOFF_CAP, (retry_after or 0) + ratelimit.BACKOFF_BASE)
+    if retry_after is not None:
+        assert delay >= retry_after
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TestRateLimiter:
+
+    @pytest.fixture(autouse=True)
+    def test_simple_init(self):
+        self.rate_limiter = ratelimit.RateLimiter(failure_threshold = 2, reset_timeout = 60)
+
+    def test_throttled(self):
+        self.rate_limiter.acquire(URL, ENDPOINT)
+        self.rate_limiter.release(URL, ENDPOINT, status_code = 429)
+        assert self.rate_limiter.stats()['concurrency_limits']['api.odysee.com'] == ratelimit.MAX_CONCURRENCY // 2
+
+    def test_circuit_open(self):
+        for _ in range(2):
+            self.rate_limiter.acquire(URL, ENDPOINT)
+            self.rate_limiter.release(URL, ENDPOINT, status_code = None)
+        with pytest.raises(ratelimit.CircuitOpenError):
+            self.rate_limiter.acquire(URL, ENDPOINT)
+        self.rate_limiter.acquire(URL, 'reaction/list')
+
+    @pytest.mark.parametrize('status_code', ratelimit.THROTTLED_STATUS_CODES)
+    def test_throttled_does_not_open_circuit(self, status_code):
+        for _ in range(4):
+            self.rate_limiter.acquire(URL, ENDPOINT)
+            self.rate_limiter.release(URL, ENDPOINT, status_code = status_code)
+        assert self.rate_limiter.stats()['open_circuits'] == []
+
+    def test_make_request_waits_for_open_circuit(self, monkeypatch):
+
+        class Response:
+            status_code = 503
+            headers = {}
+
+        class Session:
+            n_requests = 0
+            def request(self, method, **kwargs):
+                self.n_requests += 1
+                if self.n_requests == 1:
+                    raise ConnectionError('connection reset')
+                return Response()
+
+        delays = []
+        monkeypatch.setattr(api, 'backoff_delay', lambda n_retries, retry_after = None: delays.append(retry_after) or 0)
+        monkeypatch.setattr(api, '_rate_limiter', ratelimit.RateLimiter(failure_threshold = 1, reset_timeout = 0))
+
+        session = Session()
+        with pytest.raises(ValueError) as exception_info:
+            api.make_request(request = api.requests.get, kwargs = {'url': URL}, session = session, max_retries = 5)
+        assert not isinstance(exception_info.value, ratelimit.CircuitOpenError)
+        assert session.n_requests == 5
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
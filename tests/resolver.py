@@ -0,0 +1,65 @@
+# -*- coding: UTF-8 -*-
+
+"""Tests for to polyphemus.resolver module.
+
+The full set of tests for this module can be evaluated by executing the
+command::
+
+  $ python -m pytest tests/resolver.py
+
+from the project root directory.
+
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from polyphemus import api
+from polyphemus import resolver
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+def test_resolve(resources):
+    claim_resolver = resolver.ClaimResolver()
+    raw_claim_info_list = claim_resolver.resolve([resources['normalized_name']])
+    assert raw_claim_info_list == api.normalized_names_to_video_info([resources['normalized_name']])
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TestClaimResolver:
+
+    @pytest.fixture(autouse=True)
+    def test_simple_init(self, monkeypatch):
+        self.batches = []
+        def normalized_names_to_video_info(normalized_names, session = None):
+            self.batches.append(list(normalized_names))
+            threading.Event().wait(0.05)
+            return [{'name': name} for name in normalized_names]
+        monkeypatch.setattr(api, 'normalized_names_to_video_info', normalized_names_to_video_info)
+        self.claim_resolver = resolver.ClaimResolver(batch_size = 50, max_cache_size = 100)
+
+    def test_cache(self):
+        assert self.claim_resolver.resolve(['a', 'b', 'a']) == [{'name': 'a'}, {'name': 'b'}, {'name': 'a'}]
+        self.claim_resolver.resolve(['b', 'c'])
+        assert self.batches == [['a', 'b'], ['c']]
+
+    def test_coalescing(self):
+        names = [[f'{i}-{j}' for j in range(5)] for i in range(8)]
+        with ThreadPoolExecutor(max_workers = 8) as executor:
+            results = list(executor.map(self.claim_resolver.resolve, names))
+        assert results == [[{'name': name} for name in batch] for batch in names]
+        assert len(self.batches) < len(names)
+
+    def test_no_wait_when_idle(self, monkeypatch):
+        monkeypatch.setattr(resolver.time, 'sleep', lambda seconds: pytest.fail('Unexpected wait'))
+        assert self.claim_resolver.resolve(['a']) == [{'name': 'a'}]
+
+    def test_max_cache_size(self):
+        self.claim_resolver.resolve([str(i) for i in range(150)])
+        assert self.claim_resolver.stats()['claims'] == 100
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
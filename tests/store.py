@@ -0,0 +1,109 @@
+# -*- coding: UTF-8 -*-
+
+"""Tests for to polyphemus.store module.
+
+The full set of tests for this module can be evaluated by executing the
+command::
+
+  $ python -m pytest tests/store.py
+
+from the project root directory.
+
+"""
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+import json
+
+import pytest
+
+from polyphemus import store
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TestHighWaterMarkStore:
+
+    @pytest.fixture(autouse=True)
+    def test_simple_init(self, tmp_path):
+        self.path = str(tmp_path / 'marks.json')
+        self.marks = store.HighWaterMarkStore(self.path)
+
+    def test_get_missing(self):
+        assert self.marks.get('channel') is None
+
+    def test_update_is_persisted(self):
+        self.marks.update('channel', 100)
+        assert store.HighWaterMarkStore(self.path).get('channel') == 100
+
+    def test_update_never_lowers(self):
+        self.marks.update('channel', 100)
+        self.marks.update('channel', 50)
+        assert self.marks.get('channel') == 100
+
+    def test_known_claim_ids(self):
+        self.marks.update('channel', 100, {'a': 90, 'b': 100, 'c': 150})
+        self.marks.update('channel', 120, {'d': 130})
+        assert store.HighWaterMarkStore(self.path).get_known_claim_ids('channel') == {'c', 'd'}
+
+    def test_legacy_file(self):
+        with open(self.path, 'w') as f:
+            json.dump({'channel': 100}, f)
+        marks = store.HighWaterMarkStore(self.path)
+        assert marks.get('channel') == 100
+        assert marks.get_known_claim_ids('channel') == set()
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TestCrawlStore:
+
+    @pytest.fixture(autouse=True)
+    def test_simple_init(self, tmp_path):
+        self.path = str(tmp_path / 'crawl.sqlite')
+        self.crawl = store.CrawlStore(self.path)
+
+    def test_checkpoint_is_persisted(self):
+        self.crawl.add_video(0, 'a', 0, '{}')
+        self.crawl.add_video(1, 'b', 1, '{}')
+        self.crawl.add_edges([(0, 1), (0, 1)])
+        self.crawl.set_status([0], store.EXPANDED)
+        self.crawl.set_state('depth', 1)
+        self.crawl.checkpoint()
+        crawl = store.CrawlStore(self.path)
+        assert [row[:4] for row in crawl.iter_videos()] == [(0, 'a', 0, store.EXPANDED), (1, 'b', 1, store.FRONTIER)]
+        assert list(crawl.iter_edges()) == [(0, 1, 2)]
+        assert crawl.get_state('depth') == 1
+
+    def test_uncommitted_writes_are_lost(self):
+        self.crawl.set_state('depth', 1)
+        self.crawl.checkpoint()
+        self.crawl.set_state('depth', 2)
+        self.crawl._connection.close()
+        assert store.CrawlStore(self.path).get_state('depth') == 1
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#
+
+class TestSeenClaimIndex:
+
+    @pytest.fixture(autouse=True)
+    def test_simple_init(self, tmp_path):
+        self.path = str(tmp_path / 'seen')
+        self.seen = store.SeenClaimIndex(self.path)
+
+    def test_contains(self):
+        self.seen.update(['a' * 40, 'c' * 40])
+        assert 'a' * 40 in self.seen
+        assert 'b' * 40 not in self.seen
+
+    def test_save_merges_sorted_records(self):
+        self.seen.update(['c' * 40, 'a' * 40])
+        self.seen.save()
+        self.seen.update(['b' * 40, 'a' * 40])
+        self.seen.save()
+        seen = store.SeenClaimIndex(self.path)
+        assert len(seen) == 3
+        assert all(claim_id * 40 in seen for claim_id in 'abc')
+        assert 'd' * 40 not in seen
+        with open(self.path, 'rb') as f:
+            assert f.read() == bytes.fromhex('a' * 40 + 'b' * 40 + 'c' * 40)
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++#